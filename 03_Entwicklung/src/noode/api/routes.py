@@ -401,13 +401,11 @@ async def get_providers() -> List[ProviderStatus]:
     providers = []
     
     for name in ["openai", "anthropic", "google", "openrouter"]:
-        provider = manager.providers.get(name)
-        if provider:
-            providers.append(ProviderStatus(
-                name=name,
-                available=provider.is_available(),
-                configured=provider.config.get_api_key(name) is not None,
-            ))
+        providers.append(ProviderStatus(
+            name=name,
+            available=manager.is_available(name),
+            configured=manager.config.get_api_key(name) is not None,
+        ))
     
     return providers
 
@@ -435,20 +433,8 @@ async def set_provider_key(provider: str, api_key: str = Body(..., embed=True))
     manager = get_llm_manager()
     manager.config.set_api_key(provider, api_key)
     
-    # Re-initialize provider
-    if provider in manager.providers:
-        if provider == "openai":
-            from noode.llm_providers import OpenAIProvider
-            manager.providers[provider] = OpenAIProvider(manager.config)
-        elif provider == "anthropic":
-            from noode.llm_providers import AnthropicProvider
-            manager.providers[provider] = AnthropicProvider(manager.config)
-        elif provider == "google":
-            from noode.llm_providers import GoogleProvider
-            manager.providers[provider] = GoogleProvider(manager.config)
-        elif provider == "openrouter":
-            from noode.llm_providers import OpenRouterProvider
-            manager.providers[provider] = OpenRouterProvider(manager.config)
+    # Re-initialize provider on next use
+    manager.reload_provider(provider)
     
     return {
         "provider": provider,
@@ -513,16 +499,12 @@ async def update_provider_config(provider: str, request: ProviderConfigRequest)
     
     manager = get_llm_manager()
     
-    # Update config
-    if "providers" not in manager.config._config:
-        manager.config._config["providers"] = {}
-    if provider not in manager.config._config["providers"]:
-        manager.config._config["providers"][provider] = {}
-    
-    manager.config._config["providers"][provider]["model"] = request.model
-    manager.config._config["providers"][provider]["temperature"] = request.temperature
-    manager.config._config["providers"][provider]["max_tokens"] = request.max_tokens
-    
+    manager.config.update_provider_config(
+        provider,
+        model=request.model,
+        temperature=request.temperature,
+        max_tokens=request.max_tokens,
+    )
     manager.config.save_config()
     
     return {
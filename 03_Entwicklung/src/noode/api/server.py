@@ -16,7 +16,8 @@ async def lifespan(app: FastAPI):
     setup_logging(level="INFO", json_format=False)
     yield
     # Shutdown
-    pass
+    from noode.llm_providers import close_llm_manager
+    await close_llm_manager()
 
 
 app = FastAPI(
@@ -41,6 +41,34 @@ class Workflow:
     jobs: dict[str, WorkflowJob]
 
 
+_PRE_COMMIT_CONFIG = """# Noode Pre-commit Configuration
+repos:
+  - repo: https://github.com/pre-commit/pre-commit-hooks
+    rev: v4.5.0
+    hooks:
+      - id: trailing-whitespace
+      - id: end-of-file-fixer
+      - id: check-yaml
+      - id: check-added-large-files
+
+  - repo: https://github.com/astral-sh/ruff-pre-commit
+    rev: v0.4.0
+    hooks:
+      - id: ruff
+        args: [--fix]
+      - id: ruff-format
+
+  - repo: local
+    hooks:
+      - id: noode-security
+        name: Noode Security Review
+        entry: noode review
+        language: system
+        types: [python]
+        pass_filenames: true
+"""
+
+
 class CICDGenerator:
     """Generate CI/CD configurations."""
     
@@ -67,15 +95,11 @@ class CICDGenerator:
         Returns:
             Path to generated workflow file
         """
-        workflow = self.templates.get(template)
-        if not workflow:
-            workflow = self.templates["noode"]
-        
         workflows_dir = project_path / ".github" / "workflows"
         workflows_dir.mkdir(parents=True, exist_ok=True)
         
         workflow_file = workflows_dir / "noode.yml"
-        workflow_file.write_text(self._render_workflow(workflow))
+        workflow_file.write_text(self.render_github_actions(template))
         
         logger.info(
             "workflow_generated",
@@ -94,38 +118,35 @@ class CICDGenerator:
         Returns:
             Path to generated config
         """
-        config = """# Noode Pre-commit Configuration
-repos:
-  - repo: https://github.com/pre-commit/pre-commit-hooks
-    rev: v4.5.0
-    hooks:
-      - id: trailing-whitespace
-      - id: end-of-file-fixer
-      - id: check-yaml
-      - id: check-added-large-files
-
-  - repo: https://github.com/astral-sh/ruff-pre-commit
-    rev: v0.4.0
-    hooks:
-      - id: ruff
-        args: [--fix]
-      - id: ruff-format
-
-  - repo: local
-    hooks:
-      - id: noode-security
-        name: Noode Security Review
-        entry: noode review
-        language: system
-        types: [python]
-        pass_filenames: true
-"""
-        
         config_file = project_path / ".pre-commit-config.yaml"
-        config_file.write_text(config)
+        config_file.write_text(self.render_pre_commit())
         
         return config_file
     
+    def render_github_actions(self, template: str = "noode") -> str:
+        """Render a GitHub Actions workflow without writing it.
+        
+        Args:
+            template: Workflow template to use; unknown names fall back
+                to the noode template
+            
+        Returns:
+            Workflow YAML
+        """
+        workflow = self.templates.get(template)
+        if not workflow:
+            workflow = self.templates["noode"]
+        return self._render_workflow(workflow)
+    
+    @staticmethod
+    def render_pre_commit() -> str:
+        """Render the pre-commit configuration without writing it.
+        
+        Returns:
+            Pre-commit config YAML
+        """
+        return _PRE_COMMIT_CONFIG
+    
     def _python_workflow(self) -> Workflow:
         """Python CI workflow template."""
         return Workflow(
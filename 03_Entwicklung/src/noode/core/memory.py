@@ -16,7 +16,7 @@ if TYPE_CHECKING:
 logger = structlog.get_logger()
 
 
-@dataclass
+@dataclass(slots=True)
 class MemoryEntry:
     """A single memory entry."""
     
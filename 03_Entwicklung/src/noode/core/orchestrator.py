@@ -282,6 +282,7 @@ Format as JSON array.""",
             topic=f"Review: {change_id}",
             required_approvals=2,
             allow_veto=True,
+            eligible_voters=len(reviewers),
         )
         
         # Send review requests
@@ -327,10 +328,14 @@ Format as JSON array.""",
             decision_id=f"conflict_{topic}",
             topic=topic,
             required_approvals=len(agents),
+            eligible_voters=len(agents),
         )
         
         # Request each agent to vote on resolution
         for agent_name in agents:
+            if consensus.is_complete:
+                # The remaining votes can no longer change the outcome
+                break
             if agent_name in self._agents:
                 # Ask agent to consider other positions
                 agent = self._agents[agent_name]
@@ -4,56 +4,122 @@ Manages agent sessions with state persistence across restarts.
 """
 
 import json
+import logging
+import secrets
+import sqlite3
+import threading
+import time
+from collections import ChainMap, defaultdict, deque
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from pathlib import Path
-from typing import Any
-from uuid import uuid4
+from types import MappingProxyType
+from typing import Any, Mapping
 
 import structlog
 
 logger = structlog.get_logger()
 
+# Number of messages retained per session (in memory and on disk)
+MAX_MESSAGES = 100
 
-@dataclass
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    agent_name TEXT NOT NULL,
+    last_active INTEGER NOT NULL,
+    is_active INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_agent
+    ON sessions (agent_name, is_active, last_active);
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_messages_session
+    ON messages (session_id, id);
+"""
+
+
+def _to_ns(value: datetime) -> int:
+    """Convert a datetime to integer epoch nanoseconds."""
+    return round(value.timestamp() * 1_000_000) * 1_000
+
+
+@dataclass(slots=True)
 class AgentSession:
-    """An agent session with state."""
+    """An agent session with state.
+    
+    Timestamps are stored as integer epoch nanoseconds; ``created_at``
+    and ``last_active`` materialize them as datetimes on access.
+    """
     
     session_id: str
     agent_name: str
-    created_at: datetime
-    last_active: datetime
+    created_at_ns: int
+    last_active_ns: int
     project_id: str | None = None
     context: dict[str, Any] = field(default_factory=dict)
-    messages: list[dict[str, str]] = field(default_factory=list)
+    messages: deque[dict[str, str]] = field(
+        default_factory=lambda: deque(maxlen=MAX_MESSAGES)
+    )
     tasks_completed: int = 0
     is_active: bool = True
     
-    def to_dict(self) -> dict[str, Any]:
-        """Serialize session to dict."""
-        return {
+    @property
+    def created_at(self) -> datetime:
+        """Session creation time."""
+        return datetime.fromtimestamp(self.created_at_ns / 1e9)
+    
+    @property
+    def last_active(self) -> datetime:
+        """Time of the last session activity."""
+        return datetime.fromtimestamp(self.last_active_ns / 1e9)
+    
+    def to_dict(self, include_messages: bool = True) -> dict[str, Any]:
+        """Serialize session to dict.
+        
+        Args:
+            include_messages: Whether to include the message history
+        """
+        data = {
             "session_id": self.session_id,
             "agent_name": self.agent_name,
-            "created_at": self.created_at.isoformat(),
-            "last_active": self.last_active.isoformat(),
+            "created_at_ns": self.created_at_ns,
+            "last_active_ns": self.last_active_ns,
             "project_id": self.project_id,
             "context": self.context,
-            "messages": self.messages,
+            "messages": list(self.messages),
             "tasks_completed": self.tasks_completed,
             "is_active": self.is_active,
         }
+        if not include_messages:
+            del data["messages"]
+        return data
     
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "AgentSession":
-        """Deserialize session from dict."""
+        """Deserialize session from dict.
+        
+        Accepts both epoch-nanosecond and ISO-format timestamps.
+        """
+        if "created_at_ns" in data:
+            created_at_ns = data["created_at_ns"]
+            last_active_ns = data["last_active_ns"]
+        else:
+            created_at_ns = _to_ns(datetime.fromisoformat(data["created_at"]))
+            last_active_ns = _to_ns(datetime.fromisoformat(data["last_active"]))
+        
         return cls(
             session_id=data["session_id"],
             agent_name=data["agent_name"],
-            created_at=datetime.fromisoformat(data["created_at"]),
-            last_active=datetime.fromisoformat(data["last_active"]),
+            created_at_ns=created_at_ns,
+            last_active_ns=last_active_ns,
             project_id=data.get("project_id"),
             context=data.get("context", {}),
-            messages=data.get("messages", []),
+            messages=deque(data.get("messages", []), maxlen=MAX_MESSAGES),
             tasks_completed=data.get("tasks_completed", 0),
             is_active=data.get("is_active", True),
         )
@@ -69,6 +135,19 @@ class SessionManager:
     ) -> None:
         """Initialize session manager.
         
+        Sessions are persisted to a SQLite database (``sessions.db``)
+        inside ``storage_path``. The database is opened and read on the
+        first call that needs sessions, not here, so constructing a
+        manager does not touch disk. Sessions saved by the earlier
+        file-based storage (``{id}.json``, or ``{id}.meta.json`` with
+        ``{id}.msgs.log``) are imported into the database on that first
+        load, and the files are renamed with a ``.migrated`` suffix.
+        
+        The connection may be used from any thread; database access is
+        serialized by a lock. The in-memory session table is not
+        synchronized, so callers updating the same session from several
+        threads must coordinate themselves.
+        
         Args:
             storage_path: Path for session persistence
             max_sessions_per_agent: Maximum active sessions per agent
@@ -76,16 +155,55 @@ class SessionManager:
         self.storage_path = storage_path
         self.max_sessions = max_sessions_per_agent
         self._sessions: dict[str, AgentSession] = {}
-        
-        if storage_path:
+        # Number of active sessions per agent
+        self._active_counts: defaultdict[str, int] = defaultdict(int)
+        # Tasks completed across active sessions
+        self._active_tasks_completed = 0
+        # Rows currently stored in each session's message table
+        self._stored_messages: dict[str, int] = {}
+        # Hash of the metadata last written for each session
+        self._last_hash: dict[str, int] = {}
+        self._db: sqlite3.Connection | None = None
+        self._db_lock = threading.RLock()
+        # In-memory managers have nothing to load
+        self._loaded = storage_path is None
+    
+    def _ensure_loaded(self) -> None:
+        """Open the database and load stored sessions on first use."""
+        if self._loaded:
+            return
+        with self._db_lock:
+            storage_path = self.storage_path
+            if self._loaded or storage_path is None:
+                return
+            
             storage_path.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(
+                storage_path / "sessions.db", check_same_thread=False
+            )
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(_SCHEMA)
+            self._import_legacy_files(storage_path)
             self._load_sessions()
+            self._loaded = True
+    
+    def _connection(self) -> sqlite3.Connection:
+        """Return the open database connection.
+        
+        Raises:
+            RuntimeError: If the database has not been opened
+        """
+        if self._db is None:
+            raise RuntimeError("Session database is not open")
+        return self._db
     
     def create_session(
         self,
         agent_name: str,
         project_id: str | None = None,
         context: dict[str, Any] | None = None,
+        now: datetime | None = None,
     ) -> AgentSession:
         """Create a new session.
         
@@ -93,23 +211,26 @@ class SessionManager:
             agent_name: Name of the agent
             project_id: Optional project context
             context: Initial context
+            now: Creation timestamp (defaults to the current time)
             
         Returns:
             Created session
         """
-        session_id = str(uuid4())[:12]
-        now = datetime.now()
+        self._ensure_loaded()
+        session_id = secrets.token_hex(6)
+        now_ns = time.time_ns() if now is None else _to_ns(now)
         
         session = AgentSession(
             session_id=session_id,
             agent_name=agent_name,
-            created_at=now,
-            last_active=now,
+            created_at_ns=now_ns,
+            last_active_ns=now_ns,
             project_id=project_id,
             context=context or {},
         )
         
         self._sessions[session_id] = session
+        self._active_counts[agent_name] += 1
         
         # Enforce session limit per agent
         self._cleanup_old_sessions(agent_name)
@@ -117,11 +238,12 @@ class SessionManager:
         # Persist
         self._save_session(session)
         
-        logger.info(
-            "session_created",
-            session_id=session_id,
-            agent=agent_name,
-        )
+        if logger.is_enabled_for(logging.INFO):
+            logger.info(
+                "session_created",
+                session_id=session_id,
+                agent=agent_name,
+            )
         
         return session
     
@@ -134,6 +256,7 @@ class SessionManager:
         Returns:
             Session or None
         """
+        self._ensure_loaded()
         return self._sessions.get(session_id)
     
     def update_session(
@@ -142,6 +265,7 @@ class SessionManager:
         context: dict[str, Any] | None = None,
         message: dict[str, str] | None = None,
         task_completed: bool = False,
+        now: datetime | None = None,
     ) -> AgentSession | None:
         """Update a session.
         
@@ -150,50 +274,61 @@ class SessionManager:
             context: Context updates to merge
             message: Message to add
             task_completed: Whether a task was completed
+            now: Activity timestamp; callers updating many sessions
+                can take one timestamp and pass it to each call
             
         Returns:
             Updated session or None
         """
+        self._ensure_loaded()
         session = self._sessions.get(session_id)
         if not session:
             return None
         
-        session.last_active = datetime.now()
+        session.last_active_ns = time.time_ns() if now is None else _to_ns(now)
         
         if context:
             session.context.update(context)
         
         if message:
+            # Bounded deque drops the oldest message once full
             session.messages.append(message)
-            # Keep last 100 messages
-            if len(session.messages) > 100:
-                session.messages = session.messages[-100:]
+            self._append_message(session, message)
         
         if task_completed:
             session.tasks_completed += 1
+            if session.is_active:
+                self._active_tasks_completed += 1
         
         self._save_session(session)
         
         return session
     
-    def close_session(self, session_id: str) -> bool:
+    def close_session(
+        self,
+        session_id: str,
+        now: datetime | None = None,
+    ) -> bool:
         """Close a session.
         
         Args:
             session_id: Session ID
+            now: Closing timestamp (defaults to the current time)
             
         Returns:
             True if closed
         """
+        self._ensure_loaded()
         session = self._sessions.get(session_id)
         if not session:
             return False
         
-        session.is_active = False
-        session.last_active = datetime.now()
-        self._save_session(session)
+        self._deactivate(session)
+        session.last_active_ns = time.time_ns() if now is None else _to_ns(now)
+        self._save_session(session, durable=True)
         
-        logger.info("session_closed", session_id=session_id)
+        if logger.is_enabled_for(logging.INFO):
+            logger.info("session_closed", session_id=session_id)
         
         return True
     
@@ -211,6 +346,7 @@ class SessionManager:
         Returns:
             List of sessions
         """
+        self._ensure_loaded()
         sessions = list(self._sessions.values())
         
         if agent_name:
@@ -219,11 +355,15 @@ class SessionManager:
         if active_only:
             sessions = [s for s in sessions if s.is_active]
         
-        return sorted(sessions, key=lambda s: s.last_active, reverse=True)
+        return sorted(sessions, key=lambda s: s.last_active_ns, reverse=True)
     
-    def get_agent_context(self, agent_name: str) -> dict[str, Any]:
+    def get_agent_context(self, agent_name: str) -> Mapping[str, Any]:
         """Get combined context from all active sessions for an agent.
         
+        The result is a read-only view over the live session contexts
+        rather than a copy, so later context updates show through; on key
+        conflicts the oldest session wins.
+        
         Args:
             agent_name: Agent name
             
@@ -232,46 +372,209 @@ class SessionManager:
         """
         sessions = self.list_sessions(agent_name=agent_name, active_only=True)
         
-        context: dict[str, Any] = {}
-        for session in sessions:
-            context.update(session.context)
-        
-        return context
+        return MappingProxyType(
+            ChainMap(*(session.context for session in reversed(sessions)))
+        )
     
     def _cleanup_old_sessions(self, agent_name: str) -> None:
         """Clean up old sessions for an agent."""
+        if self._active_counts[agent_name] <= self.max_sessions:
+            return
+        
         sessions = self.list_sessions(agent_name=agent_name, active_only=True)
         
         while len(sessions) > self.max_sessions:
             oldest = sessions.pop()
-            oldest.is_active = False
+            self._deactivate(oldest)
             self._save_session(oldest)
     
-    def _save_session(self, session: AgentSession) -> None:
-        """Persist session to disk."""
-        if not self.storage_path:
+    def _deactivate(self, session: AgentSession) -> None:
+        """Mark a session inactive and update the active tallies."""
+        if not session.is_active:
+            return
+        
+        session.is_active = False
+        self._active_counts[session.agent_name] -= 1
+        self._active_tasks_completed -= session.tasks_completed
+    
+    def _save_session(self, session: AgentSession, durable: bool = False) -> None:
+        """Persist session metadata to the database.
+        
+        Messages are not part of the session row; they are appended
+        to the messages table by ``_append_message``.
+        
+        Each write is an atomic transaction. Routine updates commit with
+        ``synchronous=NORMAL``, which survives a process crash but may
+        lose the latest commits on power loss; ``durable`` writes sync
+        the WAL to disk before returning.
+        
+        Args:
+            session: Session to persist
+            durable: Whether to fsync the commit
+        """
+        if not self._db:
             return
         
-        session_file = self.storage_path / f"{session.session_id}.json"
-        session_file.write_text(json.dumps(session.to_dict(), indent=2))
+        payload = json.dumps(session.to_dict(include_messages=False))
+        
+        # Skip the write if the metadata is unchanged since the last save
+        payload_hash = hash(payload)
+        if self._last_hash.get(session.session_id) == payload_hash:
+            return
+        
+        with self._db_lock:
+            if durable:
+                self._db.execute("PRAGMA synchronous=FULL")
+            try:
+                with self._db:
+                    self._db.execute(
+                        "INSERT INTO sessions"
+                        " (session_id, agent_name, last_active, is_active, data)"
+                        " VALUES (?, ?, ?, ?, ?)"
+                        " ON CONFLICT (session_id) DO UPDATE SET"
+                        " last_active = excluded.last_active,"
+                        " is_active = excluded.is_active,"
+                        " data = excluded.data",
+                        (
+                            session.session_id,
+                            session.agent_name,
+                            session.last_active_ns,
+                            session.is_active,
+                            payload,
+                        ),
+                    )
+                # Remembered only once committed, so a failed write is retried
+                self._last_hash[session.session_id] = payload_hash
+            finally:
+                if durable:
+                    self._db.execute("PRAGMA synchronous=NORMAL")
+    
+    def _append_message(self, session: AgentSession, message: dict[str, str]) -> None:
+        """Append a single message to the session's stored messages.
+        
+        Older rows are pruned to the retained messages once a session
+        stores twice the retention limit, so disk usage stays bounded.
+        """
+        if not self._db:
+            return
+        
+        with self._db_lock, self._db:
+            count = self._stored_messages.get(session.session_id, 0) + 1
+            self._db.execute(
+                "INSERT INTO messages (session_id, data) VALUES (?, ?)",
+                (session.session_id, json.dumps(message)),
+            )
+            if count > 2 * MAX_MESSAGES:
+                self._db.execute(
+                    "DELETE FROM messages WHERE session_id = ? AND id NOT IN"
+                    " (SELECT id FROM messages WHERE session_id = ?"
+                    " ORDER BY id DESC LIMIT ?)",
+                    (session.session_id, session.session_id, MAX_MESSAGES),
+                )
+                count = MAX_MESSAGES
+            self._stored_messages[session.session_id] = count
+    
+    def _import_legacy_files(self, storage_path: Path) -> None:
+        """Import sessions saved by the earlier file-based storage.
+        
+        Reads ``{id}.json`` files, which hold a whole session, and
+        ``{id}.meta.json`` files, whose messages live in ``{id}.msgs.log``
+        (one JSON object per line). Sessions already in the database are
+        left alone. Imported files are renamed with a ``.migrated``
+        suffix once the import has committed, so they are read only once.
+        
+        Args:
+            storage_path: Directory holding the legacy files
+        """
+        imported: list[Path] = []
+        db = self._connection()
+        
+        with db:
+            for path in sorted(storage_path.glob("*.json")):
+                files = [path]
+                try:
+                    data = json.loads(path.read_text())
+                    if path.name.endswith(".meta.json"):
+                        log_path = path.with_name(
+                            path.name.removesuffix(".meta.json") + ".msgs.log"
+                        )
+                        if log_path.exists():
+                            files.append(log_path)
+                            data["messages"] = [
+                                json.loads(line)
+                                for line in log_path.read_text().splitlines()
+                                if line
+                            ]
+                    session = AgentSession.from_dict(data)
+                except Exception as e:
+                    logger.warning(
+                        "legacy_session_import_failed",
+                        file=str(path),
+                        error=str(e),
+                    )
+                    continue
+                
+                cursor = db.execute(
+                    "INSERT OR IGNORE INTO sessions"
+                    " (session_id, agent_name, last_active, is_active, data)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (
+                        session.session_id,
+                        session.agent_name,
+                        session.last_active_ns,
+                        session.is_active,
+                        json.dumps(session.to_dict(include_messages=False)),
+                    ),
+                )
+                if cursor.rowcount:
+                    db.executemany(
+                        "INSERT INTO messages (session_id, data) VALUES (?, ?)",
+                        (
+                            (session.session_id, json.dumps(message))
+                            for message in session.messages
+                        ),
+                    )
+                imported.extend(files)
+        
+        for path in imported:
+            path.rename(path.with_name(path.name + ".migrated"))
+        
+        if imported:
+            logger.info("legacy_sessions_imported", files=len(imported))
     
     def _load_sessions(self) -> None:
-        """Load sessions from disk."""
-        if not self.storage_path:
+        """Load sessions from the database."""
+        if not self._db:
             return
         
-        for session_file in self.storage_path.glob("*.json"):
+        for session_id, data in self._db.execute(
+            "SELECT session_id, data FROM sessions"
+        ):
             try:
-                data = json.loads(session_file.read_text())
-                session = AgentSession.from_dict(data)
+                session = AgentSession.from_dict(json.loads(data))
                 self._sessions[session.session_id] = session
+                if session.is_active:
+                    self._active_counts[session.agent_name] += 1
+                    self._active_tasks_completed += session.tasks_completed
             except Exception as e:
                 logger.warning(
                     "session_load_failed",
-                    file=str(session_file),
+                    session_id=session_id,
                     error=str(e),
                 )
         
+        for session_id, data in self._db.execute(
+            "SELECT session_id, data FROM messages ORDER BY id"
+        ):
+            owner = self._sessions.get(session_id)
+            if owner is None:
+                continue
+            # Bounded deque keeps only the newest messages
+            owner.messages.append(json.loads(data))
+            self._stored_messages[session_id] = (
+                self._stored_messages.get(session_id, 0) + 1
+            )
+        
         logger.info("sessions_loaded", count=len(self._sessions))
     
     def get_stats(self) -> dict[str, Any]:
@@ -280,15 +583,14 @@ class SessionManager:
         Returns:
             Statistics dict
         """
-        active = [s for s in self._sessions.values() if s.is_active]
-        
-        by_agent: dict[str, int] = {}
-        for session in active:
-            by_agent[session.agent_name] = by_agent.get(session.agent_name, 0) + 1
+        self._ensure_loaded()
+        by_agent = {
+            agent: count for agent, count in self._active_counts.items() if count
+        }
         
         return {
             "total_sessions": len(self._sessions),
-            "active_sessions": len(active),
+            "active_sessions": sum(by_agent.values()),
             "by_agent": by_agent,
-            "total_tasks_completed": sum(s.tasks_completed for s in active),
+            "total_tasks_completed": self._active_tasks_completed,
         }
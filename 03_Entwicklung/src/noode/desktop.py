@@ -14,9 +14,11 @@ Design Philosophy:
 import sys
 import asyncio
 import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any, Callable, Optional
 from datetime import datetime
+from functools import lru_cache, partial
 
 import gi
 gi.require_version('Gtk', '3.0')
@@ -27,6 +29,9 @@ import structlog
 
 logger = structlog.get_logger()
 
+# Pages kept alive in the content stack before the least recently shown is destroyed
+MAX_CACHED_PAGES = 4
+
 # ============================================
 # MODERN COLOR PALETTE - Friendly & Fresh
 # ============================================
@@ -78,7 +83,8 @@ COLORS = {
 # ============================================
 # MODERN CSS STYLES
 # ============================================
-CSS = f"""
+# Color placeholders ({primary}, {bg_main}, ...) are filled from COLORS
+_CSS_TEMPLATE = """
 /* ============================================
    GLOBAL RESET & BASE
    ============================================ */
@@ -88,7 +94,7 @@ CSS = f"""
 }}
 
 window {{
-    background-color: {COLORS["bg_main"]};
+    background-color: {bg_main};
 }}
 
 /* ============================================
@@ -105,7 +111,7 @@ window {{
 .glass-header-title {{
     font-size: 28px;
     font-weight: 800;
-    color: {COLORS["text_inverse"]};
+    color: {text_inverse};
     letter-spacing: -0.5px;
 }}
 
@@ -119,15 +125,15 @@ window {{
    MODERN SIDEBAR - Clean & Minimal
    ============================================ */
 .sidebar {{
-    background-color: {COLORS["bg_sidebar"]};
+    background-color: {bg_sidebar};
     padding: 16px 12px;
-    border-right: 1px solid {COLORS["border"]};
+    border-right: 1px solid {border};
 }}
 
 .sidebar-logo {{
     font-size: 24px;
     font-weight: 800;
-    color: {COLORS["primary"]};
+    color: {primary};
     padding: 16px;
     margin-bottom: 8px;
 }}
@@ -137,7 +143,7 @@ window {{
     font-weight: 600;
     /* Note: text-transform not supported in GTK3 CSS */
     letter-spacing: 0.5px;
-    color: {COLORS["text_muted"]};
+    color: {text_muted};
     padding: 16px 16px 8px 16px;
 }}
 
@@ -145,75 +151,75 @@ window {{
     padding: 12px 16px;
     border-radius: 10px;
     margin: 2px 8px;
-    color: {COLORS["text_secondary"]};
+    color: {text_secondary};
     background: transparent;
     border: none;
     font-size: 14px;
     font-weight: 500;
-    transition: all 150ms ease;
+    transition: background-color 150ms ease, color 150ms ease;
 }}
 
 .sidebar-item:hover {{
-    background-color: {COLORS["bg_hover"]};
-    color: {COLORS["text_primary"]};
+    background-color: {bg_hover};
+    color: {text_primary};
 }}
 
 .sidebar-item-active {{
-    background-color: {COLORS["bg_active"]};
-    color: {COLORS["primary"]};
+    background-color: {bg_active};
+    color: {primary};
     font-weight: 600;
 }}
 
 .sidebar-item-active:hover {{
-    background-color: {COLORS["bg_active"]};
+    background-color: {bg_active};
 }}
 
 /* ============================================
    MODERN CARDS - Soft & Inviting
    ============================================ */
 .card {{
-    background-color: {COLORS["bg_card"]};
+    background-color: {bg_card};
     border-radius: 16px;
     padding: 24px;
     margin: 8px 0;
-    border: 1px solid {COLORS["border"]};
-    box-shadow: 0 1px 3px {COLORS["shadow"]};
-    transition: all 200ms ease;
+    border: 1px solid {border};
+    box-shadow: 0 1px 3px {shadow};
+    transition: box-shadow 200ms ease;
 }}
 
 .card:hover {{
-    box-shadow: 0 4px 12px {COLORS["shadow"]};
+    box-shadow: 0 4px 12px {shadow};
 }}
 
 .card-title {{
     font-size: 18px;
     font-weight: 700;
-    color: {COLORS["text_primary"]};
+    color: {text_primary};
     margin-bottom: 4px;
 }}
 
 .card-subtitle {{
     font-size: 13px;
-    color: {COLORS["text_muted"]};
+    color: {text_muted};
 }}
 
 /* ============================================
    PRIMARY BUTTON - Bold & Inviting
    ============================================ */
 .button-primary {{
-    background: linear-gradient(135deg, {COLORS["primary"]} 0%, {COLORS["primary_dark"]} 100%);
-    color: {COLORS["text_inverse"]};
+    background: linear-gradient(135deg, {primary} 0%, {primary_dark} 100%);
+    color: {text_inverse};
     padding: 12px 24px;
     border-radius: 10px;
     font-size: 14px;
     font-weight: 600;
     border: none;
     box-shadow: 0 2px 8px rgba(99, 102, 241, 0.3);
-    transition: all 150ms ease;
+    transition: background-image 150ms ease, box-shadow 150ms ease;
 }}
 
 .button-primary:hover {{
-    background: linear-gradient(135deg, {COLORS["primary_light"]} 0%, {COLORS["primary"]} 100%);
+    background: linear-gradient(135deg, {primary_light} 0%, {primary} 100%);
     box-shadow: 0 4px 12px rgba(99, 102, 241, 0.4);
 }}
 
@@ -225,19 +231,19 @@ window {{
    SECONDARY BUTTON - Subtle
    ============================================ */
 .button-secondary {{
-    background-color: {COLORS["bg_card"]};
-    color: {COLORS["text_primary"]};
+    background-color: {bg_card};
+    color: {text_primary};
     padding: 12px 24px;
     border-radius: 10px;
     font-size: 14px;
     font-weight: 600;
-    border: 1px solid {COLORS["border"]};
-    transition: all 150ms ease;
+    border: 1px solid {border};
+    transition: background-color 150ms ease, border-color 150ms ease;
 }}
 
 .button-secondary:hover {{
-    background-color: {COLORS["bg_hover"]};
-    border-color: {COLORS["primary"]};
+    background-color: {bg_hover};
+    border-color: {primary};
 }}
 
 /* ============================================
@@ -245,7 +251,7 @@ window {{
    ============================================ */
 .button-ghost {{
     background-color: transparent;
-    color: {COLORS["primary"]};
+    color: {primary};
     padding: 8px 16px;
     border-radius: 8px;
     font-size: 14px;
@@ -254,25 +260,25 @@ window {{
 }}
 
 .button-ghost:hover {{
-    background-color: {COLORS["primary_bg"]};
+    background-color: {primary_bg};
 }}
 
 /* ============================================
    INPUT FIELDS - Clean & Modern
    ============================================ */
 .input-field {{
-    background-color: {COLORS["bg_card"]};
-    border: 2px solid {COLORS["border"]};
+    background-color: {bg_card};
+    border: 2px solid {border};
     border-radius: 10px;
     padding: 12px 16px;
     font-size: 14px;
-    color: {COLORS["text_primary"]};
-    transition: all 150ms ease;
+    color: {text_primary};
+    transition: border-color 150ms ease, box-shadow 150ms ease;
 }}
 
 .input-field:focus {{
-    border-color: {COLORS["primary"]};
-    box-shadow: 0 0 0 3px {COLORS["primary_bg"]};
+    border-color: {primary};
+    box-shadow: 0 0 0 3px {primary_bg};
 }}
 
 /* ============================================
@@ -286,44 +292,44 @@ window {{
 }}
 
 .badge-success {{
-    background-color: {COLORS["success_bg"]};
-    color: {COLORS["success"]};
+    background-color: {success_bg};
+    color: {success};
 }}
 
 .badge-warning {{
-    background-color: {COLORS["warning_bg"]};
-    color: {COLORS["warning"]};
+    background-color: {warning_bg};
+    color: {warning};
 }}
 
 .badge-error {{
-    background-color: {COLORS["error_bg"]};
-    color: {COLORS["error"]};
+    background-color: {error_bg};
+    color: {error};
 }}
 
 .badge-info {{
-    background-color: {COLORS["info_bg"]};
-    color: {COLORS["info"]};
+    background-color: {info_bg};
+    color: {info};
 }}
 
 /* ============================================
    CONTENT AREAS
    ============================================ */
 .content-area {{
-    background-color: {COLORS["bg_main"]};
+    background-color: {bg_main};
     padding: 32px;
 }}
 
 .page-title {{
     font-size: 32px;
     font-weight: 800;
-    color: {COLORS["text_primary"]};
+    color: {text_primary};
     margin-bottom: 8px;
     letter-spacing: -0.5px;
 }}
 
 .page-subtitle {{
     font-size: 16px;
-    color: {COLORS["text_secondary"]};
+    color: {text_secondary};
     margin-bottom: 32px;
 }}
 
@@ -331,16 +337,16 @@ window {{
    QUICK ACTIONS GRID
    ============================================ */
 .quick-action {{
-    background-color: {COLORS["bg_card"]};
+    background-color: {bg_card};
     border-radius: 16px;
     padding: 24px;
     border: 2px solid transparent;
-    transition: all 200ms ease;
+    transition: border-color 200ms ease, box-shadow 200ms ease;
 }}
 
 .quick-action:hover {{
-    border-color: {COLORS["primary"]};
-    box-shadow: 0 4px 16px {COLORS["shadow"]};
+    border-color: {primary};
+    box-shadow: 0 4px 16px {shadow};
 }}
 
 .quick-action-icon {{
@@ -351,13 +357,13 @@ window {{
 .quick-action-title {{
     font-size: 16px;
     font-weight: 700;
-    color: {COLORS["text_primary"]};
+    color: {text_primary};
     margin-bottom: 4px;
 }}
 
 .quick-action-desc {{
     font-size: 13px;
-    color: {COLORS["text_muted"]};
+    color: {text_muted};
 }}
 
 /* ============================================
@@ -370,15 +376,15 @@ window {{
 }}
 
 .chat-bubble-user {{
-    background-color: {COLORS["primary"]};
-    color: {COLORS["text_inverse"]};
+    background-color: {primary};
+    color: {text_inverse};
     border-bottom-right-radius: 4px;
 }}
 
 .chat-bubble-ai {{
-    background-color: {COLORS["bg_card"]};
-    color: {COLORS["text_primary"]};
-    border: 1px solid {COLORS["border"]};
+    background-color: {bg_card};
+    color: {text_primary};
+    border: 1px solid {border};
     border-bottom-left-radius: 4px;
 }}
 
@@ -420,8 +426,8 @@ window {{
    TOOLTIP - Modern
    ============================================ */
 tooltip {{
-    background-color: {COLORS["text_primary"]};
-    color: {COLORS["text_inverse"]};
+    background-color: {text_primary};
+    color: {text_inverse};
     padding: 8px 12px;
     border-radius: 8px;
     font-size: 12px;
@@ -432,15 +438,104 @@ tooltip {{
    SCROLLBAR - Minimal
    ============================================ */
 scrollbar slider {{
-    background-color: {COLORS["border"]};
+    background-color: {border};
     border-radius: 8px;
 }}
 
 scrollbar slider:hover {{
-    background-color: {COLORS["text_muted"]};
+    background-color: {text_muted};
 }}
 """
 
+CSS = _CSS_TEMPLATE.format_map(COLORS)
+
+# Encoded once at import; handed to Gtk.CssProvider as-is
+CSS_BYTES: bytes = CSS.encode("utf-8")
+
+# ============================================
+# STATIC UI STRINGS
+# ============================================
+# Sidebar layout: (kind, section title, nav items as (button label, page_id))
+NAV_LAYOUT = (
+    ("section", "Hauptmenü", (
+        ("  🏠  Dashboard", "dashboard"),
+        ("  💬  Neues Projekt", "new_project"),
+        ("  📁  Meine Projekte", "projects"),
+    )),
+    ("separator", None, ()),
+    ("section", "Werkzeuge", (
+        ("  🔍  Research", "research"),
+        ("  🎨  Design", "design"),
+        ("  ⚡  Code Review", "review"),
+        ("  🔒  Security", "security"),
+    )),
+    # Settings stay pinned to the bottom
+    ("spacer", None, ()),
+    ("section", None, (
+        ("  ⚙️  Einstellungen", "settings"),
+    )),
+)
+
+# Example recent projects on the dashboard: (title, status text, badge status)
+RECENT_PROJECTS = (
+    ("Projekt 1", "Aktiv", "success"),
+    ("Projekt 2", "In Entwicklung", "info"),
+    ("Projekt 3", "Review", "warning"),
+)
+
+
+def _rgb16(hex_color: str) -> tuple[int, int, int]:
+    """Convert '#RRGGBB' to the 16-bit channels Pango expects."""
+    return tuple(int(hex_color[i:i + 2], 16) * 257 for i in (1, 3, 5))
+
+
+def _text_attrs(weight: Pango.Weight, scale: float = 1.0) -> Pango.AttrList:
+    """Build a shared attribute list for static primary-colored labels."""
+    attrs = Pango.AttrList()
+    attrs.insert(Pango.attr_weight_new(weight))
+    attrs.insert(Pango.attr_foreground_new(*_rgb16(COLORS["text_primary"])))
+    if scale != 1.0:
+        attrs.insert(Pango.attr_scale_new(scale))
+    return attrs
+
+
+# Pango attributes for section headings and form field labels, applied
+# to plain text instead of parsing markup for every label
+HEADING_ATTRS = _text_attrs(Pango.Weight.BOLD, Pango.SCALE_LARGE)
+FIELD_LABEL_ATTRS = _text_attrs(Pango.Weight.SEMIBOLD)
+
+
+def _make_label(text: str, css_class: Optional[str] = None,
+                attrs: Optional[Pango.AttrList] = None) -> Gtk.Label:
+    """Create a left-aligned label.
+    
+    Alignment is set at construction via xalign, so the first size
+    allocation already accounts for it.
+    """
+    label = Gtk.Label(label=text, xalign=0.0)
+    if css_class:
+        label.get_style_context().add_class(css_class)
+    if attrs is not None:
+        label.set_attributes(attrs)
+    return label
+
+
+# Icon sizes in pixels (Gtk.IconSize.BUTTON and card header icons)
+ICON_SIZE_BUTTON = 16
+ICON_SIZE_CARD = 32
+
+
+def _icon_image(name: str, size: int) -> Gtk.Image:
+    """Create an image for a themed icon at a fixed pixel size.
+    
+    Images stay bound to the icon name, so GTK recolors symbolic icons,
+    renders at the display scale and follows theme changes; GTK's icon
+    theme already caches the loaded icons.
+    """
+    image = Gtk.Image.new_from_icon_name(name, Gtk.IconSize.BUTTON)
+    image.set_pixel_size(size)
+    return image
+
 
 class AnimatedWidget:
     """Mixin for widgets with smooth animations."""
@@ -448,15 +543,18 @@ class AnimatedWidget:
     def animate_property(self, widget: Gtk.Widget, property_name: str, 
                         start_value: float, end_value: float, 
                         duration_ms: int = 200) -> None:
-        """Animate a widget property smoothly."""
-        import time
-        
-        start_time = time.time()
-        duration_sec = duration_ms / 1000.0
-        
-        def update_animation():
-            elapsed = time.time() - start_time
-            progress = min(elapsed / duration_sec, 1.0)
+        """Animate a widget property smoothly.
+        
+        Frames are driven by the widget's frame clock, so updates stay in
+        step with the display refresh rate.
+        """
+        # Frame clock times share GLib's monotonic clock (microseconds)
+        start_time = GLib.get_monotonic_time()
+        duration_us = max(duration_ms * 1000, 1)
+        
+        def update_animation(widget: Gtk.Widget, frame_clock: Gdk.FrameClock) -> bool:
+            elapsed = frame_clock.get_frame_time() - start_time
+            progress = min(max(elapsed / duration_us, 0.0), 1.0)
             
             # Easing function (ease-out-cubic)
             eased = 1 - pow(1 - progress, 3)
@@ -466,17 +564,20 @@ class AnimatedWidget:
             if property_name == "opacity":
                 widget.set_opacity(current)
             
+            # Keep ticking until the animation completes
             if progress < 1.0:
-                GLib.timeout_add(16, update_animation)  # ~60fps
-            
-            return False
+                return GLib.SOURCE_CONTINUE
+            return GLib.SOURCE_REMOVE
         
-        GLib.timeout_add(16, update_animation)
+        widget.add_tick_callback(update_animation)
 
 
 class ModernButton(Gtk.Button):
     """Modern styled button with icon support."""
     
+    # Hover cursor, created on first use and shared by all buttons
+    _pointer_cursor: Optional[Gdk.Cursor] = None
+    
     def __init__(self, label: str = "", icon: str = "", 
                  style: str = "primary", **kwargs):
         super().__init__(**kwargs)
@@ -488,9 +589,7 @@ class ModernButton(Gtk.Button):
         box.set_halign(Gtk.Align.CENTER)
         
         if icon:
-            icon_widget = Gtk.Image.new_from_icon_name(
-                icon, Gtk.IconSize.BUTTON
-            )
+            icon_widget = _icon_image(icon, ICON_SIZE_BUTTON)
             box.pack_start(icon_widget, False, False, 0)
         
         if label:
@@ -512,12 +611,20 @@ class ModernButton(Gtk.Button):
         self.connect("leave-notify-event", self._on_leave)
     
     def _on_enter(self, widget, event):
-        display = Gdk.Display.get_default()
-        cursor = Gdk.Cursor.new_from_name(display, "pointer")
-        self.get_window().set_cursor(cursor)
+        window = self.get_window()
+        if window is None:
+            return
+        
+        if ModernButton._pointer_cursor is None:
+            ModernButton._pointer_cursor = Gdk.Cursor.new_from_name(
+                Gdk.Display.get_default(), "pointer"
+            )
+        window.set_cursor(ModernButton._pointer_cursor)
     
     def _on_leave(self, widget, event):
-        self.get_window().set_cursor(None)
+        window = self.get_window()
+        if window is not None:
+            window.set_cursor(None)
 
 
 class ModernCard(Gtk.Box):
@@ -530,29 +637,22 @@ class ModernCard(Gtk.Box):
         self.get_style_context().add_class("card")
         self.set_margin_bottom(8)
         
-        # Header
-        header = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=12)
+        # Header: icon spanning the title and subtitle rows beside it
+        header = Gtk.Grid(column_spacing=12, row_spacing=4)
+        text_column = 0
         
         if icon:
-            icon_img = Gtk.Image.new_from_icon_name(icon, Gtk.IconSize.DND)
-            icon_img.set_pixel_size(32)
-            header.pack_start(icon_img, False, False, 0)
-        
-        text_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=4)
-        
-        if title:
-            title_label = Gtk.Label(label=title)
-            title_label.get_style_context().add_class("card-title")
-            title_label.set_halign(Gtk.Align.START)
-            text_box.pack_start(title_label, False, False, 0)
-        
-        if subtitle:
-            subtitle_label = Gtk.Label(label=subtitle)
-            subtitle_label.get_style_context().add_class("card-subtitle")
-            subtitle_label.set_halign(Gtk.Align.START)
-            text_box.pack_start(subtitle_label, False, False, 0)
-        
-        header.pack_start(text_box, True, True, 0)
+            icon_img = _icon_image(icon, ICON_SIZE_CARD)
+            header.attach(icon_img, 0, 0, 1, 2)
+            text_column = 1
+        
+        row = 0
+        for text, css_class in ((title, "card-title"), (subtitle, "card-subtitle")):
+            if text:
+                label = _make_label(text, css_class)
+                label.set_hexpand(True)
+                header.attach(label, text_column, row, 1, 1)
+                row += 1
         
         self.pack_start(header, False, False, 0)
         
@@ -597,19 +697,40 @@ class QuickAction(Gtk.Button):
             self.connect("clicked", callback)
 
 
+@lru_cache(maxsize=256)
+def _initials(name: str) -> str:
+    """Initials of the first two words of a name."""
+    # Stops splitting after the second word
+    parts = name.split(None, 2)
+    if not parts:
+        return ""
+    second = parts[1][:1] if len(parts) > 1 else ""
+    return (parts[0][:1] + second).upper()
+
+
+# Style class per agent type (see the .avatar-* CSS rules)
+_AVATAR_CLASSES = {
+    "research": "avatar-research",
+    "frontend": "avatar-frontend",
+    "backend": "avatar-backend",
+    "security": "avatar-security",
+    "orchestrator": "avatar-orchestrator",
+}
+
+
 class AgentAvatar(Gtk.Box):
     """Circular avatar for agents with initials."""
     
     def __init__(self, name: str, agent_type: str = "orchestrator"):
         super().__init__()
         
-        self.get_style_context().add_class(f"agent-avatar avatar-{agent_type}")
+        # add_class takes a single class name per call
+        ctx = self.get_style_context()
+        ctx.add_class("agent-avatar")
+        ctx.add_class(_AVATAR_CLASSES.get(agent_type) or f"avatar-{agent_type}")
         self.set_size_request(48, 48)
         
-        # Get initials
-        initials = "".join([n[0].upper() for n in name.split()[:2]])
-        
-        label = Gtk.Label(label=initials)
+        label = Gtk.Label(label=_initials(name))
         label.set_halign(Gtk.Align.CENTER)
         label.set_valign(Gtk.Align.CENTER)
         
@@ -624,9 +745,7 @@ class ModernEntry(Gtk.Box):
         super().__init__(orientation=Gtk.Orientation.VERTICAL, spacing=8)
         
         if label:
-            lbl = Gtk.Label()
-            lbl.set_markup(f'<span font_weight="600" color="{COLORS["text_primary"]}">{label}</span>')
-            lbl.set_halign(Gtk.Align.START)
+            lbl = _make_label(label, attrs=FIELD_LABEL_ATTRS)
             self.pack_start(lbl, False, False, 0)
         
         # Input container
@@ -634,7 +753,7 @@ class ModernEntry(Gtk.Box):
         container.get_style_context().add_class("input-field")
         
         if icon:
-            icon_img = Gtk.Image.new_from_icon_name(icon, Gtk.IconSize.BUTTON)
+            icon_img = _icon_image(icon, ICON_SIZE_BUTTON)
             container.pack_start(icon_img, False, False, 0)
         
         self.entry = Gtk.Entry()
@@ -664,7 +783,9 @@ class StatusBadge(Gtk.Label):
     def __init__(self, text: str, status: str = "info"):
         super().__init__(label=text)
         
-        self.get_style_context().add_class(f"badge badge-{status}")
+        ctx = self.get_style_context()
+        ctx.add_class("badge")
+        ctx.add_class(f"badge-{status}")
         self.set_halign(Gtk.Align.CENTER)
         self.set_valign(Gtk.Align.CENTER)
 
@@ -672,6 +793,9 @@ class StatusBadge(Gtk.Label):
 class NoodeWindow(Gtk.ApplicationWindow):
     """Main application window with modern UI."""
     
+    # Screen-wide style provider, shared by all windows
+    _css_provider: Optional[Gtk.CssProvider] = None
+    
     def __init__(self, application: Gtk.Application):
         super().__init__(application=application)
         
@@ -693,15 +817,23 @@ class NoodeWindow(Gtk.ApplicationWindow):
         self._show_welcome_screen()
     
     def _apply_css(self):
-        """Apply CSS styles."""
+        """Apply CSS styles.
+        
+        The provider is installed for the whole screen, so it is only
+        created and parsed for the first window.
+        """
+        if NoodeWindow._css_provider is not None:
+            return
+        
         provider = Gtk.CssProvider()
-        provider.load_from_data(CSS.encode())
+        provider.load_from_data(CSS_BYTES)
         
         Gtk.StyleContext.add_provider_for_screen(
             Gdk.Screen.get_default(),
             provider,
             Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
         )
+        NoodeWindow._css_provider = provider
     
     def _build_sidebar(self):
         """Build modern sidebar."""
@@ -714,82 +846,96 @@ class NoodeWindow(Gtk.ApplicationWindow):
         logo.get_style_context().add_class("sidebar-logo")
         sidebar.pack_start(logo, False, False, 0)
         
-        # Main section
-        section_main = Gtk.Label(label="Hauptmenü")
-        section_main.get_style_context().add_class("sidebar-section")
-        sidebar.pack_start(section_main, False, False, 0)
-        
         self.nav_buttons = {}
-        
-        nav_items = [
-            ("🏠", "Dashboard", "dashboard"),
-            ("💬", "Neues Projekt", "new_project"),
-            ("📁", "Meine Projekte", "projects"),
-        ]
-        
-        for icon, label, page_id in nav_items:
-            btn = Gtk.Button(label=f"  {icon}  {label}")
-            btn.get_style_context().add_class("sidebar-item")
-            btn.set_relief(Gtk.ReliefStyle.NONE)
-            btn.connect("clicked", self._on_nav_clicked, page_id)
-            sidebar.pack_start(btn, False, False, 0)
-            self.nav_buttons[page_id] = btn
-        
-        # Separator
-        sidebar.pack_start(Gtk.Separator(orientation=Gtk.Orientation.HORIZONTAL), 
-                          False, False, 16)
-        
-        # Tools section
-        section_tools = Gtk.Label(label="Werkzeuge")
-        section_tools.get_style_context().add_class("sidebar-section")
-        sidebar.pack_start(section_tools, False, False, 0)
-        
-        tool_items = [
-            ("🔍", "Research", "research"),
-            ("🎨", "Design", "design"),
-            ("⚡", "Code Review", "review"),
-            ("🔒", "Security", "security"),
-        ]
-        
-        for icon, label, page_id in tool_items:
-            btn = Gtk.Button(label=f"  {icon}  {label}")
-            btn.get_style_context().add_class("sidebar-item")
-            btn.set_relief(Gtk.ReliefStyle.NONE)
-            btn.connect("clicked", self._on_nav_clicked, page_id)
-            sidebar.pack_start(btn, False, False, 0)
-            self.nav_buttons[page_id] = btn
-        
-        # Spacer
-        sidebar.pack_start(Gtk.Box(), True, True, 0)
-        
-        # Settings at bottom
-        btn_settings = Gtk.Button(label="  ⚙️  Einstellungen")
-        btn_settings.get_style_context().add_class("sidebar-item")
-        btn_settings.set_relief(Gtk.ReliefStyle.NONE)
-        btn_settings.connect("clicked", self._on_nav_clicked, "settings")
-        sidebar.pack_start(btn_settings, False, False, 0)
-        self.nav_buttons["settings"] = btn_settings
+        self._active_nav_id: Optional[str] = None
+        
+        for kind, section_title, items in NAV_LAYOUT:
+            if kind == "separator":
+                sidebar.pack_start(
+                    Gtk.Separator(orientation=Gtk.Orientation.HORIZONTAL),
+                    False, False, 16
+                )
+            elif kind == "spacer":
+                sidebar.pack_start(Gtk.Box(), True, True, 0)
+            
+            if section_title:
+                section = Gtk.Label(label=section_title)
+                section.get_style_context().add_class("sidebar-section")
+                sidebar.pack_start(section, False, False, 0)
+            
+            for label, page_id in items:
+                self._add_nav_button(sidebar, label, page_id)
         
         self.main_box.pack_start(sidebar, False, False, 0)
     
+    def _add_nav_button(self, sidebar: Gtk.Box, label: str, page_id: str):
+        """Add a navigation button to the sidebar."""
+        btn = Gtk.Button(label=label)
+        btn.get_style_context().add_class("sidebar-item")
+        btn.set_relief(Gtk.ReliefStyle.NONE)
+        btn.connect("clicked", self._on_nav_clicked, page_id)
+        sidebar.pack_start(btn, False, False, 0)
+        self.nav_buttons[page_id] = btn
+    
     def _build_content(self):
         """Build main content area."""
         self.content_stack = Gtk.Stack()
-        self.content_stack.set_transition_type(
-            Gtk.StackTransitionType.SLIDE_LEFT_RIGHT
-        )
-        self.content_stack.set_transition_duration(300)
+        
+        # Page transitions follow the desktop's animation setting
+        settings = Gtk.Settings.get_default()
+        self._update_stack_transition(settings)
+        settings.connect("notify::gtk-enable-animations", self._update_stack_transition)
         
         self.main_box.pack_start(self.content_stack, True, True, 0)
+        
+        # Pages in the stack, least recently shown first
+        self._pages: OrderedDict[str, Gtk.Widget] = OrderedDict()
+    
+    def _update_stack_transition(self, settings: Gtk.Settings, *args):
+        """Slide between pages, or switch instantly if animations are off."""
+        if settings.get_property("gtk-enable-animations"):
+            self.content_stack.set_transition_type(
+                Gtk.StackTransitionType.SLIDE_LEFT_RIGHT
+            )
+            self.content_stack.set_transition_duration(300)
+        else:
+            self.content_stack.set_transition_type(Gtk.StackTransitionType.NONE)
+            self.content_stack.set_transition_duration(0)
+    
+    def _show_cached_page(self, name: str) -> bool:
+        """Show a page that is already in the stack.
+        
+        Returns:
+            True if the page was cached and is now visible
+        """
+        if name not in self._pages:
+            return False
+        
+        self._pages.move_to_end(name)
+        self.content_stack.set_visible_child_name(name)
+        return True
+    
+    def _add_page(self, page: Gtk.Widget, name: str):
+        """Add a page to the stack, show it and evict the stalest page."""
+        self.content_stack.add_named(page, name)
+        self.content_stack.set_visible_child_name(name)
+        self._pages[name] = page
+        
+        if len(self._pages) > MAX_CACHED_PAGES:
+            _, old_page = self._pages.popitem(last=False)
+            self.content_stack.remove(old_page)
+            old_page.destroy()
     
     def _on_nav_clicked(self, button, page_id: str):
         """Handle navigation click."""
-        # Update active state
-        for bid, btn in self.nav_buttons.items():
-            if bid == page_id:
-                btn.get_style_context().add_class("sidebar-item-active")
-            else:
-                btn.get_style_context().remove_class("sidebar-item-active")
+        # Update active state on the outgoing and incoming buttons only
+        if page_id != self._active_nav_id:
+            if self._active_nav_id is not None:
+                self.nav_buttons[self._active_nav_id].get_style_context().remove_class(
+                    "sidebar-item-active"
+                )
+            self.nav_buttons[page_id].get_style_context().add_class("sidebar-item-active")
+            self._active_nav_id = page_id
         
         # Show page
         if page_id == "dashboard":
@@ -804,8 +950,7 @@ class NoodeWindow(Gtk.ApplicationWindow):
     
     def _show_welcome_screen(self):
         """Show beautiful welcome/dashboard screen."""
-        if self.content_stack.get_child_by_name("welcome"):
-            self.content_stack.set_visible_child_name("welcome")
+        if self._show_cached_page("welcome"):
             return
         
         page = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=0)
@@ -836,11 +981,7 @@ class NoodeWindow(Gtk.ApplicationWindow):
         content.set_margin_bottom(32)
         
         # Quick actions grid
-        actions_label = Gtk.Label()
-        actions_label.set_markup(
-            f'<span font_size="large" font_weight="bold" color="{COLORS["text_primary"]}">Schnellstart</span>'
-        )
-        actions_label.set_halign(Gtk.Align.START)
+        actions_label = _make_label("Schnellstart", attrs=HEADING_ATTRS)
         content.pack_start(actions_label, False, False, 0)
         
         actions_grid = Gtk.FlowBox()
@@ -859,56 +1000,81 @@ class NoodeWindow(Gtk.ApplicationWindow):
             ("🎮", "Spiel", "Browsergame erstellen", self._on_game_clicked),
         ]
         
-        for icon, title, desc, callback in actions:
+        # The first row renders with the page; the rest follows when idle
+        for icon, title, desc, callback in actions[:3]:
             action = QuickAction(title, desc, icon, callback)
             actions_grid.add(action)
         
+        self._append_deferred(actions_grid, [
+            partial(QuickAction, title, desc, icon, callback)
+            for icon, title, desc, callback in actions[3:]
+        ])
+        
         content.pack_start(actions_grid, False, False, 0)
         
         # Recent projects section
         content.pack_start(Gtk.Separator(), False, False, 16)
         
-        recent_label = Gtk.Label()
-        recent_label.set_markup(
-            f'<span font_size="large" font_weight="bold" color="{COLORS["text_primary"]}">Letzte Projekte</span>'
-        )
-        recent_label.set_halign(Gtk.Align.START)
+        recent_label = _make_label("Letzte Projekte", attrs=HEADING_ATTRS)
         content.pack_start(recent_label, False, False, 0)
         
-        # Example project cards
+        # Example project cards, built after first paint
         projects_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
         
-        for i in range(3):
-            card = ModernCard(
-                title=f"Projekt {i+1}",
-                subtitle="Zuletzt bearbeitet: Heute",
-                icon="folder-symbolic"
-            )
-            
-            # Add status badge
-            status_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=8)
-            status_box.set_halign(Gtk.Align.END)
-            
-            statuses = [("Aktiv", "success"), ("In Entwicklung", "info"), ("Review", "warning")]
-            text, status = statuses[i]
-            badge = StatusBadge(text, status)
-            status_box.pack_start(badge, False, False, 0)
-            
-            card.content.pack_start(status_box, False, False, 0)
-            projects_box.pack_start(card, False, False, 0)
+        self._append_deferred(projects_box, [
+            partial(self._build_recent_project_card, title, text, status)
+            for title, text, status in RECENT_PROJECTS
+        ])
         
         content.pack_start(projects_box, False, False, 0)
         
         scroll.add(content)
         page.pack_start(scroll, True, True, 0)
         
-        self.content_stack.add_named(page, "welcome")
-        self.content_stack.set_visible_child_name("welcome")
+        self._add_page(page, "welcome")
+    
+    def _build_recent_project_card(self, title: str, text: str, status: str) -> Gtk.Widget:
+        """Build a recent-project card with its status badge."""
+        card = ModernCard(
+            title=title,
+            subtitle="Zuletzt bearbeitet: Heute",
+            icon="folder-symbolic"
+        )
+        
+        # Status badge, right-aligned without a wrapper box
+        badge = StatusBadge(text, status)
+        badge.set_halign(Gtk.Align.END)
+        card.content.pack_start(badge, False, False, 0)
+        return card
+    
+    def _append_deferred(self, container: Gtk.Container,
+                         factories: list[Callable[[], Gtk.Widget]]):
+        """Build and add widgets from idle callbacks, one per iteration.
+        
+        Keeps widget construction that is not needed for the first frame
+        off the critical path. Stops early if the container has left the
+        window, e.g. because its page was evicted.
+        """
+        pending = iter(factories)
+        
+        def append_next() -> bool:
+            factory = next(pending, None)
+            if factory is None or container.get_toplevel() is not self:
+                return GLib.SOURCE_REMOVE
+            
+            widget = factory()
+            if isinstance(container, Gtk.Box):
+                container.pack_start(widget, False, False, 0)
+            else:
+                container.add(widget)
+            widget.show_all()
+            return GLib.SOURCE_CONTINUE
+        
+        GLib.idle_add(append_next)
     
     def _show_new_project_screen(self):
         """Show new project creation screen."""
-        if self.content_stack.get_child_by_name("new_project"):
-            self.content_stack.set_visible_child_name("new_project")
+        if self._show_cached_page("new_project"):
             return
         
         page = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=0)
@@ -918,17 +1084,14 @@ class NoodeWindow(Gtk.ApplicationWindow):
         header_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=8)
         header_box.set_margin_bottom(32)
         
-        title = Gtk.Label(label="Neues Projekt erstellen")
-        title.get_style_context().add_class("page-title")
-        title.set_halign(Gtk.Align.START)
+        title = _make_label("Neues Projekt erstellen", "page-title")
         header_box.pack_start(title, False, False, 0)
         
-        subtitle = Gtk.Label(
-            label="Beschreibe dein Projekt in eigenen Worten. "
-                  "Unsere AI-Agents kümmern sich um den Rest."
+        subtitle = _make_label(
+            "Beschreibe dein Projekt in eigenen Worten. "
+            "Unsere AI-Agents kümmern sich um den Rest.",
+            "page-subtitle"
         )
-        subtitle.get_style_context().add_class("page-subtitle")
-        subtitle.set_halign(Gtk.Align.START)
         header_box.pack_start(subtitle, False, False, 0)
         
         page.pack_start(header_box, False, False, 0)
@@ -951,11 +1114,7 @@ class NoodeWindow(Gtk.ApplicationWindow):
         content.pack_start(name_input, False, False, 0)
         
         # Description text area
-        desc_label = Gtk.Label()
-        desc_label.set_markup(
-            f'<span font_weight="600" color="{COLORS["text_primary"]}">Beschreibung</span>'
-        )
-        desc_label.set_halign(Gtk.Align.START)
+        desc_label = _make_label("Beschreibung", attrs=FIELD_LABEL_ATTRS)
         content.pack_start(desc_label, False, False, 0)
         
         desc_scroll = Gtk.ScrolledWindow()
@@ -972,11 +1131,7 @@ class NoodeWindow(Gtk.ApplicationWindow):
         content.pack_start(desc_scroll, False, False, 0)
         
         # Template selection
-        template_label = Gtk.Label()
-        template_label.set_markup(
-            f'<span font_weight="600" color="{COLORS["text_primary"]}">Vorlage</span>'
-        )
-        template_label.set_halign(Gtk.Align.START)
+        template_label = _make_label("Vorlage", attrs=FIELD_LABEL_ATTRS)
         template_label.set_margin_top(16)
         content.pack_start(template_label, False, False, 0)
         
@@ -1020,13 +1175,11 @@ class NoodeWindow(Gtk.ApplicationWindow):
         scroll.add(content)
         page.pack_start(scroll, True, True, 0)
         
-        self.content_stack.add_named(page, "new_project")
-        self.content_stack.set_visible_child_name("new_project")
+        self._add_page(page, "new_project")
     
     def _show_projects_screen(self):
         """Show projects list screen."""
-        if self.content_stack.get_child_by_name("projects"):
-            self.content_stack.set_visible_child_name("projects")
+        if self._show_cached_page("projects"):
             return
         
         page = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=0)
@@ -1037,14 +1190,10 @@ class NoodeWindow(Gtk.ApplicationWindow):
         
         title_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=8)
         
-        title = Gtk.Label(label="Meine Projekte")
-        title.get_style_context().add_class("page-title")
-        title.set_halign(Gtk.Align.START)
+        title = _make_label("Meine Projekte", "page-title")
         title_box.pack_start(title, False, False, 0)
         
-        subtitle = Gtk.Label(label="Alle deine Projekte auf einen Blick")
-        subtitle.get_style_context().add_class("page-subtitle")
-        subtitle.set_halign(Gtk.Align.START)
+        subtitle = _make_label("Alle deine Projekte auf einen Blick", "page-subtitle")
         title_box.pack_start(subtitle, False, False, 0)
         
         header_box.pack_start(title_box, True, True, 0)
@@ -1113,14 +1262,12 @@ class NoodeWindow(Gtk.ApplicationWindow):
         scroll.add(content)
         page.pack_start(scroll, True, True, 0)
         
-        self.content_stack.add_named(page, "projects")
-        self.content_stack.set_visible_child_name("projects")
+        self._add_page(page, "projects")
     
     def _show_placeholder_screen(self, page_id: str):
         """Show placeholder for unimplemented screens."""
         name = f"placeholder_{page_id}"
-        if self.content_stack.get_child_by_name(name):
-            self.content_stack.set_visible_child_name(name)
+        if self._show_cached_page(name):
             return
         
         page = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=24)
@@ -1145,8 +1292,7 @@ class NoodeWindow(Gtk.ApplicationWindow):
         back_btn.set_halign(Gtk.Align.CENTER)
         page.pack_start(back_btn, False, False, 0)
         
-        self.content_stack.add_named(page, name)
-        self.content_stack.set_visible_child_name(name)
+        self._add_page(page, name)
     
     # Event handlers
     def _on_webapp_clicked(self, button):
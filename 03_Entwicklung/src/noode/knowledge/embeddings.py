@@ -5,6 +5,9 @@ using sentence-transformers models. These embeddings are used for
 semantic search and RAG (Retrieval Augmented Generation).
 """
 
+import functools
+import hashlib
+import threading
 import structlog
 from typing import List, Optional
 import numpy as np
@@ -33,90 +36,159 @@ class EmbeddingService:
         "multilingual": "paraphrase-multilingual-MiniLM-L12-v2",  # Multi-language
     }
     
+    # Output dimensions of known models, so the dimension can be reported
+    # without loading the model
+    KNOWN_DIMS = {
+        "all-MiniLM-L6-v2": 384,
+        "all-mpnet-base-v2": 768,
+        "microsoft/codebert-base": 768,
+        "paraphrase-multilingual-MiniLM-L12-v2": 384,
+    }
+    
     def __init__(self, model_name: Optional[str] = None):
         """Initialize the embedding service.
         
+        The model itself is loaded lazily on first use.
+        
         Args:
             model_name: Name of the sentence-transformers model to use.
                        If None, uses the default model.
         """
         self.model_name = model_name or self.DEFAULT_MODEL
-        self._model = None
-        self._embedding_dim = None
+        self._model: Optional["SentenceTransformer"] = None
+        self._model_loaded = False
+        self._model_lock = threading.Lock()
+        self._embedding_dim = self.KNOWN_DIMS.get(self.model_name)
+        # Per-instance cache so repeated interactive queries skip the model
+        self._query_cache = functools.lru_cache(maxsize=256)(self._embed_readonly)
         
-        if SENTENCE_TRANSFORMERS_AVAILABLE:
-            try:
-                logger.info("loading_embedding_model", model=self.model_name)
-                self._model = SentenceTransformer(self.model_name)
-                self._embedding_dim = self._model.get_sentence_embedding_dimension()
-                logger.info("embedding_model_loaded", 
-                          model=self.model_name, 
-                          dimension=self._embedding_dim)
-            except Exception as e:
-                logger.error("failed_to_load_embedding_model", error=str(e))
-                self._model = None
-        else:
+        if not SENTENCE_TRANSFORMERS_AVAILABLE:
             logger.warning("sentence_transformers_not_available")
     
-    def embed(self, text: str) -> List[float]:
+    def _ensure_model(self) -> Optional["SentenceTransformer"]:
+        """Load the sentence-transformers model once, on first use.
+        
+        Returns:
+            The loaded model, or None if it is unavailable
+        """
+        if self._model_loaded:
+            return self._model
+        with self._model_lock:
+            if self._model_loaded:
+                return self._model
+            if SENTENCE_TRANSFORMERS_AVAILABLE:
+                try:
+                    logger.info("loading_embedding_model", model=self.model_name)
+                    model = SentenceTransformer(self.model_name)
+                    self._embedding_dim = model.get_sentence_embedding_dimension()
+                    self._model = model
+                    logger.info("embedding_model_loaded", 
+                              model=self.model_name, 
+                              dimension=self._embedding_dim)
+                except Exception as e:
+                    logger.error("failed_to_load_embedding_model", error=str(e))
+                    self._model = None
+            self._model_loaded = True
+            return self._model
+    
+    @functools.cached_property
+    def _zero_vec(self) -> np.ndarray:
+        """Shared read-only result for empty texts."""
+        zero_vec = np.zeros(self.embedding_dimension, dtype=np.float32)
+        zero_vec.flags.writeable = False
+        return zero_vec
+    
+    def embed(self, text: str) -> np.ndarray:
         """Generate embedding for a single text.
         
         Args:
             text: Text to embed
             
         Returns:
-            List of floats representing the embedding vector
+            Unit-length float32 array (a shared read-only zero vector for
+            empty text)
         """
         if not text or not text.strip():
-            # Return zero vector for empty text
-            return [0.0] * (self._embedding_dim or 384)
+            return self._zero_vec
         
-        if self._model is not None:
+        model = self._ensure_model()
+        if model is not None:
             try:
-                embedding = self._model.encode(text, convert_to_numpy=True)
-                return embedding.tolist()
+                embedding = model.encode(
+                    text, convert_to_numpy=True, normalize_embeddings=True
+                )
+                return np.asarray(embedding, dtype=np.float32)
             except Exception as e:
                 logger.error("embedding_failed", error=str(e))
                 return self._fallback_embed(text)
         else:
             return self._fallback_embed(text)
     
-    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+    def embed_query(self, text: str) -> np.ndarray:
+        """Embed a search query, reusing results for repeated queries.
+        
+        Args:
+            text: Query text
+            
+        Returns:
+            Read-only float32 embedding vector (copy it before mutating)
+        """
+        return self._query_cache(text)
+    
+    def _embed_readonly(self, text: str) -> np.ndarray:
+        embedding = self.embed(text)
+        embedding.flags.writeable = False
+        return embedding
+    
+    def embed_batch(self, texts: List[str]) -> np.ndarray:
         """Generate embeddings for multiple texts efficiently.
         
         Args:
             texts: List of texts to embed
             
         Returns:
-            List of embedding vectors
+            float32 array of shape (len(texts), dimension) with one
+            unit-length row per text; rows for empty texts are zero
         """
-        if not texts:
-            return []
-        
-        if self._model is not None:
+        model = self._ensure_model()
+        if model is not None and texts:
             try:
-                # Filter out empty texts
-                valid_texts = [t for t in texts if t and t.strip()]
-                if not valid_texts:
-                    return [[0.0] * self._embedding_dim] * len(texts)
-                
-                embeddings = self._model.encode(
-                    valid_texts, 
-                    convert_to_numpy=True,
-                    show_progress_bar=False
+                valid = np.fromiter(
+                    (bool(t and t.strip()) for t in texts), dtype=bool, count=len(texts)
                 )
+                if valid.all():
+                    return self._encode(model, texts)
                 
-                # Convert to list of lists
-                return [emb.tolist() for emb in embeddings]
+                # Encode only non-empty texts and scatter them into place
+                embeddings = np.zeros((len(texts), self.embedding_dimension), dtype=np.float32)
+                if valid.any():
+                    embeddings[valid] = self._encode(
+                        model, [t for t in texts if t and t.strip()]
+                    )
+                return embeddings
                 
             except Exception as e:
                 logger.error("batch_embedding_failed", error=str(e))
-                # Fall back to individual embeddings
-                return [self.embed(text) for text in texts]
-        else:
-            return [self.embed(text) for text in texts]
+        
+        # Fall back to individual embeddings
+        embeddings = np.empty((len(texts), self.embedding_dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            embeddings[row] = self.embed(text)
+        return embeddings
+    
+    @staticmethod
+    def _encode(model: "SentenceTransformer", texts: List[str]) -> np.ndarray:
+        """Run the model over non-empty texts, returning an (N, D) float32 array."""
+        embeddings = model.encode(
+            texts,
+            batch_size=64,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+        return np.asarray(embeddings, dtype=np.float32)
     
-    def _fallback_embed(self, text: str) -> List[float]:
+    def _fallback_embed(self, text: str) -> np.ndarray:
         """Fallback embedding when sentence-transformers is not available.
         
         Uses a simple hash-based approach - not semantically meaningful
@@ -126,25 +198,15 @@ class EmbeddingService:
             text: Text to create fallback embedding for
             
         Returns:
-            List of floats (384 dimensions by default)
+            float32 array (384 dimensions by default)
         """
-        import hashlib
-        
-        # Create a deterministic hash-based embedding
-        dim = 384
-        hash_val = hashlib.md5(text.encode()).hexdigest()
-        
-        # Generate pseudo-random but deterministic floats
-        embedding = []
-        for i in range(dim):
-            # Use different parts of hash
-            idx = (i * 2) % len(hash_val)
-            val = int(hash_val[idx:idx+2], 16) / 255.0
-            # Center around 0
-            val = (val - 0.5) * 2
-            embedding.append(val)
-        
-        return embedding
+        # SHAKE-128 yields one deterministic byte per dimension
+        digest = hashlib.shake_128(text.encode()).digest(self.embedding_dimension)
+        embedding = np.frombuffer(digest, dtype=np.uint8).astype(np.float32)
+        # Map bytes from [0, 255] to [-1, 1], then scale to unit length
+        embedding = embedding * (2.0 / 255.0) - 1.0
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm > 0 else embedding
     
     def similarity(self, text1: str, text2: str) -> float:
         """Calculate cosine similarity between two texts.
@@ -156,32 +218,46 @@ class EmbeddingService:
         Returns:
             Cosine similarity score (0 to 1)
         """
-        emb1 = np.array(self.embed(text1))
-        emb2 = np.array(self.embed(text2))
-        
-        # Calculate cosine similarity
-        dot_product = np.dot(emb1, emb2)
-        norm1 = np.linalg.norm(emb1)
-        norm2 = np.linalg.norm(emb2)
-        
-        if norm1 == 0 or norm2 == 0:
-            return 0.0
-        
-        return float(dot_product / (norm1 * norm2))
+        # One forward pass for both texts; rows are unit length (or zero),
+        # so their dot product is the cosine
+        embeddings = self.embed_batch([text1, text2])
+        return float(embeddings[0] @ embeddings[1])
     
     @property
     def embedding_dimension(self) -> int:
-        """Get the dimension of embeddings."""
+        """Get the dimension of embeddings.
+        
+        Known models answer without loading; others load the model first.
+        """
+        if self._embedding_dim is None:
+            self._ensure_model()
         return self._embedding_dim or 384
     
     @property
     def is_available(self) -> bool:
         """Check if the embedding service is available."""
-        return self._model is not None
+        return self._ensure_model() is not None
+
+
+@functools.lru_cache(maxsize=8)
+def _load_service(model_name: str) -> EmbeddingService:
+    return EmbeddingService(model_name)
+
+
+def _get_service(model_name: Optional[str] = None) -> EmbeddingService:
+    """Return a shared EmbeddingService so the model is loaded once per name.
+    
+    Args:
+        model_name: Optional model name; None resolves to the default model
+        
+    Returns:
+        Cached embedding service
+    """
+    return _load_service(model_name or EmbeddingService.DEFAULT_MODEL)
 
 
 # Convenience function for quick embedding
-def embed_text(text: str, model_name: Optional[str] = None) -> List[float]:
+def embed_text(text: str, model_name: Optional[str] = None) -> np.ndarray:
     """Quick function to embed text without creating a service instance.
     
     Args:
@@ -191,5 +267,4 @@ def embed_text(text: str, model_name: Optional[str] = None) -> List[float]:
     Returns:
         Embedding vector
     """
-    service = EmbeddingService(model_name)
-    return service.embed(text)
+    return _get_service(model_name).embed(text)
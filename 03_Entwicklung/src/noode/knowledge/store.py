@@ -7,28 +7,86 @@ This module provides:
 - Code and documentation indexing
 """
 
+import asyncio
+import io
+import sqlite3
 import structlog
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
+from pathlib import Path
 import hashlib
+import time
 import uuid
-import math
+
+import numpy as np
 
 try:
-    from qdrant_client import QdrantClient
-    from qdrant_client.models import Distance, VectorParams, PointStruct
+    from qdrant_client import AsyncQdrantClient, QdrantClient
+    from qdrant_client.models import (
+        Distance,
+        FieldCondition,
+        Filter,
+        HnswConfigDiff,
+        MatchValue,
+        PayloadSchemaType,
+        PointStruct,
+        QuantizationSearchParams,
+        ScalarQuantization,
+        ScalarQuantizationConfig,
+        ScalarType,
+        SearchParams,
+        VectorParams,
+    )
     QDRANT_AVAILABLE = True
 except ImportError:
     QDRANT_AVAILABLE = False
     print("Warning: qdrant-client not installed. Knowledge Store will use fallback.")
 
+try:
+    import hnswlib
+    HNSWLIB_AVAILABLE = True
+except ImportError:
+    HNSWLIB_AVAILABLE = False
+
 from noode.knowledge.embeddings import EmbeddingService
 
 logger = structlog.get_logger()
 
+# Rows dequantized per BLAS call when scoring the in-memory matrix
+_SCORE_CHUNK_ROWS = 4096
+
+
+def _content_hash(document: "Document") -> str:
+    """Digest used to recognise documents whose content was already added.
+    
+    The type is part of the key so the same text can be filed under
+    several document types.
+    """
+    key = f"{document.doc_type}\0{document.content}"
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+
+def _quantize(vector: np.ndarray) -> Tuple[np.ndarray, float]:
+    """Quantize a vector to int8 with a per-vector scale.
+    
+    Args:
+        vector: Non-zero float vector
+        
+    Returns:
+        Tuple of (int8 vector, scale) with vector ~= int8 vector * scale
+    """
+    scale = float(np.abs(vector).max()) / 127.0
+    return np.round(vector / scale).astype(np.int8), scale
+
 
 class Document:
-    """Represents a document in the knowledge store."""
+    """Represents a document in the knowledge store.
+    
+    The embedding may be supplied up front (e.g. from a batched upstream
+    pipeline); KnowledgeStore only computes it when it is still None.
+    The creation time is kept as integer epoch nanoseconds and only
+    formatted on request.
+    """
     
     def __init__(
         self,
@@ -36,35 +94,55 @@ class Document:
         doc_type: str = "text",
         metadata: Optional[Dict[str, Any]] = None,
         doc_id: Optional[str] = None,
+        embedding: Optional[np.ndarray] = None,
     ):
         self.id = doc_id or str(uuid.uuid4())
         self.content = content
         self.doc_type = doc_type  # text, code, markdown, etc.
         self.metadata = metadata or {}
-        self.created_at = datetime.now().isoformat()
-        self.embedding: Optional[List[float]] = None
+        self.created_at_ns = time.time_ns()
+        self.embedding = embedding
     
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary."""
-        return {
+    @property
+    def created_at(self) -> datetime:
+        """Creation time as a datetime."""
+        return datetime.fromtimestamp(self.created_at_ns / 1e9)
+    
+    def to_dict(self, iso: bool = False) -> Dict[str, Any]:
+        """Convert to dictionary.
+        
+        Args:
+            iso: Emit ``created_at`` as an ISO string instead of the raw
+                ``created_at_ns`` integer
+        """
+        data = {
             "id": self.id,
             "content": self.content,
             "doc_type": self.doc_type,
             "metadata": self.metadata,
-            "created_at": self.created_at,
             "has_embedding": self.embedding is not None,
         }
+        if iso:
+            data["created_at"] = self.created_at.isoformat()
+        else:
+            data["created_at_ns"] = self.created_at_ns
+        return data
 
 
 class KnowledgeStore:
     """Vector-based knowledge store using Qdrant."""
     
+    # Below this size the exact NumPy scan is faster than an HNSW graph
+    HNSW_MIN_DOCUMENTS = 10_000
+    
     def __init__(
         self,
         host: str = "localhost",
         port: int = 6333,
         collection_name: str = "noode_knowledge",
         embedding_model: Optional[str] = None,
+        store_content_in_payload: bool = False,
+        storage_path: Optional[Path] = None,
     ):
         """Initialize knowledge store.
         
@@ -73,17 +151,60 @@ class KnowledgeStore:
             port: Qdrant port
             collection_name: Name of the collection
             embedding_model: Name of the embedding model to use
+            store_content_in_payload: Keep document content in the Qdrant
+                payload. When False, content lives in a local SQLite file
+                and payloads only carry id, type and metadata.
+            storage_path: Directory for the local content database
+                (defaults to ~/.noode/knowledge)
         """
         self.host = host
         self.port = port
         self.collection_name = collection_name
+        self.store_content_in_payload = store_content_in_payload
+        self.storage_path = storage_path or Path.home() / ".noode" / "knowledge"
+        self._content_db: Optional[sqlite3.Connection] = None
+        # Content hash -> doc_id (and back) for documents stored through
+        # this instance or found in Qdrant, so unchanged content is not
+        # embedded and upserted again on re-ingestion
+        self._content_hashes: Dict[str, str] = {}
+        self._doc_hashes: Dict[str, str] = {}
+        # Qdrant's hashes are read in one scan on the first add
+        self._hashes_loaded = False
+        self._filter_cache: Dict[str, "Filter"] = {}
+        self._search_params = (
+            SearchParams(
+                quantization=QuantizationSearchParams(rescore=True, oversampling=2.0)
+            )
+            if QDRANT_AVAILABLE else None
+        )
         self.embedding_service = EmbeddingService(embedding_model)
         self._client: Optional[QdrantClient] = None
+        self._async_client: Optional[AsyncQdrantClient] = None
+        
+        # In-memory fallback: documents plus a row-aligned matrix of unit
+        # embeddings, int8-quantized with per-row scales to cut memory 4x.
+        self._memory_store: Dict[str, Document] = {}
+        self._emb_matrix = np.empty(
+            (0, self.embedding_service.embedding_dimension), dtype=np.int8
+        )
+        self._scales = np.empty(0, dtype=np.float32)
+        self._id_index: List[str] = []
+        self._row_of: Dict[str, int] = {}
+        self._type_masks: Dict[str, np.ndarray] = {}
+        # Approximate index over the same vectors, built once the memory
+        # store reaches HNSW_MIN_DOCUMENTS (only if hnswlib is installed)
+        self._hnsw = None
+        self._hnsw_labels: Dict[str, int] = {}
+        self._hnsw_docs: Dict[int, str] = {}
+        self._hnsw_next_label = 0
         
         if QDRANT_AVAILABLE:
             try:
                 self._client = QdrantClient(host=host, port=port)
                 self._ensure_collection()
+                self._async_client = AsyncQdrantClient(host=host, port=port)
+                if not store_content_in_payload:
+                    self._open_content_db()
                 logger.info("knowledge_store_initialized", 
                           host=host, port=port, collection=collection_name)
             except Exception as e:
@@ -91,7 +212,94 @@ class KnowledgeStore:
                 self._client = None
         else:
             logger.warning("qdrant_not_available_using_memory_store")
-            self._memory_store: Dict[str, Document] = {}
+    
+    def _open_content_db(self):
+        """Open the local SQLite side store for document content."""
+        self.storage_path.mkdir(parents=True, exist_ok=True)
+        self._content_db = sqlite3.connect(
+            self.storage_path / f"{self.collection_name}_content.db",
+            check_same_thread=False,
+        )
+        self._content_db.execute("PRAGMA journal_mode=WAL")
+        self._content_db.execute(
+            "CREATE TABLE IF NOT EXISTS content (id TEXT PRIMARY KEY, content TEXT NOT NULL)"
+        )
+    
+    def _store_content(self, documents: List[Document]):
+        """Persist document content to the side store, if enabled."""
+        if not self._content_db:
+            return
+        with self._content_db:
+            self._content_db.executemany(
+                "INSERT OR REPLACE INTO content (id, content) VALUES (?, ?)",
+                [(document.id, document.content) for document in documents],
+            )
+    
+    def _load_content(self, documents: List[Document]):
+        """Fill in content for search hits whose payload did not carry it."""
+        missing = {doc.id: doc for doc in documents if doc.content is None}
+        if not missing:
+            return
+        if self._content_db:
+            placeholders = ",".join("?" * len(missing))
+            rows = self._content_db.execute(
+                f"SELECT id, content FROM content WHERE id IN ({placeholders})",
+                list(missing),
+            )
+            for doc_id, content in rows:
+                missing.pop(doc_id).content = content
+        for doc in missing.values():
+            doc.content = ""
+    
+    def _find_stored(self, content_hashes: List[str]) -> Dict[str, str]:
+        """Map content hashes to the IDs of documents already stored.
+        
+        Lookups are local; the first call loads the hashes of documents
+        stored before a restart so those are recognised too.
+        
+        Args:
+            content_hashes: Hashes of the documents being added
+            
+        Returns:
+            Hash -> stored document ID for the hashes already stored
+        """
+        if not self._hashes_loaded:
+            self._load_hashes()
+        return {
+            content_hash: self._content_hashes[content_hash]
+            for content_hash in content_hashes
+            if content_hash in self._content_hashes
+        }
+    
+    def _load_hashes(self, page_size: int = 1024) -> None:
+        """Read every stored point's content hash from Qdrant in one scroll."""
+        offset = None
+        while self._client:
+            points, offset = self._client.scroll(
+                collection_name=self.collection_name,
+                limit=page_size,
+                offset=offset,
+                with_payload=["content_hash"],
+                with_vectors=False,
+            )
+            for point in points:
+                content_hash = (point.payload or {}).get("content_hash")
+                if content_hash and str(point.id) not in self._doc_hashes:
+                    self._remember_hash(str(point.id), content_hash)
+            if offset is None:
+                logger.info("content_hashes_loaded", count=len(self._content_hashes))
+                break
+        self._hashes_loaded = True
+    
+    def _remember_hash(self, doc_id: str, content_hash: str) -> None:
+        self._forget_hash(doc_id)
+        self._content_hashes[content_hash] = doc_id
+        self._doc_hashes[doc_id] = content_hash
+    
+    def _forget_hash(self, doc_id: str) -> None:
+        content_hash = self._doc_hashes.pop(doc_id, None)
+        if content_hash is not None and self._content_hashes.get(content_hash) == doc_id:
+            del self._content_hashes[content_hash]
     
     def _ensure_collection(self):
         """Ensure the collection exists with proper configuration."""
@@ -111,10 +319,26 @@ class KnowledgeStore:
                         size=self.embedding_service.embedding_dimension,
                         distance=Distance.COSINE,
                     ),
+                    hnsw_config=HnswConfigDiff(m=32, ef_construct=256),
+                    # int8 vectors in RAM; originals are used for rescoring
+                    quantization_config=ScalarQuantization(
+                        scalar=ScalarQuantizationConfig(
+                            type=ScalarType.INT8,
+                            always_ram=True,
+                        ),
+                    ),
                 )
                 logger.info("created_collection", collection=self.collection_name)
             else:
                 logger.info("collection_exists", collection=self.collection_name)
+            
+            # Index doc_type so filtered searches don't scan every payload;
+            # a no-op if the index already exists
+            self._client.create_payload_index(
+                collection_name=self.collection_name,
+                field_name="doc_type",
+                field_schema=PayloadSchemaType.KEYWORD,
+            )
                 
         except Exception as e:
             logger.error("failed_to_ensure_collection", error=str(e))
@@ -124,26 +348,29 @@ class KnowledgeStore:
         """Add a document to the knowledge store.
         
         Args:
-            document: Document to add
+            document: Document to add; an existing embedding is reused
+                as-is and must come from the same embedding model
             
         Returns:
-            Document ID
+            Document ID, or the ID of the already stored document if one
+            with identical content exists
         """
-        # Generate embedding
-        document.embedding = self.embedding_service.embed(document.content)
+        content_hash = _content_hash(document)
+        existing = self._find_stored([content_hash]).get(content_hash)
+        if existing is not None and existing != document.id:
+            logger.info("duplicate_document_skipped", doc_id=existing)
+            return existing
+        
+        if document.embedding is None:
+            document.embedding = self.embedding_service.embed(document.content)
         
         if self._client:
             # Store in Qdrant
             try:
+                self._store_content([document])
                 self._client.upsert(
                     collection_name=self.collection_name,
-                    points=[
-                        PointStruct(
-                            id=document.id,
-                            vector=document.embedding,
-                            payload=document.to_dict(),
-                        )
-                    ],
+                    points=[self._to_point(document, content_hash)],
                 )
                 logger.info("document_added_to_qdrant", doc_id=document.id)
             except Exception as e:
@@ -152,10 +379,99 @@ class KnowledgeStore:
         else:
             # Store in memory
             self._memory_store[document.id] = document
+            self._index_add(document)
             logger.info("document_added_to_memory", doc_id=document.id)
         
+        # Only stored documents count as duplicates of later additions
+        self._remember_hash(document.id, content_hash)
         return document.id
     
+    def add_documents(
+        self,
+        documents: List[Document],
+        batch_size: int = 256,
+    ) -> List[str]:
+        """Add several documents with one embedding pass.
+        
+        Args:
+            documents: Documents to add; only those without an embedding
+                are embedded
+            batch_size: Number of points sent per Qdrant upsert
+            
+        Returns:
+            Document IDs in input order; documents whose content is already
+            stored (or repeated within the batch) map to the existing ID
+        """
+        hashes = [_content_hash(document) for document in documents]
+        # Stored documents, plus the first of any repeats within the batch
+        known = self._find_stored(hashes)
+        ids = []
+        new_documents = []
+        new_hashes = []
+        for document, content_hash in zip(documents, hashes):
+            existing = known.get(content_hash)
+            if existing is not None and existing != document.id:
+                ids.append(existing)
+                continue
+            known[content_hash] = document.id
+            new_documents.append(document)
+            new_hashes.append(content_hash)
+            ids.append(document.id)
+        
+        documents = new_documents
+        if not documents:
+            return ids
+        
+        pending = [document for document in documents if document.embedding is None]
+        if pending:
+            embeddings = self.embedding_service.embed_batch(
+                [document.content for document in pending]
+            )
+            for document, embedding in zip(pending, embeddings):
+                document.embedding = embedding
+        
+        if self._client:
+            try:
+                self._store_content(documents)
+                for start in range(0, len(documents), batch_size):
+                    self._client.upsert(
+                        collection_name=self.collection_name,
+                        points=[
+                            self._to_point(document, content_hash)
+                            for document, content_hash in zip(
+                                documents[start:start + batch_size],
+                                new_hashes[start:start + batch_size],
+                            )
+                        ],
+                        wait=False,
+                    )
+                logger.info("documents_added_to_qdrant", count=len(documents))
+            except Exception as e:
+                logger.error("failed_to_add_to_qdrant", error=str(e))
+                raise
+        else:
+            for document in documents:
+                self._memory_store[document.id] = document
+                self._index_add(document)
+            logger.info("documents_added_to_memory", count=len(documents))
+        
+        # Only stored documents count as duplicates of later additions
+        for document, content_hash in zip(documents, new_hashes):
+            self._remember_hash(document.id, content_hash)
+        return ids
+    
+    def _to_point(self, document: Document, content_hash: str) -> "PointStruct":
+        """Build the Qdrant point for an embedded document."""
+        payload = document.to_dict()
+        payload["content_hash"] = content_hash
+        if not self.store_content_in_payload:
+            del payload["content"]
+        return PointStruct(
+            id=document.id,
+            vector=document.embedding.tolist(),
+            payload=payload,
+        )
+    
     def search(
         self,
         query: str,
@@ -172,72 +488,310 @@ class KnowledgeStore:
         Returns:
             List of matching documents
         """
-        # Generate query embedding
-        query_embedding = self.embedding_service.embed(query)
+        query_embedding = self.embedding_service.embed_query(query)
+        return self.search_by_vector(query_embedding, top_k, doc_type)
+    
+    def search_by_vector(
+        self,
+        query_embedding: np.ndarray,
+        top_k: int = 5,
+        doc_type: Optional[str] = None,
+        with_content: bool = True,
+    ) -> List[Document]:
+        """Search for documents similar to an already computed embedding.
         
+        Args:
+            query_embedding: Query vector from the store's embedding service
+            top_k: Number of results to return
+            doc_type: Filter by document type
+            with_content: Load content kept outside the Qdrant payload; pass
+                False when only IDs/metadata are needed (content is then
+                None for such hits)
+            
+        Returns:
+            List of matching documents
+        """
         if self._client:
             # Search in Qdrant
             try:
-                filter_condition = None
-                if doc_type:
-                    filter_condition = {
-                        "must": [
-                            {"key": "doc_type", "match": {"value": doc_type}}
-                        ]
-                    }
-                
-                results = self._client.search(
+                results = self._client.query_points(
                     collection_name=self.collection_name,
-                    query_vector=query_embedding,
+                    query=query_embedding.tolist(),
                     limit=top_k,
-                    query_filter=filter_condition,
+                    query_filter=self._doc_type_filter(doc_type),
+                    search_params=self._search_params,
                 )
-                
-                documents = []
-                for result in results:
-                    doc = Document(
-                        content=result.payload.get("content", ""),
-                        doc_type=result.payload.get("doc_type", "text"),
-                        metadata=result.payload.get("metadata", {}),
-                        doc_id=result.id,
-                    )
-                    doc.embedding = result.vector
-                    documents.append(doc)
-                
-                logger.info("search_completed", 
-                          query_length=len(query), 
-                          results=len(documents))
+                documents = [self._document_from_hit(result) for result in results.points]
+                if with_content:
+                    self._load_content(documents)
+                logger.info("search_completed", results=len(documents))
                 return documents
                 
             except Exception as e:
                 logger.error("search_failed", error=str(e))
                 return []
         else:
-            # Search in memory (simple cosine similarity using pure Python)
-            results = []
-            for doc in self._memory_store.values():
-                if doc_type and doc.doc_type != doc_type:
-                    continue
-                
-                if doc.embedding:
-                    # Calculate cosine similarity manually
-                    doc_emb = doc.embedding
-                    query_emb = query_embedding
-                    
-                    # Dot product
-                    dot_product = sum(a * b for a, b in zip(doc_emb, query_emb))
-                    
-                    # Norms
-                    norm_doc = math.sqrt(sum(x * x for x in doc_emb))
-                    norm_query = math.sqrt(sum(x * x for x in query_emb))
-                    
-                    if norm_doc > 0 and norm_query > 0:
-                        similarity = dot_product / (norm_doc * norm_query)
-                        results.append((similarity, doc))
+            return self._memory_search(query_embedding, top_k, doc_type)
+    
+    async def search_async(
+        self,
+        query: str,
+        top_k: int = 5,
+        doc_type: Optional[str] = None,
+    ) -> List[Document]:
+        """Search without blocking the event loop.
+        
+        The query is embedded in a worker thread and the Qdrant round-trip
+        is awaited, so concurrent searches overlap.
+        
+        Args:
+            query: Search query
+            top_k: Number of results to return
+            doc_type: Filter by document type
+            
+        Returns:
+            List of matching documents
+        """
+        query_embedding = await asyncio.to_thread(
+            self.embedding_service.embed_query, query
+        )
+        return await self.search_by_vector_async(query_embedding, top_k, doc_type)
+    
+    async def search_by_vector_async(
+        self,
+        query_embedding: np.ndarray,
+        top_k: int = 5,
+        doc_type: Optional[str] = None,
+        with_content: bool = True,
+    ) -> List[Document]:
+        """Async variant of search_by_vector using the async Qdrant client.
+        
+        Args:
+            query_embedding: Query vector from the store's embedding service
+            top_k: Number of results to return
+            doc_type: Filter by document type
+            with_content: Load content kept outside the Qdrant payload
             
-            # Sort by similarity and return top_k
-            results.sort(key=lambda x: x[0], reverse=True)
-            return [doc for _, doc in results[:top_k]]
+        Returns:
+            List of matching documents
+        """
+        if not self._async_client:
+            return self.search_by_vector(query_embedding, top_k, doc_type, with_content)
+        
+        try:
+            results = await self._async_client.query_points(
+                collection_name=self.collection_name,
+                query=query_embedding.tolist(),
+                limit=top_k,
+                query_filter=self._doc_type_filter(doc_type),
+                search_params=self._search_params,
+            )
+            documents = [self._document_from_hit(result) for result in results.points]
+            if with_content:
+                self._load_content(documents)
+            logger.info("search_completed", results=len(documents))
+            return documents
+        except Exception as e:
+            logger.error("search_failed", error=str(e))
+            return []
+    
+    def _doc_type_filter(self, doc_type: Optional[str]) -> Optional["Filter"]:
+        """Qdrant filter restricting results to a document type, built once per type."""
+        if not doc_type:
+            return None
+        query_filter = self._filter_cache.get(doc_type)
+        if query_filter is None:
+            query_filter = Filter(
+                must=[FieldCondition(key="doc_type", match=MatchValue(value=doc_type))]
+            )
+            self._filter_cache[doc_type] = query_filter
+        return query_filter
+    
+    @staticmethod
+    def _document_from_hit(result: Any) -> Document:
+        """Rebuild a Document from a Qdrant search hit."""
+        doc = Document(
+            # None until _load_content fetches it from the side store
+            content=result.payload.get("content"),
+            doc_type=result.payload.get("doc_type", "text"),
+            metadata=result.payload.get("metadata", {}),
+            doc_id=result.id,
+        )
+        if "created_at_ns" in result.payload:
+            doc.created_at_ns = result.payload["created_at_ns"]
+        if result.vector is not None:
+            doc.embedding = np.asarray(result.vector, dtype=np.float32)
+        return doc
+    
+    def _index_add(self, document: Document):
+        """Write a document's unit-length embedding into the in-memory matrix.
+        
+        Rows are normalized once here so search reduces cosine similarity
+        to a dot product. Zero vectors cannot be ranked and are not indexed.
+        The matrix grows by doubling so repeated adds stay amortized O(D).
+        """
+        norm = np.linalg.norm(document.embedding)
+        if norm == 0:
+            self._index_remove(document.id)
+            return
+        
+        vector = document.embedding / norm
+        row = self._row_of.get(document.id)
+        if row is None:
+            row = len(self._id_index)
+            if row == self._emb_matrix.shape[0]:
+                capacity = max(64, row * 2)
+                matrix = np.zeros((capacity, vector.shape[0]), dtype=np.int8)
+                matrix[:row] = self._emb_matrix[:row]
+                scales = np.zeros(capacity, dtype=np.float32)
+                scales[:row] = self._scales[:row]
+                self._emb_matrix, self._scales = matrix, scales
+            self._id_index.append(document.id)
+            self._row_of[document.id] = row
+        self._emb_matrix[row], self._scales[row] = _quantize(vector)
+        self._type_masks.clear()
+        if self._hnsw is not None:
+            self._hnsw_add(document.id, vector)
+    
+    def _index_remove(self, doc_id: str):
+        """Drop a document's row by moving the last row into its slot."""
+        row = self._row_of.pop(doc_id, None)
+        if row is None:
+            return
+        last = len(self._id_index) - 1
+        if row != last:
+            moved_id = self._id_index[last]
+            self._emb_matrix[row] = self._emb_matrix[last]
+            self._scales[row] = self._scales[last]
+            self._id_index[row] = moved_id
+            self._row_of[moved_id] = row
+        self._id_index.pop()
+        self._type_masks.clear()
+        label = self._hnsw_labels.pop(doc_id, None)
+        if label is not None:
+            self._hnsw.mark_deleted(label)
+            del self._hnsw_docs[label]
+    
+    def _build_hnsw(self):
+        """Build the HNSW index from the current embedding matrix."""
+        count = len(self._id_index)
+        index = hnswlib.Index(space="ip", dim=self._emb_matrix.shape[1])
+        index.init_index(max_elements=count * 2, M=16, ef_construction=200)
+        vectors = self._emb_matrix[:count] * self._scales[:count, np.newaxis]
+        index.add_items(vectors, np.arange(count))
+        self._hnsw = index
+        self._hnsw_labels = {doc_id: i for i, doc_id in enumerate(self._id_index)}
+        self._hnsw_docs = dict(enumerate(self._id_index))
+        self._hnsw_next_label = count
+        logger.info("hnsw_index_built", documents=count)
+    
+    def _hnsw_add(self, doc_id: str, vector: np.ndarray):
+        """Insert or replace a vector in the HNSW index."""
+        label = self._hnsw_labels.get(doc_id)
+        if label is None:
+            label = self._hnsw_next_label
+            self._hnsw_next_label += 1
+            self._hnsw_labels[doc_id] = label
+            self._hnsw_docs[label] = doc_id
+        if self._hnsw.get_current_count() >= self._hnsw.get_max_elements():
+            self._hnsw.resize_index(self._hnsw.get_max_elements() * 2)
+        self._hnsw.add_items(vector[np.newaxis], [label])
+    
+    def _hnsw_search(
+        self,
+        query_embedding: np.ndarray,
+        top_k: int,
+        doc_type: Optional[str],
+    ) -> Optional[List[Document]]:
+        """Approximate nearest-neighbour search over the memory store.
+        
+        Returns:
+            Matching documents, or None if the caller should fall back to
+            the exact scan
+        """
+        if self._hnsw is None:
+            self._build_hnsw()
+        
+        type_filter = None
+        if doc_type:
+            store, docs = self._memory_store, self._hnsw_docs
+            
+            def type_filter(label: int) -> bool:
+                doc_id = docs.get(label)
+                return doc_id is not None and store[doc_id].doc_type == doc_type
+        
+        k = min(top_k, len(self._hnsw_docs))
+        self._hnsw.set_ef(max(64, k))
+        try:
+            labels, _ = self._hnsw.knn_query(query_embedding, k=k, filter=type_filter)
+        except RuntimeError:
+            # Fewer than k documents passed the filter
+            return None
+        return [self._memory_store[self._hnsw_docs[label]] for label in labels[0]]
+    
+    def _type_mask(self, doc_type: str) -> np.ndarray:
+        """Boolean row mask for a document type, cached until the index changes."""
+        mask = self._type_masks.get(doc_type)
+        if mask is None:
+            mask = np.fromiter(
+                (self._memory_store[doc_id].doc_type == doc_type
+                 for doc_id in self._id_index),
+                dtype=bool,
+                count=len(self._id_index),
+            )
+            self._type_masks[doc_type] = mask
+        return mask
+    
+    def _memory_scores(self, query_embedding: np.ndarray, count: int) -> np.ndarray:
+        """Dot products of a unit query against the first count quantized rows.
+        
+        Rows are dequantized to float32 a chunk at a time so the product
+        still runs through BLAS without materializing the full float matrix.
+        """
+        scores = np.empty(count, dtype=np.float32)
+        for start in range(0, count, _SCORE_CHUNK_ROWS):
+            end = min(start + _SCORE_CHUNK_ROWS, count)
+            chunk = self._emb_matrix[start:end].astype(np.float32)
+            scores[start:end] = chunk @ query_embedding
+        scores *= self._scales[:count]
+        return scores
+    
+    def _memory_search(
+        self,
+        query_embedding: np.ndarray,
+        top_k: int,
+        doc_type: Optional[str],
+    ) -> List[Document]:
+        """Rank in-memory documents by cosine similarity with one matmul."""
+        count = len(self._id_index)
+        if count == 0 or top_k <= 0:
+            return []
+        
+        query_norm = np.linalg.norm(query_embedding)
+        if query_norm == 0:
+            return []
+        
+        query_embedding = query_embedding / query_norm
+        
+        if HNSWLIB_AVAILABLE and count >= self.HNSW_MIN_DOCUMENTS:
+            documents = self._hnsw_search(query_embedding, top_k, doc_type)
+            if documents is not None:
+                return documents
+        
+        scores = self._memory_scores(query_embedding, count)
+        
+        candidates = count
+        if doc_type:
+            valid = self._type_mask(doc_type)
+            candidates = int(valid.sum())
+            if candidates == 0:
+                return []
+            scores[~valid] = -np.inf
+        
+        k = min(top_k, candidates)
+        top = np.argpartition(scores, -k)[-k:]
+        top = top[np.argsort(scores[top])[::-1]]
+        return [self._memory_store[self._id_index[row]] for row in top]
     
     def delete_document(self, doc_id: str) -> bool:
         """Delete a document from the knowledge store.
@@ -254,6 +808,10 @@ class KnowledgeStore:
                     collection_name=self.collection_name,
                     points_selector=[doc_id],
                 )
+                if self._content_db:
+                    with self._content_db:
+                        self._content_db.execute("DELETE FROM content WHERE id = ?", (doc_id,))
+                self._forget_hash(doc_id)
                 logger.info("document_deleted_from_qdrant", doc_id=doc_id)
                 return True
             except Exception as e:
@@ -262,6 +820,8 @@ class KnowledgeStore:
         else:
             if doc_id in self._memory_store:
                 del self._memory_store[doc_id]
+                self._index_remove(doc_id)
+                self._forget_hash(doc_id)
                 logger.info("document_deleted_from_memory", doc_id=doc_id)
                 return True
             return False
@@ -277,7 +837,7 @@ class KnowledgeStore:
                 collection_info = self._client.get_collection(self.collection_name)
                 return {
                     "total_documents": collection_info.points_count,
-                    "embedding_dimension": self._embedding_dim,
+                    "embedding_dimension": self.embedding_service.embedding_dimension,
                     "collection_name": self.collection_name,
                     "storage_type": "qdrant",
                 }
@@ -296,7 +856,7 @@ class KnowledgeStore:
             
             return {
                 "total_documents": len(self._memory_store),
-                "embedding_dimension": self._embedding_dim,
+                "embedding_dimension": self.embedding_service.embedding_dimension,
                 "document_types": doc_types,
                 "storage_type": "memory",
             }
@@ -319,6 +879,7 @@ class RAGService:
         query: str,
         top_k: int = 5,
         doc_type: Optional[str] = None,
+        query_embedding: Optional[np.ndarray] = None,
     ) -> str:
         """Retrieve relevant context for a query.
         
@@ -326,21 +887,56 @@ class RAGService:
             query: User query
             top_k: Number of documents to retrieve
             doc_type: Filter by document type
+            query_embedding: Precomputed embedding of the query, if the
+                caller already has one
             
         Returns:
             Concatenated context string
         """
-        documents = self.knowledge_store.search(query, top_k, doc_type)
-        
-        if not documents:
-            return ""
+        if query_embedding is None:
+            query_embedding = self.knowledge_store.embedding_service.embed_query(query)
+        documents = self.knowledge_store.search_by_vector(query_embedding, top_k, doc_type)
+        return self._format_context(documents)
+    
+    async def retrieve_context_async(
+        self,
+        query: str,
+        top_k: int = 5,
+        doc_types: Optional[List[str]] = None,
+    ) -> str:
+        """Retrieve context without blocking, searching doc types concurrently.
         
-        # Format context
-        context_parts = []
+        Args:
+            query: User query
+            top_k: Number of documents to retrieve per document type
+            doc_types: Document types to search; None searches all documents
+            
+        Returns:
+            Concatenated context string, grouped in doc_types order
+        """
+        store = self.knowledge_store
+        query_embedding = await asyncio.to_thread(
+            store.embedding_service.embed_query, query
+        )
+        results = await asyncio.gather(*(
+            store.search_by_vector_async(query_embedding, top_k, doc_type)
+            for doc_type in (doc_types or [None])
+        ))
+        return self._format_context([doc for documents in results for doc in documents])
+    
+    @staticmethod
+    def _format_context(documents: List[Document]) -> str:
+        """Format retrieved documents as a numbered context block."""
+        # Write straight into one buffer rather than building a list of
+        # per-document strings and joining them
+        buf = io.StringIO()
         for i, doc in enumerate(documents, 1):
-            context_parts.append(f"Document {i} [{doc.doc_type}]:\n{doc.content}\n")
-        
-        return "\n".join(context_parts)
+            if i > 1:
+                buf.write("\n")
+            buf.write(f"Document {i} [{doc.doc_type}]:\n")
+            buf.write(doc.content)
+            buf.write("\n")
+        return buf.getvalue()
     
     def augment_prompt(
         self,
@@ -4,13 +4,27 @@ Supports: OpenAI, Anthropic, Google (Gemini), OpenRouter
 No LiteLLM wrapper - direct API calls.
 """
 
+import asyncio
+import atexit
+import contextlib
+import functools
+import itertools
 import os
 import json
+import tempfile
+import threading
+import time
+import weakref
 import structlog
-from typing import Optional, List, Dict, Any, Generator
-from dataclasses import dataclass
+from typing import (
+    Optional, List, Dict, Any, AsyncIterator, Callable, Generator, ParamSpec, Tuple, Type,
+    TypeVar, cast,
+)
+from dataclasses import asdict, dataclass
+from collections import OrderedDict
 from pathlib import Path
 import yaml
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Provider SDKs
 try:
@@ -31,19 +45,29 @@ try:
 except ImportError:
     GOOGLE_AVAILABLE = False
 
-import requests
+import httpx
+
+from noode.llm_providers.cache import LLMCache, SemanticCache
 
 logger = structlog.get_logger()
 
+# libyaml-backed loader when available; several times faster than pure Python
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
 
-@dataclass
+@dataclass(slots=True)
 class LLMMessage:
     """A message in the conversation."""
     role: str  # "system", "user", "assistant"
     content: str
+    
+    def to_dict(self) -> Dict[str, str]:
+        """Convert to the OpenAI-style message dict."""
+        return {"role": self.role, "content": self.content}
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMResponse:
     """Response from an LLM provider."""
     content: str
@@ -53,20 +77,86 @@ class LLMResponse:
     error: Optional[str] = None
 
 
+@dataclass(frozen=True, slots=True)
+class HttpSettings:
+    """Connection pool and timeout settings for a provider's HTTP client.
+    
+    Read from the ``http`` block of a provider in providers.yaml. The
+    defaults suit interactive use; batch workloads against high rate-limit
+    tiers may need a larger pool.
+    """
+    max_connections: int = 100
+    max_keepalive: int = 50
+    connect_timeout: float = 10.0
+    read_timeout: float = 120.0
+    
+    @classmethod
+    def from_config(cls, provider_config: Dict[str, Any]) -> "HttpSettings":
+        """Build settings from a provider config, ignoring unknown keys."""
+        http = provider_config.get("http") or {}
+        return cls(**{k: v for k, v in http.items() if k in cls.__dataclass_fields__})
+    
+    @property
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive,
+            keepalive_expiry=90,
+        )
+    
+    @property
+    def timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(self.read_timeout, connect=self.connect_timeout)
+
+
+# Configs with edits not yet written; flushed by one exit hook. Weak
+# references, so the hook does not keep configs alive until exit.
+_UNSAVED_CONFIGS: "weakref.WeakSet[ProviderConfig]" = weakref.WeakSet()
+
+
+@atexit.register
+def _save_unsaved_configs() -> None:
+    """Write configs still holding edits when the interpreter exits."""
+    for config in list(_UNSAVED_CONFIGS):
+        config.save_config()
+
+
 class ProviderConfig:
     """Manages LLM provider configurations and API keys."""
     
-    def __init__(self):
+    def __init__(self) -> None:
         self.config_dir = Path.home() / ".config" / "noode"
         self.config_file = self.config_dir / "providers.yaml"
+        self.cache_file = self.config_dir / "providers.cache.json"
         self._config = self._load_config()
+        # Lookups are memoized; the setters invalidate them
+        self._api_key_cache: Dict[str, List[str]] = {}
+        self._provider_cfg_cache: Dict[str, Dict[str, Any]] = {}
+        # Edits only mark the config dirty; save_config() writes it once for
+        # a batch of edits and skips the write when nothing changed
+        self._dirty = False
     
-    def _load_config(self) -> Dict:
-        """Load provider configuration from YAML."""
+    def _mark_dirty(self) -> None:
+        """Record an unsaved edit; it is written by save_config() or at exit."""
+        self._dirty = True
+        _UNSAVED_CONFIGS.add(self)
+    
+    def _load_config(self) -> Dict[str, Any]:
+        """Load provider configuration from YAML.
+        
+        The parsed result is snapshotted to JSON together with the YAML
+        file's mtime, so unchanged configs skip YAML parsing on later starts.
+        """
         if self.config_file.exists():
             try:
+                mtime = self.config_file.stat().st_mtime_ns
+                cached = self._read_config_cache(mtime)
+                if cached is not None:
+                    return cached
                 with open(self.config_file, 'r') as f:
-                    return yaml.safe_load(f) or {}
+                    config = yaml.load(f, Loader=_YAML_LOADER) or {}
+                self._write_config_cache(mtime, config)
+                return config
             except Exception as e:
                 logger.error("Failed to load provider config", error=str(e))
         
@@ -79,57 +169,120 @@ class ProviderConfig:
                     "model": "gpt-4",
                     "temperature": 0.7,
                     "max_tokens": 4000,
+                    "http": asdict(HttpSettings()),
                 },
                 "anthropic": {
                     "enabled": False,
                     "model": "claude-3-opus-20240229",
                     "temperature": 0.7,
                     "max_tokens": 4000,
+                    "http": asdict(HttpSettings()),
                 },
                 "google": {
                     "enabled": False,
                     "model": "gemini-pro",
                     "temperature": 0.7,
                     "max_tokens": 4000,
+                    "http": asdict(HttpSettings()),
                 },
                 "openrouter": {
                     "enabled": False,
                     "model": "openai/gpt-4",
                     "temperature": 0.7,
                     "max_tokens": 4000,
+                    "http": asdict(HttpSettings()),
                 },
             }
         }
     
-    def save_config(self):
-        """Save configuration to YAML."""
+    def _read_config_cache(self, mtime: int) -> Optional[Dict[str, Any]]:
+        """Return the JSON snapshot if it was taken from this YAML mtime."""
+        try:
+            with open(self.cache_file, 'r') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(cached, dict) or cached.get("mtime") != mtime:
+            return None
+        data = cached.get("data")
+        return data if isinstance(data, dict) else None
+    
+    def _write_config_cache(self, mtime: int, config: Dict[str, Any]) -> None:
+        """Snapshot parsed config next to the YAML file."""
+        try:
+            with open(self.cache_file, 'w') as f:
+                json.dump({"mtime": mtime, "data": config}, f)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning("Failed to write provider config cache", error=str(e))
+    
+    def save_config(self) -> None:
+        """Save configuration to YAML if it changed since the last save.
+        
+        The file is written to a temporary name and renamed into place, so
+        readers never see a half-written config.
+        """
+        if not self._dirty:
+            return
         self.config_dir.mkdir(parents=True, exist_ok=True)
+        tmp_name = None
         try:
-            with open(self.config_file, 'w') as f:
-                yaml.dump(self._config, f, default_flow_style=False)
+            with tempfile.NamedTemporaryFile(
+                'w', dir=self.config_dir, prefix=".providers.", suffix=".tmp", delete=False
+            ) as f:
+                tmp_name = f.name
+                yaml.dump(self._config, f, Dumper=_YAML_DUMPER, default_flow_style=False)
+            os.replace(tmp_name, self.config_file)
+            self._dirty = False
+            _UNSAVED_CONFIGS.discard(self)
+            self._write_config_cache(self.config_file.stat().st_mtime_ns, self._config)
         except Exception as e:
             logger.error("Failed to save provider config", error=str(e))
+            if tmp_name is not None:
+                with contextlib.suppress(OSError):
+                    os.unlink(tmp_name)
     
     def get_api_key(self, provider: str) -> Optional[str]:
-        """Get API key for a provider."""
+        """Get API key for a provider (the first one if several are set)."""
+        keys = self.get_api_keys(provider)
+        return keys[0] if keys else None
+    
+    def get_api_keys(self, provider: str) -> List[str]:
+        """Get all API keys configured for a provider.
+        
+        Several keys can be given comma-separated in the environment
+        variable or one per line in the key file.
+        """
+        if provider not in self._api_key_cache:
+            self._api_key_cache[provider] = self._read_api_keys(provider)
+        return self._api_key_cache[provider]
+    
+    def _read_api_keys(self, provider: str) -> List[str]:
+        """Look up API keys in the environment, then the key file."""
         # Check environment variable first
         env_var = f"NOODE_{provider.upper()}_API_KEY"
         if os.environ.get(env_var):
-            return os.environ[env_var]
+            return [key.strip() for key in os.environ[env_var].split(",") if key.strip()]
         
         # Check key file
         key_file = self.config_dir / f"{provider}.key"
         if key_file.exists():
             try:
                 with open(key_file, 'r') as f:
-                    return f.read().strip()
+                    return [
+                        line.strip() for line in f
+                        if line.strip() and not line.lstrip().startswith("#")
+                    ]
             except Exception as e:
                 logger.error(f"Failed to read {provider} API key", error=str(e))
         
-        return None
+        return []
     
-    def set_api_key(self, provider: str, api_key: str):
-        """Save API key for a provider (encrypted storage)."""
+    def set_api_key(self, provider: str, api_key: str) -> None:
+        """Save API key for a provider (encrypted storage).
+        
+        Pass several newline-separated keys to configure a key pool.
+        """
+        self._api_key_cache.pop(provider, None)
         self.config_dir.mkdir(parents=True, exist_ok=True)
         key_file = self.config_dir / f"{provider}.key"
         try:
@@ -143,364 +296,872 @@ class ProviderConfig:
     
     def get_provider_config(self, provider: str) -> Dict[str, Any]:
         """Get configuration for a specific provider."""
-        return self._config.get("providers", {}).get(provider, {})
+        config = self._provider_cfg_cache.get(provider)
+        if config is None:
+            config = self._config.get("providers", {}).get(provider, {})
+            self._provider_cfg_cache[provider] = config
+        return config
+    
+    def update_provider_config(self, provider: str, **values: Any) -> None:
+        """Update settings for a provider; call save_config() to persist."""
+        self._config.setdefault("providers", {}).setdefault(provider, {}).update(values)
+        self._provider_cfg_cache.pop(provider, None)
+        self._mark_dirty()
     
-    def set_active_provider(self, provider: str):
-        """Set the active provider."""
+    def set_active_provider(self, provider: str) -> None:
+        """Set the active provider and save the config if it changed."""
+        if self._config.get("active_provider") == provider:
+            return
         self._config["active_provider"] = provider
+        self._mark_dirty()
         self.save_config()
     
     def get_active_provider(self) -> str:
         """Get the currently active provider."""
-        return self._config.get("active_provider", "openai")
+        return str(self._config.get("active_provider", "openai"))
+
+
+# SDK clients are cached per API key and HTTP settings so every provider
+# instance shares one connection pool instead of opening its own.
+
+def _sdk_client_options(http: HttpSettings, asynchronous: bool = False) -> Dict[str, Any]:
+    """Constructor options for the OpenAI/Anthropic SDK clients.
+    
+    The SDKs retry 429/5xx responses themselves, honouring Retry-After;
+    the pool limits go on the httpx client they are given.
+    """
+    client_cls = httpx.AsyncClient if asynchronous else httpx.Client
+    return {
+        "max_retries": 5,
+        "timeout": http.timeout,
+        "http_client": client_cls(limits=http.limits, timeout=http.timeout),
+    }
+
+
+@functools.lru_cache(maxsize=32)
+def _openai_clients(api_key: str, http: HttpSettings) -> Tuple[Any, Any]:
+    return (
+        openai.OpenAI(api_key=api_key, **_sdk_client_options(http)),
+        openai.AsyncOpenAI(api_key=api_key, **_sdk_client_options(http, asynchronous=True)),
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _anthropic_clients(api_key: str, http: HttpSettings) -> Tuple[Any, Any]:
+    return (
+        anthropic.Anthropic(api_key=api_key, **_sdk_client_options(http)),
+        anthropic.AsyncAnthropic(api_key=api_key, **_sdk_client_options(http, asynchronous=True)),
+    )
+
+
+# Every OpenRouter client pair created, so shutdown can close them
+_OPENROUTER_CLIENTS: List[Tuple[httpx.Client, httpx.AsyncClient]] = []
+
+
+@functools.lru_cache(maxsize=32)
+def _openrouter_clients(
+    api_key: str, http: HttpSettings
+) -> Tuple[httpx.Client, httpx.AsyncClient]:
+    # HTTP/2: concurrent chats multiplex over a single keep-alive TLS
+    # connection instead of handshaking per request
+    client_options: Dict[str, Any] = {
+        "base_url": OpenRouterProvider.API_BASE,
+        "http2": True,
+        "limits": http.limits,
+        "timeout": http.timeout,
+        "headers": {
+            "Authorization": f"Bearer {api_key}",
+            "HTTP-Referer": "https://noode.ai",  # Required by OpenRouter
+            "X-Title": "Noode AI Platform",
+        },
+    }
+    client = httpx.Client(**client_options)
+    atexit.register(client.close)
+    clients = (client, httpx.AsyncClient(**client_options))
+    _OPENROUTER_CLIENTS.append(clients)
+    return clients
+
+
+async def _close_openrouter_clients() -> None:
+    """Close every OpenRouter client pair and forget the cached ones."""
+    _openrouter_clients.cache_clear()
+    while _OPENROUTER_CLIENTS:
+        client, async_client = _OPENROUTER_CLIENTS.pop()
+        client.close()
+        await async_client.aclose()
+
+
+def _create_json(resource: Any, request: Dict[str, Any]) -> Dict[str, Any]:
+    """Call an SDK ``create()`` and return the decoded JSON body.
+    
+    Going through ``with_raw_response`` skips building the SDK's pydantic
+    response model when only a few fields are needed.
+    """
+    raw = getattr(resource, "with_raw_response", None)
+    if raw is None:
+        return cast(Dict[str, Any], resource.create(**request).model_dump())
+    return cast(Dict[str, Any], json.loads(raw.create(**request).content))
+
+
+async def _acreate_json(resource: Any, request: Dict[str, Any]) -> Dict[str, Any]:
+    """Async variant of _create_json()."""
+    raw = getattr(resource, "with_raw_response", None)
+    if raw is None:
+        return cast(Dict[str, Any], (await resource.create(**request)).model_dump())
+    return cast(Dict[str, Any], json.loads((await raw.create(**request)).content))
+
+
+def _retry_delay(error: httpx.HTTPStatusError, default: float, limit: float) -> float:
+    """Seconds to wait before retrying, preferring the Retry-After header.
+    
+    The header is capped at ``limit`` so a server asking for a long pause
+    cannot block the caller for that long.
+    """
+    try:
+        return min(max(0.0, float(error.response.headers["Retry-After"])), limit)
+    except (KeyError, ValueError):
+        return default
+
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+def _retry(
+    max_attempts: int = 5,
+    backoff: Tuple[float, ...] = (0.5, 1, 2, 4, 8),
+    on: Tuple[int, ...] = (429, 502, 503, 504),
+    max_delay: float = 30.0,
+) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Retry an HTTP call that raises httpx.HTTPStatusError.
+    
+    Works for both sync and async functions. Only the listed status
+    codes are retried; the last error is re-raised when attempts run out.
+    
+    Args:
+        max_attempts: Total number of attempts
+        backoff: Delay before each retry, used when there is no Retry-After
+        on: Status codes worth retrying
+        max_delay: Longest wait honoured from a Retry-After header
+    """
+    def next_delay(error: httpx.HTTPStatusError, attempt: int) -> float:
+        """Delay before the next attempt; re-raises if none is left."""
+        if error.response.status_code not in on or attempt >= max_attempts - 1:
+            raise error
+        delay = _retry_delay(error, backoff[min(attempt, len(backoff) - 1)], max_delay)
+        logger.warning("Retrying LLM request", status=error.response.status_code, delay=delay)
+        return delay
+    
+    def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args: P.args, **kwargs: P.kwargs) -> Any:
+                attempt = 0
+                while True:
+                    try:
+                        return await func(*args, **kwargs)
+                    except httpx.HTTPStatusError as e:
+                        await asyncio.sleep(next_delay(e, attempt))
+                    attempt += 1
+            return cast(Callable[P, R], async_wrapper)
+        
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            attempt = 0
+            while True:
+                try:
+                    return func(*args, **kwargs)
+                except httpx.HTTPStatusError as e:
+                    time.sleep(next_delay(e, attempt))
+                attempt += 1
+        return wrapper
+    
+    return decorator
 
 
 class LLMProvider:
     """Base class for LLM providers."""
     
+    # Key in ProviderConfig and LLMManager's provider registry
+    name = ""
+    
+    # Whether the provider's SDK is importable; lets LLMManager probe
+    # availability without constructing the provider
+    sdk_available = True
+    
     def __init__(self, config: ProviderConfig):
         self.config = config
+        # Key pool: sync calls rotate round-robin, async calls go to the
+        # key with the fewest requests in flight
+        self._keys = config.get_api_keys(self.name) if self.name else []
+        self.api_key = self._keys[0] if self._keys else None
+        self._key_cycle = itertools.cycle(self._keys)
+        self._key_lock = threading.Lock()
+        self._in_flight = dict.fromkeys(self._keys, 0)
+        self._http = HttpSettings.from_config(config.get_provider_config(self.name))
     
-    def chat(self, messages: List[LLMMessage], **kwargs) -> LLMResponse:
+    def _next_key(self) -> str:
+        """Pick the next API key round-robin."""
+        with self._key_lock:
+            return next(self._key_cycle)
+    
+    @contextlib.asynccontextmanager
+    async def _least_loaded_key(self) -> AsyncIterator[str]:
+        """Lease the API key with the fewest async requests in flight."""
+        key = min(self._keys, key=self._in_flight.__getitem__)
+        self._in_flight[key] += 1
+        try:
+            yield key
+        finally:
+            self._in_flight[key] -= 1
+    
+    def chat(self, messages: List[LLMMessage], **kwargs: Any) -> LLMResponse:
         """Send chat completion request."""
         raise NotImplementedError
     
+    async def achat(self, messages: List[LLMMessage], **kwargs: Any) -> LLMResponse:
+        """Send chat completion request without blocking the event loop.
+        
+        Providers with an async SDK override this; the default runs
+        chat() in a worker thread.
+        """
+        return await asyncio.to_thread(self.chat, messages, **kwargs)
+    
+    def chat_stream(
+        self, messages: List[LLMMessage], **kwargs: Any
+    ) -> Generator[str, None, LLMResponse]:
+        """Stream a chat completion as text chunks.
+        
+        The generator's return value is the final LLMResponse with the
+        full text. The default yields the whole chat() reply as one chunk;
+        providers with a streaming API override this.
+        """
+        response = self.chat(messages, **kwargs)
+        if response.content:
+            yield response.content
+        return response
+    
     def is_available(self) -> bool:
         """Check if provider is available (API key set)."""
         raise NotImplementedError
+    
+    def prewarm(self) -> None:
+        """Open a keep-alive connection so the first chat skips the TLS handshake.
+        
+        Failures are only logged; the connection is reopened on first use.
+        """
+        try:
+            self._prewarm()
+        except Exception as e:
+            logger.debug("Provider prewarm failed", provider=self.name, error=str(e))
+    
+    def _prewarm(self) -> None:
+        """Send a cheap request to the provider's API host (no-op by default)."""
 
 
 class OpenAIProvider(LLMProvider):
     """OpenAI API integration."""
     
+    name = "openai"
+    sdk_available = OPENAI_AVAILABLE
+    
     def __init__(self, config: ProviderConfig):
         super().__init__(config)
-        self.api_key = config.get_api_key("openai")
+        self.client = None
         if self.api_key and OPENAI_AVAILABLE:
-            openai.api_key = self.api_key
+            self.client = _openai_clients(self.api_key, self._http)[0]
     
     def is_available(self) -> bool:
         return OPENAI_AVAILABLE and self.api_key is not None
     
-    def chat(self, messages: List[LLMMessage], **kwargs) -> LLMResponse:
+    def _prewarm(self) -> None:
+        if self.client is not None:
+            self.client.models.list()
+    
+    def chat(self, messages: List[LLMMessage], **kwargs: Any) -> LLMResponse:
         if not self.is_available():
-            return LLMResponse(
-                content="",
-                model="",
-                provider="openai",
-                error="OpenAI not available. Check API key."
-            )
+            return self._unavailable()
         
         try:
-            provider_config = self.config.get_provider_config("openai")
-            model = kwargs.get("model", provider_config.get("model", "gpt-4"))
-            temperature = kwargs.get("temperature", provider_config.get("temperature", 0.7))
-            max_tokens = kwargs.get("max_tokens", provider_config.get("max_tokens", 4000))
-            
-            # Convert messages to OpenAI format
-            openai_messages = [
-                {"role": msg.role, "content": msg.content}
-                for msg in messages
-            ]
-            
-            response = openai.chat.completions.create(
-                model=model,
-                messages=openai_messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
+            client = _openai_clients(self._next_key(), self._http)[0]
+            return self._parse(
+                _create_json(client.chat.completions, self._request(messages, kwargs))
             )
-            
-            return LLMResponse(
-                content=response.choices[0].message.content,
-                model=response.model,
-                provider="openai",
-                usage={
-                    "prompt_tokens": response.usage.prompt_tokens,
-                    "completion_tokens": response.usage.completion_tokens,
-                    "total_tokens": response.usage.total_tokens,
-                }
-            )
-            
-        except openai.AuthenticationError:
+        except Exception as e:
+            return self._error(e)
+    
+    async def achat(self, messages: List[LLMMessage], **kwargs: Any) -> LLMResponse:
+        if not self.is_available():
+            return self._unavailable()
+        
+        try:
+            async with self._least_loaded_key() as key:
+                data = await _acreate_json(
+                    _openai_clients(key, self._http)[1].chat.completions,
+                    self._request(messages, kwargs),
+                )
+            return self._parse(data)
+        except Exception as e:
+            return self._error(e)
+    
+    def chat_stream(
+        self, messages: List[LLMMessage], **kwargs: Any
+    ) -> Generator[str, None, LLMResponse]:
+        if not self.is_available():
+            return self._unavailable()
+        
+        request = self._request(messages, kwargs)
+        model = request["model"]
+        parts: List[str] = []
+        try:
+            client = _openai_clients(self._next_key(), self._http)[0]
+            for chunk in client.chat.completions.create(stream=True, **request):
+                model = chunk.model or model
+                if chunk.choices and chunk.choices[0].delta.content:
+                    parts.append(chunk.choices[0].delta.content)
+                    yield parts[-1]
+        except Exception as e:
+            return self._error(e)
+        return LLMResponse(content="".join(parts), model=model, provider="openai")
+    
+    def _request(self, messages: List[LLMMessage], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Build chat.completions.create arguments."""
+        provider_config = self.config.get_provider_config("openai")
+        request = {
+            "model": kwargs.get("model", provider_config.get("model", "gpt-4")),
+            "messages": [msg.to_dict() for msg in messages],
+            "temperature": kwargs.get("temperature", provider_config.get("temperature", 0.7)),
+            "max_tokens": kwargs.get("max_tokens", provider_config.get("max_tokens", 4000)),
+        }
+        if kwargs.get("response_format"):
+            request["response_format"] = kwargs["response_format"]
+        return request
+    
+    @staticmethod
+    def _parse(data: Dict[str, Any]) -> LLMResponse:
+        usage = data["usage"]
+        return LLMResponse(
+            content=data["choices"][0]["message"]["content"],
+            model=data["model"],
+            provider="openai",
+            usage={
+                "prompt_tokens": usage["prompt_tokens"],
+                "completion_tokens": usage["completion_tokens"],
+                "total_tokens": usage["total_tokens"],
+            }
+        )
+    
+    @staticmethod
+    def _unavailable() -> LLMResponse:
+        return LLMResponse(
+            content="",
+            model="",
+            provider="openai",
+            error="OpenAI not available. Check API key."
+        )
+    
+    @staticmethod
+    def _error(e: Exception) -> LLMResponse:
+        if isinstance(e, openai.AuthenticationError):
             logger.error("OpenAI authentication failed")
-            return LLMResponse(
-                content="",
-                model="",
-                provider="openai",
-                error="Invalid API key"
-            )
-        except openai.RateLimitError:
+            error = "Invalid API key"
+        elif isinstance(e, openai.RateLimitError):
             logger.error("OpenAI rate limit exceeded")
-            return LLMResponse(
-                content="",
-                model="",
-                provider="openai",
-                error="Rate limit exceeded. Please try again later."
-            )
-        except Exception as e:
+            error = "Rate limit exceeded. Please try again later."
+        else:
             logger.error("OpenAI API error", error=str(e))
-            return LLMResponse(
-                content="",
-                model="",
-                provider="openai",
-                error=f"API error: {str(e)}"
-            )
+            error = f"API error: {str(e)}"
+        return LLMResponse(content="", model="", provider="openai", error=error)
 
 
 class AnthropicProvider(LLMProvider):
     """Anthropic Claude API integration."""
     
+    name = "anthropic"
+    sdk_available = ANTHROPIC_AVAILABLE
+    
     def __init__(self, config: ProviderConfig):
         super().__init__(config)
-        self.api_key = config.get_api_key("anthropic")
         self.client = None
         if self.api_key and ANTHROPIC_AVAILABLE:
-            self.client = anthropic.Anthropic(api_key=self.api_key)
+            self.client = _anthropic_clients(self.api_key, self._http)[0]
     
     def is_available(self) -> bool:
         return ANTHROPIC_AVAILABLE and self.api_key is not None and self.client is not None
     
-    def chat(self, messages: List[LLMMessage], **kwargs) -> LLMResponse:
+    def _prewarm(self) -> None:
+        if self.client is not None:
+            self.client.get("/v1/models", cast_to=httpx.Response)
+    
+    def chat(self, messages: List[LLMMessage], **kwargs: Any) -> LLMResponse:
         if not self.is_available():
-            return LLMResponse(
-                content="",
-                model="",
-                provider="anthropic",
-                error="Anthropic not available. Check API key."
-            )
+            return self._unavailable()
         
         try:
-            provider_config = self.config.get_provider_config("anthropic")
-            model = kwargs.get("model", provider_config.get("model", "claude-3-opus-20240229"))
-            max_tokens = kwargs.get("max_tokens", provider_config.get("max_tokens", 4000))
-            
-            # Convert messages to Anthropic format
-            system_msg = ""
-            user_messages = []
-            
-            for msg in messages:
-                if msg.role == "system":
-                    system_msg = msg.content
-                else:
-                    user_messages.append({
-                        "role": msg.role,
-                        "content": msg.content
-                    })
-            
-            response = self.client.messages.create(
-                model=model,
-                max_tokens=max_tokens,
-                system=system_msg if system_msg else None,
-                messages=user_messages,
-            )
-            
-            return LLMResponse(
-                content=response.content[0].text,
-                model=response.model,
-                provider="anthropic",
-                usage={
-                    "input_tokens": response.usage.input_tokens,
-                    "output_tokens": response.usage.output_tokens,
-                }
-            )
-            
-        except anthropic.AuthenticationError:
-            logger.error("Anthropic authentication failed")
-            return LLMResponse(
-                content="",
-                model="",
-                provider="anthropic",
-                error="Invalid API key"
-            )
+            client = _anthropic_clients(self._next_key(), self._http)[0]
+            return self._parse(_create_json(client.messages, self._request(messages, kwargs)))
         except Exception as e:
+            return self._error(e)
+    
+    async def achat(self, messages: List[LLMMessage], **kwargs: Any) -> LLMResponse:
+        if not self.is_available():
+            return self._unavailable()
+        
+        try:
+            async with self._least_loaded_key() as key:
+                data = await _acreate_json(
+                    _anthropic_clients(key, self._http)[1].messages,
+                    self._request(messages, kwargs),
+                )
+            return self._parse(data)
+        except Exception as e:
+            return self._error(e)
+    
+    def chat_stream(
+        self, messages: List[LLMMessage], **kwargs: Any
+    ) -> Generator[str, None, LLMResponse]:
+        if not self.is_available():
+            return self._unavailable()
+        
+        try:
+            client = _anthropic_clients(self._next_key(), self._http)[0]
+            with client.messages.stream(**self._request(messages, kwargs)) as stream:
+                yield from stream.text_stream
+                return self._parse(stream.get_final_message().model_dump())
+        except Exception as e:
+            return self._error(e)
+    
+    def _request(self, messages: List[LLMMessage], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Build messages.create arguments."""
+        provider_config = self.config.get_provider_config("anthropic")
+        model = kwargs.get("model", provider_config.get("model", "claude-3-opus-20240229"))
+        max_tokens = kwargs.get("max_tokens", provider_config.get("max_tokens", 4000))
+        
+        # Convert messages to Anthropic format
+        system_msg = ""
+        user_messages = []
+        
+        for msg in messages:
+            if msg.role == "system":
+                system_msg = msg.content
+            else:
+                user_messages.append(msg.to_dict())
+        
+        return {
+            "model": model,
+            "max_tokens": max_tokens,
+            "system": system_msg if system_msg else None,
+            "messages": user_messages,
+        }
+    
+    @staticmethod
+    def _parse(data: Dict[str, Any]) -> LLMResponse:
+        usage = data["usage"]
+        return LLMResponse(
+            content=data["content"][0]["text"],
+            model=data["model"],
+            provider="anthropic",
+            usage={
+                "input_tokens": usage["input_tokens"],
+                "output_tokens": usage["output_tokens"],
+            }
+        )
+    
+    @staticmethod
+    def _unavailable() -> LLMResponse:
+        return LLMResponse(
+            content="",
+            model="",
+            provider="anthropic",
+            error="Anthropic not available. Check API key."
+        )
+    
+    @staticmethod
+    def _error(e: Exception) -> LLMResponse:
+        if isinstance(e, anthropic.AuthenticationError):
+            logger.error("Anthropic authentication failed")
+            error = "Invalid API key"
+        else:
             logger.error("Anthropic API error", error=str(e))
-            return LLMResponse(
-                content="",
-                model="",
-                provider="anthropic",
-                error=f"API error: {str(e)}"
-            )
+            error = f"API error: {str(e)}"
+        return LLMResponse(content="", model="", provider="anthropic", error=error)
 
 
 class GoogleProvider(LLMProvider):
     """Google Gemini API integration."""
     
+    name = "google"
+    sdk_available = GOOGLE_AVAILABLE
+    
+    # Chat sessions kept for callers that pass a session_id
+    MAX_SESSIONS = 64
+    
     def __init__(self, config: ProviderConfig):
         super().__init__(config)
-        self.api_key = config.get_api_key("google")
+        # GenerativeModel per model name, reused across calls
+        self._models: Dict[str, Any] = {}
+        # ChatSession per (session_id, model name), least recently used first
+        self._sessions: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        self._sessions_lock = threading.Lock()
+        # genai.configure() is process-global, so only the first key is used
         if self.api_key and GOOGLE_AVAILABLE:
             genai.configure(api_key=self.api_key)
     
     def is_available(self) -> bool:
         return GOOGLE_AVAILABLE and self.api_key is not None
     
-    def chat(self, messages: List[LLMMessage], **kwargs) -> LLMResponse:
+    def chat(self, messages: List[LLMMessage], **kwargs: Any) -> LLMResponse:
         if not self.is_available():
+            return self._unavailable()
+        
+        try:
+            model_name, chat, last_message = self._start_chat(messages, kwargs)
+            if last_message is None:
+                return self._no_user_message()
+            response = chat.send_message(last_message.content)
             return LLMResponse(
-                content="",
-                model="",
+                content=response.text,
+                model=model_name,
                 provider="google",
-                error="Google Gemini not available. Check API key."
             )
+        except Exception as e:
+            return self._error(e)
+    
+    async def achat(self, messages: List[LLMMessage], **kwargs: Any) -> LLMResponse:
+        if not self.is_available():
+            return self._unavailable()
         
         try:
-            provider_config = self.config.get_provider_config("google")
-            model_name = kwargs.get("model", provider_config.get("model", "gemini-pro"))
-            
-            model = genai.GenerativeModel(model_name)
-            
-            # Build conversation history
-            chat = model.start_chat(history=[])
-            
-            # Send last user message
-            last_message = messages[-1] if messages else None
-            if last_message and last_message.role == "user":
-                response = chat.send_message(last_message.content)
-                
-                return LLMResponse(
-                    content=response.text,
-                    model=model_name,
-                    provider="google",
-                )
-            else:
-                return LLMResponse(
-                    content="",
-                    model="",
-                    provider="google",
-                    error="No user message found"
-                )
-                
-        except Exception as e:
-            logger.error("Google API error", error=str(e))
+            model_name, chat, last_message = self._start_chat(messages, kwargs)
+            if last_message is None:
+                return self._no_user_message()
+            response = await chat.send_message_async(last_message.content)
             return LLMResponse(
-                content="",
-                model="",
+                content=response.text,
+                model=model_name,
                 provider="google",
-                error=f"API error: {str(e)}"
             )
+        except Exception as e:
+            return self._error(e)
+    
+    def chat_stream(
+        self, messages: List[LLMMessage], **kwargs: Any
+    ) -> Generator[str, None, LLMResponse]:
+        if not self.is_available():
+            return self._unavailable()
+        
+        parts: List[str] = []
+        try:
+            model_name, chat, last_message = self._start_chat(messages, kwargs)
+            if last_message is None:
+                return self._no_user_message()
+            for chunk in chat.send_message(last_message.content, stream=True):
+                if chunk.text:
+                    parts.append(chunk.text)
+                    yield chunk.text
+        except Exception as e:
+            return self._error(e)
+        return LLMResponse(content="".join(parts), model=model_name, provider="google")
+    
+    def _start_chat(
+        self, messages: List[LLMMessage], kwargs: Dict[str, Any]
+    ) -> Tuple[str, Any, Optional[LLMMessage]]:
+        """Open a chat session and pick the user message to send.
+        
+        Passing ``session_id`` in kwargs continues the session from earlier
+        calls with the same id instead of starting a fresh one.
+        
+        Returns:
+            Tuple of (model name, chat session, last user message or None)
+        """
+        provider_config = self.config.get_provider_config("google")
+        model_name = kwargs.get("model", provider_config.get("model", "gemini-pro"))
+        
+        model = self._models.get(model_name)
+        if model is None:
+            model = self._models.setdefault(model_name, genai.GenerativeModel(model_name))
+        
+        session_id = kwargs.get("session_id")
+        if session_id is None:
+            chat = model.start_chat(history=[])
+        else:
+            chat = self._session(model, model_name, session_id)
+        
+        # Send last user message
+        last_message = messages[-1] if messages else None
+        if last_message and last_message.role != "user":
+            last_message = None
+        return model_name, chat, last_message
+    
+    @staticmethod
+    def _unavailable() -> LLMResponse:
+        return LLMResponse(
+            content="",
+            model="",
+            provider="google",
+            error="Google Gemini not available. Check API key."
+        )
+    
+    def _session(self, model: Any, model_name: str, session_id: str) -> Any:
+        """Return the cached ChatSession for an id, starting one if needed."""
+        key = (session_id, model_name)
+        with self._sessions_lock:
+            chat = self._sessions.get(key)
+            if chat is not None:
+                self._sessions.move_to_end(key)
+                return chat
+            chat = self._sessions[key] = model.start_chat(history=[])
+            if len(self._sessions) > self.MAX_SESSIONS:
+                self._sessions.popitem(last=False)
+            return chat
+    
+    @staticmethod
+    def _no_user_message() -> LLMResponse:
+        return LLMResponse(
+            content="",
+            model="",
+            provider="google",
+            error="No user message found"
+        )
+    
+    @staticmethod
+    def _error(e: Exception) -> LLMResponse:
+        logger.error("Google API error", error=str(e))
+        return LLMResponse(
+            content="",
+            model="",
+            provider="google",
+            error=f"API error: {str(e)}"
+        )
 
 
 class OpenRouterProvider(LLMProvider):
     """OpenRouter API integration (multi-provider)."""
     
+    name = "openrouter"
     API_BASE = "https://openrouter.ai/api/v1"
     
+    # User-facing messages for HTTP errors; other codes report the status
+    _ERROR_MAP = {401: "Invalid API key", 429: "Rate limit exceeded"}
+    
     def __init__(self, config: ProviderConfig):
         super().__init__(config)
-        self.api_key = config.get_api_key("openrouter")
     
     def is_available(self) -> bool:
         return self.api_key is not None
     
-    def chat(self, messages: List[LLMMessage], **kwargs) -> LLMResponse:
+    def _prewarm(self) -> None:
+        # HEAD avoids downloading the (large) model list
+        _openrouter_clients(self.api_key, self._http)[0].head("/models")
+    
+    def chat(self, messages: List[LLMMessage], **kwargs: Any) -> LLMResponse:
         if not self.is_available():
-            return LLMResponse(
-                content="",
-                model="",
-                provider="openrouter",
-                error="OpenRouter not available. Check API key."
-            )
+            return self._unavailable()
         
         try:
-            provider_config = self.config.get_provider_config("openrouter")
-            model = kwargs.get("model", provider_config.get("model", "openai/gpt-4"))
-            temperature = kwargs.get("temperature", provider_config.get("temperature", 0.7))
-            max_tokens = kwargs.get("max_tokens", provider_config.get("max_tokens", 4000))
-            
-            # Convert messages
-            openrouter_messages = [
-                {"role": msg.role, "content": msg.content}
-                for msg in messages
-            ]
-            
-            response = requests.post(
-                f"{self.API_BASE}/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json",
-                    "HTTP-Referer": "https://noode.ai",  # Required by OpenRouter
-                    "X-Title": "Noode AI Platform",
-                },
-                json={
-                    "model": model,
-                    "messages": openrouter_messages,
-                    "temperature": temperature,
-                    "max_tokens": max_tokens,
-                },
-                timeout=120,
-            )
-            
-            response.raise_for_status()
-            data = response.json()
-            
-            return LLMResponse(
-                content=data["choices"][0]["message"]["content"],
-                model=data["model"],
-                provider="openrouter",
-                usage=data.get("usage"),
-            )
-            
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 401:
-                logger.error("OpenRouter authentication failed")
-                return LLMResponse(
-                    content="",
-                    model="",
-                    provider="openrouter",
-                    error="Invalid API key"
-                )
-            elif e.response.status_code == 429:
-                logger.error("OpenRouter rate limit exceeded")
-                return LLMResponse(
-                    content="",
-                    model="",
-                    provider="openrouter",
-                    error="Rate limit exceeded"
-                )
-            else:
-                logger.error("OpenRouter API error", status=e.response.status_code)
-                return LLMResponse(
-                    content="",
-                    model="",
-                    provider="openrouter",
-                    error=f"API error: {e.response.status_code}"
-                )
+            return self._parse(self._post(self._payload(messages, kwargs)))
         except Exception as e:
-            logger.error("OpenRouter error", error=str(e))
-            return LLMResponse(
-                content="",
-                model="",
-                provider="openrouter",
-                error=f"Error: {str(e)}"
+            return self._error(e)
+    
+    async def achat(self, messages: List[LLMMessage], **kwargs: Any) -> LLMResponse:
+        if not self.is_available():
+            return self._unavailable()
+        
+        try:
+            return self._parse(await self._apost(self._payload(messages, kwargs)))
+        except Exception as e:
+            return self._error(e)
+    
+    def chat_stream(
+        self, messages: List[LLMMessage], **kwargs: Any
+    ) -> Generator[str, None, LLMResponse]:
+        if not self.is_available():
+            return self._unavailable()
+        
+        payload = self._payload(messages, kwargs)
+        payload["stream"] = True
+        model = payload["model"]
+        parts: List[str] = []
+        try:
+            client = _openrouter_clients(self._next_key(), self._http)[0]
+            with client.stream("POST", "/chat/completions", json=payload) as response:
+                response.raise_for_status()
+                # Server-sent events: "data: {json}" lines, ending with [DONE]
+                for line in response.iter_lines():
+                    if not line.startswith("data: "):
+                        continue
+                    data = line[len("data: "):]
+                    if data == "[DONE]":
+                        break
+                    chunk = json.loads(data)
+                    model = chunk.get("model", model)
+                    choices = chunk.get("choices") or [{}]
+                    text = choices[0].get("delta", {}).get("content")
+                    if text:
+                        parts.append(text)
+                        yield text
+        except Exception as e:
+            return self._error(e)
+        return LLMResponse(content="".join(parts), model=model, provider="openrouter")
+    
+    @_retry()
+    def _post(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST a completion request; each retry rotates to the next key."""
+        response = _openrouter_clients(self._next_key(), self._http)[0].post(
+            "/chat/completions", json=payload
+        )
+        response.raise_for_status()
+        return cast(Dict[str, Any], response.json())
+    
+    @_retry()
+    async def _apost(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Async variant of _post() using the least loaded key."""
+        async with self._least_loaded_key() as key:
+            response = await _openrouter_clients(key, self._http)[1].post(
+                "/chat/completions", json=payload
             )
+        response.raise_for_status()
+        return cast(Dict[str, Any], response.json())
+    
+    def _payload(self, messages: List[LLMMessage], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the chat completion request body."""
+        provider_config = self.config.get_provider_config("openrouter")
+        payload = {
+            "model": kwargs.get("model", provider_config.get("model", "openai/gpt-4")),
+            "messages": [msg.to_dict() for msg in messages],
+            "temperature": kwargs.get("temperature", provider_config.get("temperature", 0.7)),
+            "max_tokens": kwargs.get("max_tokens", provider_config.get("max_tokens", 4000)),
+        }
+        if kwargs.get("response_format"):
+            payload["response_format"] = kwargs["response_format"]
+        return payload
+    
+    @staticmethod
+    def _parse(data: Dict[str, Any]) -> LLMResponse:
+        return LLMResponse(
+            content=data["choices"][0]["message"]["content"],
+            model=data["model"],
+            provider="openrouter",
+            usage=data.get("usage"),
+        )
+    
+    @staticmethod
+    def _unavailable() -> LLMResponse:
+        return LLMResponse(
+            content="",
+            model="",
+            provider="openrouter",
+            error="OpenRouter not available. Check API key."
+        )
+    
+    @classmethod
+    def _error(cls, e: Exception) -> LLMResponse:
+        if isinstance(e, httpx.HTTPStatusError):
+            status = e.response.status_code
+            logger.error("OpenRouter API error", status=status)
+            error = cls._ERROR_MAP.get(status) or f"API error: {status}"
+        else:
+            logger.error("OpenRouter error", error=str(e))
+            error = f"Error: {str(e)}"
+        return LLMResponse(content="", model="", provider="openrouter", error=error)
 
 
 class LLMManager:
     """Manages all LLM providers and handles provider selection."""
     
-    def __init__(self):
+    def __init__(self) -> None:
         self.config = ProviderConfig()
-        self.providers = {
-            "openai": OpenAIProvider(self.config),
-            "anthropic": AnthropicProvider(self.config),
-            "google": GoogleProvider(self.config),
-            "openrouter": OpenRouterProvider(self.config),
+        self.cache = LLMCache()
+        self.semantic_cache: Optional[SemanticCache[Dict[str, Any]]] = None
+        # Providers are constructed on first use, so SDK setup only
+        # happens for the providers that are actually called
+        self._provider_classes: Dict[str, Type[LLMProvider]] = {
+            "openai": OpenAIProvider,
+            "anthropic": AnthropicProvider,
+            "google": GoogleProvider,
+            "openrouter": OpenRouterProvider,
         }
+        self._providers: Dict[str, LLMProvider] = {}
+    
+    def register_provider(self, provider_cls: Type[LLMProvider]) -> None:
+        """Register (or replace) a provider class under its ``name``."""
+        self._provider_classes[provider_cls.name] = provider_cls
+        self._providers.pop(provider_cls.name, None)
+    
+    def _get(self, name: str) -> LLMProvider:
+        """Return the provider instance for a registered name, creating it once."""
+        provider = self._providers.get(name)
+        if provider is None:
+            provider = self._providers.setdefault(
+                name, self._provider_classes[name](self.config)
+            )
+        return provider
+    
+    def get_provider(self, name: str) -> Optional[LLMProvider]:
+        """Get a provider instance by name.
+        
+        Args:
+            name: Provider name
+            
+        Returns:
+            Provider instance, or None for unknown names
+        """
+        if name not in self._provider_classes:
+            return None
+        return self._get(name)
+    
+    def reload_provider(self, name: str) -> None:
+        """Drop a cached provider so the next use picks up new settings."""
+        self._providers.pop(name, None)
+    
+    async def aclose(self) -> None:
+        """Close pooled HTTP connections; call once on application shutdown."""
+        await _close_openrouter_clients()
+    
+    def is_available(self, name: str) -> bool:
+        """Check whether a provider can be used, without constructing it.
+        
+        Args:
+            name: Provider name
+            
+        Returns:
+            True if the provider's SDK is installed and an API key is set
+        """
+        provider = self._providers.get(name)
+        if provider is not None:
+            return provider.is_available()
+        provider_cls = self._provider_classes.get(name)
+        if provider_cls is None:
+            return False
+        return provider_cls.sdk_available and self.config.get_api_key(name) is not None
     
     def get_available_providers(self) -> List[str]:
         """Get list of available providers (with API keys)."""
-        return [
-            name for name, provider in self.providers.items()
-            if provider.is_available()
-        ]
+        return [name for name in self._provider_classes if self.is_available(name)]
     
-    def chat(self, messages: List[LLMMessage], provider: Optional[str] = None, **kwargs) -> LLMResponse:
-        """Send chat request to specified or active provider."""
+    async def aget_available_providers(self) -> List[str]:
+        """Get list of available providers, probing them concurrently.
         
+        Key lookups may hit the filesystem, so each probe runs in a
+        worker thread instead of blocking the event loop.
+        """
+        names = list(self._provider_classes)
+        flags = await asyncio.gather(
+            *(asyncio.to_thread(self.is_available, name) for name in names)
+        )
+        return [name for name, available in zip(names, flags) if available]
+    
+    def _resolve(self, provider: Optional[str]) -> LLMProvider | LLMResponse:
+        """Pick the provider instance for a request.
+        
+        Returns:
+            The provider instance, or an error response when no usable
+            provider exists
+        """
         if provider is None:
             provider = self.config.get_active_provider()
         
-        if provider not in self.providers:
+        if provider not in self._provider_classes:
             return LLMResponse(
                 content="",
                 model="",
@@ -508,16 +1169,15 @@ class LLMManager:
                 error=f"Unknown provider: {provider}"
             )
         
-        provider_instance = self.providers[provider]
-        
-        if not provider_instance.is_available():
+        if self.is_available(provider):
+            provider_instance = self._get(provider)
+        else:
             # Try fallback providers
             available = self.get_available_providers()
             if available:
                 fallback = available[0]
                 logger.warning(f"Provider {provider} not available, using fallback: {fallback}")
-                provider_instance = self.providers[fallback]
-                provider = fallback
+                provider_instance = self._get(fallback)
             else:
                 return LLMResponse(
                     content="",
@@ -526,16 +1186,255 @@ class LLMManager:
                     error="No LLM provider available. Please configure an API key in Settings."
                 )
         
-        return provider_instance.chat(messages, **kwargs)
+        return provider_instance
+    
+    def enable_semantic_cache(
+        self,
+        threshold: float = 0.97,
+        embed: Optional[Callable[[str], Any]] = None,
+    ) -> None:
+        """Reuse answers for near-identical questions at any temperature.
+        
+        Args:
+            threshold: Minimum cosine similarity between final user messages
+            embed: Text embedding function; defaults to the knowledge
+                module's sentence-transformers model
+        """
+        if embed is None:
+            from noode.knowledge.embeddings import embed_text
+            embed = embed_text
+        self.semantic_cache = SemanticCache(embed, threshold=threshold)
+    
+    def _cache_key(
+        self, provider_instance: LLMProvider, messages: List[LLMMessage], kwargs: Dict[str, Any]
+    ) -> Tuple[str, str]:
+        """Pick the cache for a request.
+        
+        Returns:
+            ("exact", key) for deterministic (temperature 0) requests,
+            ("semantic", scope) when the semantic cache applies, or
+            ("", "") when the request is not cacheable
+        """
+        provider_config = self.config.get_provider_config(provider_instance.name)
+        temperature = kwargs.get("temperature", provider_config.get("temperature", 0.7))
+        model = kwargs.get("model") or provider_config.get("model", "")
+        # Remaining parameters (response_format, top_p, stop, tools, ...)
+        options = {
+            name: value
+            for name, value in kwargs.items()
+            if name not in ("model", "temperature", "max_tokens")
+        }
+        if temperature == 0:
+            return "exact", self.cache.make_key(
+                provider_instance.name,
+                model,
+                messages,
+                temperature,
+                kwargs.get("max_tokens", provider_config.get("max_tokens", 4000)),
+                options,
+            )
+        if self.semantic_cache and messages and messages[-1].role == "user":
+            return "semantic", self.semantic_cache.scope_key(
+                provider_instance.name, model, messages, options
+            )
+        return "", ""
+    
+    def _cached(
+        self, cache_key: Tuple[str, str], messages: List[LLMMessage]
+    ) -> Optional[LLMResponse]:
+        kind, key = cache_key
+        if kind == "exact":
+            entry = self.cache.get(key)
+        elif kind == "semantic" and self.semantic_cache is not None:
+            entry = self.semantic_cache.get(key, messages[-1].content)
+        else:
+            entry = None
+        return LLMResponse(**entry) if entry is not None else None
+    
+    def _remember(
+        self,
+        cache_key: Tuple[str, str],
+        messages: List[LLMMessage],
+        response: LLMResponse,
+    ) -> None:
+        kind, key = cache_key
+        if response.error is not None:
+            return
+        if kind == "exact":
+            self.cache.set(key, asdict(response))
+        elif kind == "semantic" and self.semantic_cache is not None:
+            self.semantic_cache.set(key, messages[-1].content, asdict(response))
+    
+    def chat(
+        self, messages: List[LLMMessage], provider: Optional[str] = None, **kwargs: Any
+    ) -> LLMResponse:
+        """Send chat request to specified or active provider.
+        
+        Requests with temperature 0 are answered from the response cache
+        when an identical request has succeeded before.
+        """
+        provider_instance = self._resolve(provider)
+        if isinstance(provider_instance, LLMResponse):
+            return provider_instance
+        
+        cache_key = self._cache_key(provider_instance, messages, kwargs)
+        cached = self._cached(cache_key, messages)
+        if cached is not None:
+            return cached
+        
+        response = provider_instance.chat(messages, **kwargs)
+        self._remember(cache_key, messages, response)
+        return response
+    
+    async def achat(
+        self, messages: List[LLMMessage], provider: Optional[str] = None, **kwargs: Any
+    ) -> LLMResponse:
+        """Async variant of chat() for concurrent requests."""
+        provider_instance = self._resolve(provider)
+        if isinstance(provider_instance, LLMResponse):
+            return provider_instance
+        
+        cache_key = self._cache_key(provider_instance, messages, kwargs)
+        cached = self._cached(cache_key, messages)
+        if cached is not None:
+            return cached
+        
+        response = await provider_instance.achat(messages, **kwargs)
+        self._remember(cache_key, messages, response)
+        return response
+    
+    def chat_stream(
+        self, messages: List[LLMMessage], provider: Optional[str] = None, **kwargs: Any
+    ) -> Generator[str, None, LLMResponse]:
+        """Stream a chat reply from the specified or active provider.
+        
+        Yields text chunks as they arrive; the generator's return value is
+        the final LLMResponse. Cached replies are yielded as one chunk.
+        """
+        provider_instance = self._resolve(provider)
+        if isinstance(provider_instance, LLMResponse):
+            return provider_instance
+        
+        cache_key = self._cache_key(provider_instance, messages, kwargs)
+        cached = self._cached(cache_key, messages)
+        if cached is not None:
+            if cached.content:
+                yield cached.content
+            return cached
+        
+        response = yield from provider_instance.chat_stream(messages, **kwargs)
+        self._remember(cache_key, messages, response)
+        return response
+    
+    def chat_batch(
+        self,
+        prompts: List[str],
+        provider: Optional[str] = None,
+        max_per_batch: int = 8,
+        **kwargs: Any,
+    ) -> List[str]:
+        """Answer several independent prompts with as few requests as possible.
+        
+        Prompts are grouped into one request per ``max_per_batch`` that asks
+        for a JSON list of answers, amortizing the per-request overhead.
+        Groups whose reply cannot be parsed fall back to one chat() per prompt.
+        
+        Args:
+            prompts: Independent single-turn prompts
+            provider: Provider name (defaults to the active provider)
+            max_per_batch: Maximum prompts combined into one request
+            **kwargs: Passed through to chat(); batched requests always ask
+                for a JSON object, overriding any ``response_format``
+            
+        Returns:
+            Answer text per prompt, in input order ("" for failed prompts)
+        """
+        batch_kwargs = {**kwargs, "response_format": {"type": "json_object"}}
+        answers: List[str] = []
+        for start in range(0, len(prompts), max_per_batch):
+            group = prompts[start:start + max_per_batch]
+            parsed = None
+            if len(group) > 1:
+                response = self.chat(self._batch_messages(group), provider, **batch_kwargs)
+                if response.error is None:
+                    parsed = self._parse_batch_answers(response.content, len(group))
+                if parsed is None:
+                    logger.warning("Batched prompts not answered as JSON, sending separately",
+                                   count=len(group))
+            if parsed is None:
+                parsed = [
+                    self.chat([LLMMessage(role="user", content=prompt)], provider, **kwargs).content
+                    for prompt in group
+                ]
+            answers.extend(parsed)
+        return answers
+    
+    @staticmethod
+    def _batch_messages(prompts: List[str]) -> List[LLMMessage]:
+        """Build the combined request for a group of prompts."""
+        count = len(prompts)
+        system = (
+            f"Answer each of the following {count} questions independently. "
+            'Reply with only a JSON object of the form {"answers": ["...", ...]} '
+            f"holding exactly {count} strings, in the same order as the questions."
+        )
+        questions = "\n\n".join(f"[{i}] {prompt}" for i, prompt in enumerate(prompts, 1))
+        return [
+            LLMMessage(role="system", content=system),
+            LLMMessage(role="user", content=questions),
+        ]
+    
+    @staticmethod
+    def _parse_batch_answers(content: str, count: int) -> Optional[List[str]]:
+        """Extract the answers list from a batched reply, or None if malformed."""
+        # Tolerate Markdown fences or prose around the JSON object
+        start, end = content.find("{"), content.rfind("}")
+        if start == -1 or end < start:
+            return None
+        try:
+            answers = json.loads(content[start:end + 1]).get("answers")
+        except (ValueError, AttributeError):
+            return None
+        if not isinstance(answers, list) or len(answers) != count:
+            return None
+        return [a if isinstance(a, str) else json.dumps(a) for a in answers]
+    
+    def cache_stats(self) -> Dict[str, int]:
+        """Get response cache hit/miss statistics."""
+        return self.cache.stats
+    
+    async def abatch(
+        self,
+        conversations: List[List[LLMMessage]],
+        provider: Optional[str] = None,
+        max_concurrency: int = 8,
+        **kwargs: Any,
+    ) -> List[LLMResponse]:
+        """Run several independent chats concurrently.
+        
+        Args:
+            conversations: One message list per request
+            provider: Provider to use (defaults to the active provider)
+            max_concurrency: Maximum number of requests in flight at once
+            **kwargs: Passed through to each chat request
+            
+        Returns:
+            Responses in the same order as conversations
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def run(messages: List[LLMMessage]) -> LLMResponse:
+            async with semaphore:
+                return await self.achat(messages, provider, **kwargs)
+        
+        return await asyncio.gather(*(run(messages) for messages in conversations))
     
     def test_provider(self, provider: str) -> bool:
         """Test if a provider is working."""
-        if provider not in self.providers:
+        if not self.is_available(provider):
             return False
         
-        provider_instance = self.providers[provider]
-        if not provider_instance.is_available():
-            return False
+        provider_instance = self._get(provider)
         
         try:
             response = provider_instance.chat([
@@ -545,6 +1444,41 @@ class LLMManager:
         except Exception as e:
             logger.error(f"Provider {provider} test failed", error=str(e))
             return False
+    
+    def prewarm(self) -> List[threading.Thread]:
+        """Warm up connections to every available provider in the background.
+        
+        Returns:
+            The daemon threads doing the work, for callers that want to wait
+        """
+        threads = [
+            threading.Thread(target=self._get(name).prewarm, daemon=True)
+            for name in self.get_available_providers()
+        ]
+        for thread in threads:
+            thread.start()
+        return threads
+    
+    def test_all_providers(self) -> Dict[str, bool]:
+        """Test every available provider in parallel.
+        
+        The test requests are pure network I/O, so running them in a
+        thread pool takes as long as the slowest provider rather than
+        the sum of all of them.
+        
+        Returns:
+            Dict mapping provider name to whether its test succeeded
+        """
+        available = self.get_available_providers()
+        if not available:
+            return {}
+        
+        results: Dict[str, bool] = {}
+        with ThreadPoolExecutor(max_workers=len(available)) as pool:
+            futures = {pool.submit(self.test_provider, name): name for name in available}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        return results
 
 
 # Global instance
@@ -556,4 +1490,11 @@ def get_llm_manager() -> LLMManager:
     global _llm_manager
     if _llm_manager is None:
         _llm_manager = LLMManager()
+        _llm_manager.prewarm()
     return _llm_manager
+
+
+async def close_llm_manager() -> None:
+    """Close the global LLM manager's connections, if it was created."""
+    if _llm_manager is not None:
+        await _llm_manager.aclose()
@@ -0,0 +1,262 @@
+"""Response caches for LLM requests.
+
+LLMCache only holds requests sent with temperature 0: for those, the
+same model and messages are expected to produce the same answer, so a
+repeat can be served without a network round-trip. SemanticCache is an
+opt-in layer that also reuses answers when only the wording of the
+final user message changed.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+
+import numpy as np
+import structlog
+
+logger = structlog.get_logger()
+
+# Value type stored by a SemanticCache
+V = TypeVar("V")
+
+
+class LLMCache:
+    """LRU cache of LLM responses with an optional on-disk backend."""
+    
+    def __init__(self, maxsize: int = 1024, cache_dir: Optional[Path] = None):
+        """Initialize the cache.
+        
+        Args:
+            maxsize: Maximum number of responses kept in memory
+            cache_dir: Directory for persisted responses (one JSON file per
+                key); None keeps the cache in memory only
+        """
+        self.maxsize = maxsize
+        self.cache_dir = cache_dir
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0}
+        
+        if cache_dir:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+    
+    @staticmethod
+    def make_key(
+        provider: str,
+        model: str,
+        messages: List[Any],
+        temperature: float,
+        max_tokens: int,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Build the cache key for a request.
+        
+        Args:
+            provider: Provider name
+            model: Resolved model name
+            messages: Conversation messages (objects with role and content)
+            temperature: Sampling temperature
+            max_tokens: Completion token limit
+            options: Any other request parameters (response_format, top_p,
+                stop, tools, ...); they change the reply, so they are hashed
+            
+        Returns:
+            Hex digest identifying the request
+        """
+        payload = json.dumps(
+            {
+                "provider": provider,
+                "model": model,
+                "messages": [(m.role, m.content) for m in messages],
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "options": options or {},
+            },
+            sort_keys=True,
+            default=repr,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached response.
+        
+        Args:
+            key: Key from make_key()
+            
+        Returns:
+            Stored response fields, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry
+        
+        entry = self._read_file(key)
+        with self._lock:
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["hits"] += 1
+            self._store(key, entry)
+        return entry
+    
+    def set(self, key: str, response: Dict[str, Any]) -> None:
+        """Store a response.
+        
+        Args:
+            key: Key from make_key()
+            response: Response fields to cache
+        """
+        with self._lock:
+            self._store(key, response)
+        
+        if self.cache_dir:
+            try:
+                (self.cache_dir / f"{key}.json").write_text(json.dumps(response))
+            except OSError as e:
+                logger.warning("llm_cache_write_failed", error=str(e))
+    
+    def clear(self) -> None:
+        """Drop all in-memory entries and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._stats = {"hits": 0, "misses": 0}
+    
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            return {**self._stats, "size": len(self._entries)}
+    
+    def _store(self, key: str, entry: Dict[str, Any]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    def _read_file(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self.cache_dir:
+            return None
+        path = self.cache_dir / f"{key}.json"
+        try:
+            entry = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+        # Anything but a JSON object is a corrupt or foreign file
+        return entry if isinstance(entry, dict) else None
+
+
+class SemanticCache(Generic[V]):
+    """Reuse responses for near-duplicate final user messages.
+    
+    Entries are grouped by scope: provider, model and every message
+    before the last one. Within a scope, the final user message is
+    embedded and compared against earlier ones by cosine similarity, so
+    a retried or reworded question in the same conversation state hits,
+    while the same question asked after different history does not.
+    
+    The cache is generic over the stored value: LLMManager keeps response
+    field dicts, the NL interface keeps parsed tasks.
+    """
+    
+    def __init__(
+        self,
+        embed: Callable[[str], np.ndarray],
+        threshold: float = 0.97,
+        max_scopes: int = 256,
+        max_per_scope: int = 64,
+    ) -> None:
+        """Initialize the semantic cache.
+        
+        Args:
+            embed: Function mapping text to an embedding vector
+            threshold: Minimum cosine similarity for a hit
+            max_scopes: Number of conversation states kept (LRU)
+            max_per_scope: Number of entries kept per conversation state
+        """
+        self.embed = embed
+        self.threshold = threshold
+        self.max_scopes = max_scopes
+        self.max_per_scope = max_per_scope
+        self._scopes: "OrderedDict[str, Tuple[np.ndarray, List[V]]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def scope_key(
+        provider: str,
+        model: str,
+        messages: List[Any],
+        options: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Key for the conversation state preceding the final message.
+        
+        ``options`` are the other request parameters, hashed as in
+        ``LLMCache.make_key``.
+        """
+        payload = json.dumps(
+            {
+                "provider": provider,
+                "model": model,
+                "history": [(m.role, m.content) for m in messages[:-1]],
+                "options": options or {},
+            },
+            sort_keys=True,
+            default=repr,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+    
+    def get(self, scope: str, text: str) -> Optional[V]:
+        """Find a cached response for a similar final message.
+        
+        Args:
+            scope: Key from scope_key()
+            text: Final user message
+            
+        Returns:
+            Stored value of the closest match above the threshold, or None
+        """
+        with self._lock:
+            entry = self._scopes.get(scope)
+            if entry is None:
+                return None
+            self._scopes.move_to_end(scope)
+            matrix, responses = entry
+        
+        scores = matrix @ self._unit(text)
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+        return responses[best]
+    
+    def set(self, scope: str, text: str, response: V) -> None:
+        """Store a response for the final message of a conversation state.
+        
+        Args:
+            scope: Key from scope_key()
+            text: Final user message
+            response: Value to cache
+        """
+        vector = self._unit(text)[np.newaxis]
+        with self._lock:
+            matrix, responses = self._scopes.get(scope, (vector[:0], []))
+            matrix = np.vstack([matrix, vector])[-self.max_per_scope:]
+            responses = (responses + [response])[-self.max_per_scope:]
+            self._scopes[scope] = (matrix, responses)
+            self._scopes.move_to_end(scope)
+            if len(self._scopes) > self.max_scopes:
+                self._scopes.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Remove all cached entries."""
+        with self._lock:
+            self._scopes.clear()
+    
+    def _unit(self, text: str) -> np.ndarray:
+        vector = np.asarray(self.embed(text), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
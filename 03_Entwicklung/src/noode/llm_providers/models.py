@@ -4,7 +4,7 @@ Users can define their own models or use the built-in defaults.
 All models optimized for coding.
 """
 
-from typing import Dict, List
+from typing import Dict, FrozenSet, List
 
 # Built-in model definitions - users can override in config
 # Updated with latest models as of 2024/2025
@@ -135,6 +135,21 @@ DEFAULT_MODELS: Dict[str, List[Dict]] = {
 }
 
 
+# Model ids per provider, for O(1) validation
+_MODEL_INDEX: Dict[str, FrozenSet[str]] = {
+    provider: frozenset(m["id"] for m in models)
+    for provider, models in DEFAULT_MODELS.items()
+}
+
+# Fallback defaults - Latest 2024/2025 models
+_FALLBACK_DEFAULTS: Dict[str, str] = {
+    "openai": "gpt-5.2",
+    "anthropic": "claude-4.6-opus",
+    "google": "gemini-1.5-pro-latest",
+    "openrouter": "openai/gpt-5.2",
+}
+
+
 def get_available_models(provider: str) -> List[Dict]:
     """Get list of available models for a provider."""
     return DEFAULT_MODELS.get(provider, [])
@@ -145,18 +160,9 @@ def get_default_model(provider: str) -> str:
     models = get_available_models(provider)
     if models:
         return models[0]["id"]
-    
-    # Fallback defaults - Latest 2024/2025 models
-    defaults = {
-        "openai": "gpt-5.2",
-        "anthropic": "claude-4.6-opus",
-        "google": "gemini-1.5-pro-latest",
-        "openrouter": "openai/gpt-5.2",
-    }
-    return defaults.get(provider, "")
+    return _FALLBACK_DEFAULTS.get(provider, "")
 
 
 def validate_model(provider: str, model: str) -> bool:
     """Check if a model is valid for a provider."""
-    models = get_available_models(provider)
-    return any(m["id"] == model for m in models)
+    return model in _MODEL_INDEX.get(provider, frozenset())
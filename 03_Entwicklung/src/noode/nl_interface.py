@@ -3,15 +3,75 @@
 Converts user natural language input into structured agent tasks.
 """
 
+import asyncio
+import copy
+import functools
+import hashlib
+import re
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator, Callable, Iterable
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any
 
-import litellm
 import structlog
 
+from noode.llm_providers.cache import SemanticCache
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
 logger = structlog.get_logger()
 
+PARSE_SYSTEM_PROMPT = """Du bist ein Task-Parser für eine AI-Entwicklungsplattform.
+Analysiere die Nutzeranfrage und extrahiere:
+1. Intent (was will der Nutzer?)
+2. Entitäten (Namen, Typen, Dateien)
+3. Parameter (Details, Anforderungen)
+4. Welche Agents sollten die Aufgabe bearbeiten?
+
+Antworte im Format:
+INTENT: [intent]
+ENTITIES: [key=value, ...]
+PARAMETERS: [key=value, ...]
+AGENTS: [agent1, agent2]
+CONFIDENCE: [0.0-1.0]
+CLARIFICATION: [frage wenn unklar, sonst leer]"""
+
+# "FIELD: value" lines of a PARSE_SYSTEM_PROMPT reply, and key=value pairs
+_FIELD_RE = re.compile(
+    r"^[ \t]*(INTENT|ENTITIES|PARAMETERS|AGENTS|CONFIDENCE|CLARIFICATION):(.*)$",
+    re.MULTILINE,
+)
+_KV_RE = re.compile(r"([^=,]+)=([^,]*)")
+
+# File names and quoted strings in a short command, for the keyword-only parse
+_ENTITY_RE = re.compile(r'\w+\.\w+|"[^"]+"')
+
+SUMMARY_SYSTEM_PROMPT = """Fasse den folgenden Gesprächsverlauf in wenigen Sätzen zusammen.
+Behalte Projektnamen, Dateien, Entscheidungen und offene Aufgaben bei."""
+
+# Turns kept in Conversation.messages unless configured otherwise
+DEFAULT_WINDOW_SIZE = 40
+
+RESPOND_SYSTEM_PROMPT = """Du bist Noode, ein freundlicher AI-Entwicklungsassistent.
+Erkläre Ergebnisse verständlich für nicht-technische Nutzer.
+Verwende einfache Sprache und Emojis.
+Sei prägnant aber informativ."""
+
+# System messages are built once and shared by every request, so each call
+# sends a byte-identical prefix and only the user message is new
+_PARSE_SYSTEM = {"role": "system", "content": PARSE_SYSTEM_PROMPT}
+_SUMMARY_SYSTEM = {"role": "system", "content": SUMMARY_SYSTEM_PROMPT}
+_RESPOND_SYSTEM = {"role": "system", "content": RESPOND_SYSTEM_PROMPT}
+
+# Models whose providers only cache a prompt prefix marked with cache_control;
+# OpenAI caches long identical prefixes without markers
+_CACHE_CONTROL_PREFIXES = ("claude", "anthropic/", "bedrock/", "vertex_ai/claude")
+
 
 class TaskIntent(Enum):
     """Detected user intent."""
@@ -28,7 +88,97 @@ class TaskIntent(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
+def _compile_intent_matcher(
+    intent_keywords: dict[TaskIntent, list[str]],
+) -> Callable[[str], TaskIntent]:
+    """Build a matcher returning the first intent with a keyword in the text.
+    
+    Intents are tried in dict order, as a keyword-by-keyword scan would.
+    Uses one Aho-Corasick pass over the text when pyahocorasick is installed,
+    otherwise substring tests against a flat tuple of encoded keywords.
+    
+    Args:
+        intent_keywords: Keywords per intent, in priority order
+        
+    Returns:
+        Function mapping lowercased text to a TaskIntent
+    """
+    intents = list(intent_keywords)
+    
+    if AHOCORASICK_AVAILABLE and any(intent_keywords.values()):
+        automaton = ahocorasick.Automaton()
+        for priority, keywords in enumerate(intent_keywords.values()):
+            for keyword in keywords:
+                # A keyword listed twice belongs to its first intent
+                if keyword not in automaton:
+                    automaton.add_word(keyword, priority)
+        automaton.make_automaton()
+        
+        def match(text: str) -> TaskIntent:
+            best = None
+            for _, priority in automaton.iter(text):
+                if best is None or priority < best:
+                    best = priority
+                    if best == 0:
+                        # Nothing outranks the first intent; skip the rest of
+                        # long inputs such as pasted logs
+                        break
+            return TaskIntent.UNKNOWN if best is None else intents[best]
+        
+        return match
+    
+    # Flattened in priority order; bytes containment is a C-level memmem
+    flat_keywords = tuple(
+        (keyword.encode(), intent)
+        for intent, keywords in intent_keywords.items()
+        for keyword in keywords
+    )
+    
+    def match_substrings(text: str) -> TaskIntent:
+        data = text.encode()
+        for keyword, intent in flat_keywords:
+            if keyword in data:
+                return intent
+        return TaskIntent.UNKNOWN
+    
+    return match_substrings
+
+
+def _compile_word_intents(
+    intent_keywords: dict[TaskIntent, list[str]],
+) -> Callable[[str], set[TaskIntent]]:
+    """Build a matcher returning every intent with a whole-word keyword match.
+    
+    Unlike ``_compile_intent_matcher`` a keyword only counts when it is not
+    part of a longer word, so "ui" does not match "build".
+    
+    Args:
+        intent_keywords: Keywords per intent
+        
+    Returns:
+        Function mapping lowercased text to the set of matched intents
+    """
+    keyword_intents: dict[str, set[TaskIntent]] = {}
+    for intent, keywords in intent_keywords.items():
+        for keyword in keywords:
+            keyword_intents.setdefault(keyword, set()).add(intent)
+    
+    # Longest first, so a phrase wins over a keyword it starts with
+    alternation = "|".join(
+        re.escape(keyword) for keyword in sorted(keyword_intents, key=len, reverse=True)
+    )
+    pattern = re.compile(rf"\b(?:{alternation})\b")
+    
+    def match(text: str) -> set[TaskIntent]:
+        found: set[TaskIntent] = set()
+        for keyword in pattern.findall(text):
+            found |= keyword_intents[keyword]
+        return found
+    
+    return match
+
+
+@dataclass(slots=True)
 class ParsedTask:
     """A parsed task from natural language."""
     
@@ -41,14 +191,67 @@ class ParsedTask:
     clarification_needed: str | None = None
 
 
-@dataclass
+@functools.lru_cache(maxsize=8)
+def _token_counter(model: str) -> Callable[[str], int]:
+    """Return a token counting function for a model.
+    
+    Falls back to a 4-characters-per-token estimate when tiktoken or the
+    model's encoding is unavailable (e.g. offline).
+    """
+    try:
+        import tiktoken
+        try:
+            encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            encoding = tiktoken.get_encoding("cl100k_base")
+        return lambda text: len(encoding.encode(text))
+    except Exception as e:
+        logger.debug("tiktoken_unavailable", model=model, error=str(e))
+        return lambda text: len(text) // 4 + 1
+
+
+@functools.lru_cache(maxsize=None)
+def _cache_control_system(prompt: str) -> dict[str, Any]:
+    """Return a system message marking the prompt as a cacheable prefix.
+    
+    Uses the Anthropic content-block format, which litellm translates for
+    other providers. One message is built per prompt and then reused.
+    """
+    return {
+        "role": "system",
+        "content": [
+            {"type": "text", "text": prompt, "cache_control": {"type": "ephemeral"}},
+        ],
+    }
+
+
+@dataclass(slots=True)
 class Conversation:
-    """Tracks conversation context."""
+    """Tracks conversation context.
     
-    messages: list[dict[str, str]] = field(default_factory=list)
+    ``messages`` is a sliding window: once full, appending a turn drops
+    the oldest one. ``message_tokens`` holds the token count of each
+    message in the window, in the same order; None marks a message not
+    counted yet.
+    """
+    
+    messages: deque[dict[str, str]] = field(
+        default_factory=lambda: deque(maxlen=DEFAULT_WINDOW_SIZE)
+    )
+    message_tokens: deque[int | None] = field(
+        default_factory=lambda: deque(maxlen=DEFAULT_WINDOW_SIZE)
+    )
     current_project: str | None = None
     current_file: str | None = None
     pending_task: ParsedTask | None = None
+    
+    @classmethod
+    def with_window(cls, window_size: int) -> "Conversation":
+        """Create an empty conversation keeping the last window_size turns."""
+        return cls(
+            messages=deque(maxlen=window_size),
+            message_tokens=deque(maxlen=window_size),
+        )
 
 
 class NaturalLanguageInterface:
@@ -69,24 +272,46 @@ class NaturalLanguageInterface:
         TaskIntent.EXPLAIN: ["erkläre", "explain", "was ist", "what is", "wie funktioniert", "how does"],
         TaskIntent.RESEARCH: ["recherche", "research", "best practice", "wie sollte", "empfehlung"],
     }
+    _match_intent = staticmethod(_compile_intent_matcher(INTENT_KEYWORDS))
+    _match_word_intents = staticmethod(_compile_word_intents(INTENT_KEYWORDS))
+    
+    # Completions at or below this temperature are treated as deterministic
+    # and answered from the response cache when the prompt repeats
+    CACHE_MAX_TEMPERATURE = 0.3
+    CACHE_SIZE = 1024
+    
+    # With fast_parse, inputs shorter than this whose keywords name exactly
+    # one intent skip the LLM parse
+    FAST_PARSE_MAX_CHARS = 80
+    FAST_PARSE_CONFIDENCE = 0.8
     
     def __init__(
         self,
         model: str = "gpt-4o",
+        window_size: int = DEFAULT_WINDOW_SIZE,
+        fast_parse: bool = False,
     ) -> None:
         """Initialize the NL interface.
         
         Args:
             model: LLM model to use
+            window_size: Number of conversation turns kept in history
+            fast_parse: Answer short commands whose whole-word keywords
+                name exactly one intent without calling the LLM
         """
         self.model = model
-        self.conversation = Conversation()
+        self.window_size = window_size
+        self.fast_parse = fast_parse
+        self.conversation = Conversation.with_window(window_size)
+        self._response_cache: OrderedDict[bytes, str] = OrderedDict()
+        self.semantic_cache: SemanticCache[ParsedTask] | None = None
     
-    async def parse(self, user_input: str) -> ParsedTask:
+    async def parse(self, user_input: str, record: bool = True) -> ParsedTask:
         """Parse natural language input into a structured task.
         
         Args:
             user_input: Raw user input
+            record: Add the input to the conversation history
             
         Returns:
             Parsed task with intent and parameters
@@ -96,17 +321,89 @@ class NaturalLanguageInterface:
         # Quick intent detection from keywords
         quick_intent = self._detect_intent_keywords(user_input)
         
-        # LLM-based parsing for detailed understanding
-        parsed = await self._llm_parse(user_input, quick_intent)
+        parsed = self._try_fast_parse(user_input)
+        if parsed is None:
+            parsed = await self._semantic_lookup(user_input)
+        if parsed is None:
+            # LLM-based parsing for detailed understanding
+            parsed = await self._llm_parse(user_input, quick_intent)
+            
+            if self.semantic_cache is not None:
+                await asyncio.to_thread(
+                    self.semantic_cache.set, self._semantic_scope(), user_input, parsed
+                )
         
         # Add to conversation history
-        self.conversation.messages.append({
-            "role": "user",
-            "content": user_input,
-        })
+        if record:
+            self._add_message("user", user_input)
         
         return parsed
     
+    async def parse_many(
+        self,
+        inputs: list[str],
+        max_concurrency: int = 16,
+    ) -> list[ParsedTask]:
+        """Parse several independent inputs concurrently.
+        
+        The inputs are not added to the conversation history, so the
+        parses do not depend on each other's completion order.
+        
+        Args:
+            inputs: Raw user inputs
+            max_concurrency: Maximum number of parses in flight
+            
+        Returns:
+            Parsed tasks in input order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def parse_one(user_input: str) -> ParsedTask:
+            async with semaphore:
+                return await self.parse(user_input, record=False)
+        
+        return list(await asyncio.gather(*(parse_one(text) for text in inputs)))
+    
+    def enable_semantic_cache(
+        self,
+        threshold: float = 0.92,
+        embed: Callable[[str], Any] | None = None,
+    ) -> None:
+        """Reuse parses of paraphrased inputs instead of calling the LLM.
+        
+        Args:
+            threshold: Minimum cosine similarity between user inputs
+            embed: Text embedding function; defaults to the knowledge
+                module's sentence-transformers model
+        """
+        if embed is None:
+            from noode.knowledge.embeddings import embed_text
+            embed = embed_text
+        self.semantic_cache = SemanticCache(embed, threshold=threshold, max_per_scope=2048)
+    
+    def _semantic_scope(self) -> str:
+        """Cache scope: parses only carry over within the same model and context."""
+        return "\0".join((
+            self.model,
+            self.conversation.current_project or "",
+            self.conversation.current_file or "",
+        ))
+    
+    async def _semantic_lookup(self, user_input: str) -> ParsedTask | None:
+        """Return a copy of the parse of a similar earlier input, if any."""
+        if self.semantic_cache is None:
+            return None
+        # Embedding runs a model; keep it off the event loop
+        cached = await asyncio.to_thread(
+            self.semantic_cache.get, self._semantic_scope(), user_input
+        )
+        if cached is None:
+            return None
+        logger.debug("nl_semantic_cache_hit", input=user_input[:50])
+        parsed = copy.deepcopy(cached)
+        parsed.description = user_input
+        return parsed
+    
     async def clarify(self, question: str) -> str:
         """Ask a clarification question.
         
@@ -116,55 +413,161 @@ class NaturalLanguageInterface:
         Returns:
             Formatted question
         """
-        self.conversation.messages.append({
-            "role": "assistant",
-            "content": question,
-        })
+        self._add_message("assistant", question)
         return question
     
-    async def respond(self, task_result: Any) -> str:
-        """Generate a natural language response for task result.
+    async def respond(self, task_result: Any) -> AsyncIterator[str]:
+        """Stream a natural language response for task result.
+        
+        Pieces are yielded as the LLM produces them; the full response is
+        added to the conversation once the stream is exhausted.
         
         Args:
             task_result: Result from task execution
             
-        Returns:
-            Natural language response
+        Yields:
+            Response text pieces
         """
+        # Deferred: importing litellm dominates the module's import time
+        import litellm
+        
         response = await litellm.acompletion(
             model=self.model,
-            messages=[{
-                "role": "system",
-                "content": """Du bist Noode, ein freundlicher AI-Entwicklungsassistent.
-Erkläre Ergebnisse verständlich für nicht-technische Nutzer.
-Verwende einfache Sprache und Emojis.
-Sei prägnant aber informativ.""",
-            }, {
-                "role": "user",
-                "content": f"Erkläre dieses Ergebnis dem Nutzer:\n{task_result}",
-            }],
+            messages=[
+                self._system_message(_RESPOND_SYSTEM),
+                {"role": "user", "content": f"Erkläre dieses Ergebnis dem Nutzer:\n{task_result}"},
+            ],
             temperature=0.7,
+            stream=True,
         )
         
-        content = response.choices[0].message.content or ""
+        buffer = []
+        async for chunk in response:
+            piece = chunk.choices[0].delta.content or ""
+            if piece:
+                buffer.append(piece)
+                yield piece
         
-        self.conversation.messages.append({
-            "role": "assistant",
-            "content": content,
-        })
+        self._add_message("assistant", "".join(buffer))
+    
+    async def respond_full(self, task_result: Any) -> str:
+        """Generate a complete natural language response for task result.
         
-        return content
+        Args:
+            task_result: Result from task execution
+            
+        Returns:
+            Natural language response
+        """
+        return "".join([piece async for piece in self.respond(task_result)])
+    
+    def _add_message(self, role: str, content: str) -> None:
+        """Append a turn to the history; its tokens are counted on demand."""
+        self.conversation.messages.append({"role": role, "content": content})
+        self.conversation.message_tokens.append(None)
+    
+    async def _count_tokens(self) -> int:
+        """Count the tokens of the kept messages.
+        
+        Messages not counted yet are counted now and the counts stored.
+        Loading a tiktoken encoding may download it, so the counter is
+        created off the event loop.
+        
+        Returns:
+            Total tokens of the messages in the window
+        """
+        conversation = self.conversation
+        if None in conversation.message_tokens:
+            counter = await asyncio.to_thread(_token_counter, self.model)
+            conversation.message_tokens = deque(
+                (
+                    counter(message["content"]) if tokens is None else tokens
+                    for message, tokens in zip(
+                        conversation.messages, conversation.message_tokens
+                    )
+                ),
+                maxlen=conversation.message_tokens.maxlen,
+            )
+        return sum(tokens or 0 for tokens in conversation.message_tokens)
+    
+    async def _summarize_if_over(self, token_budget: int = 4000) -> bool:
+        """Compress the history when it exceeds a token budget.
+        
+        The oldest half of the messages is replaced by one LLM-written
+        summary message, so history-aware prompts stay within budget.
+        
+        Args:
+            token_budget: Maximum total tokens of the kept messages
+            
+        Returns:
+            True if the history was summarized
+        """
+        conversation = self.conversation
+        if await self._count_tokens() <= token_budget or len(conversation.messages) < 2:
+            return False
+        
+        oldest = [conversation.messages.popleft() for _ in range(len(conversation.messages) // 2)]
+        for _ in oldest:
+            conversation.message_tokens.popleft()
+        
+        transcript = "\n".join(f"{m['role']}: {m['content']}" for m in oldest)
+        summary = await self._complete(_SUMMARY_SYSTEM, transcript, temperature=0.3)
+        content = f"Bisheriger Verlauf (zusammengefasst): {summary}"
+        conversation.messages.appendleft({"role": "system", "content": content})
+        conversation.message_tokens.appendleft(None)
+        return True
     
     def _detect_intent_keywords(self, text: str) -> TaskIntent:
         """Quick intent detection using keywords."""
-        text_lower = text.lower()
+        return self._match_intent(text.lower())
+    
+    def _detect_intents_batch(self, texts: Iterable[str]) -> list[TaskIntent]:
+        """Keyword intent detection for several texts.
         
-        for intent, keywords in self.INTENT_KEYWORDS.items():
-            for keyword in keywords:
-                if keyword in text_lower:
-                    return intent
+        All texts go through the one matcher compiled for the class.
         
-        return TaskIntent.UNKNOWN
+        Args:
+            texts: Texts to classify
+            
+        Returns:
+            Intent per text, in input order
+        """
+        match = self._match_intent
+        return [match(text.lower()) for text in texts]
+    
+    def _try_fast_parse(self, user_input: str) -> ParsedTask | None:
+        """Build a task from keywords alone for short, unambiguous commands.
+        
+        The substring scan behind ``_detect_intent_keywords`` is only a hint
+        for the LLM, so the fast path requires whole-word keyword matches
+        that all point to a single intent.
+        
+        Args:
+            user_input: Raw user input
+            
+        Returns:
+            Parsed task, or None if the input needs the LLM
+        """
+        if not self.fast_parse or len(user_input) >= self.FAST_PARSE_MAX_CHARS:
+            return None
+        
+        intents = self._match_word_intents(user_input.lower())
+        if len(intents) != 1:
+            return None
+        (quick_intent,) = intents
+        
+        targets = _ENTITY_RE.findall(user_input)
+        if len(targets) > 1:
+            return None
+        
+        logger.debug("nl_fast_parse", intent=quick_intent.value)
+        return ParsedTask(
+            intent=quick_intent,
+            description=user_input,
+            entities={"target": targets[0].strip('"')} if targets else {},
+            confidence=self.FAST_PARSE_CONFIDENCE,
+            suggested_agents=self._suggest_agents(quick_intent),
+        )
     
     async def _llm_parse(
         self,
@@ -180,38 +583,69 @@ Sei prägnant aber informativ.""",
         if self.conversation.current_file:
             context += f"Current file: {self.conversation.current_file}\n"
         
-        response = await litellm.acompletion(
-            model=self.model,
-            messages=[{
-                "role": "system",
-                "content": """Du bist ein Task-Parser für eine AI-Entwicklungsplattform.
-Analysiere die Nutzeranfrage und extrahiere:
-1. Intent (was will der Nutzer?)
-2. Entitäten (Namen, Typen, Dateien)
-3. Parameter (Details, Anforderungen)
-4. Welche Agents sollten die Aufgabe bearbeiten?
-
-Antworte im Format:
-INTENT: [intent]
-ENTITIES: [key=value, ...]
-PARAMETERS: [key=value, ...]
-AGENTS: [agent1, agent2]
-CONFIDENCE: [0.0-1.0]
-CLARIFICATION: [frage wenn unklar, sonst leer]""",
-            }, {
-                "role": "user",
-                "content": f"""Kontext: {context}
+        content = await self._complete(
+            _PARSE_SYSTEM,
+            f"""Kontext: {context}
 
 Nutzeranfrage: {user_input}
 
 Vorläufiger Intent (aus Keywords): {quick_intent.value}""",
-            }],
             temperature=0.3,
         )
         
+        return self._parse_llm_response(content, user_input, quick_intent)
+    
+    async def _complete(
+        self,
+        system: dict[str, Any],
+        user: str,
+        temperature: float,
+    ) -> str:
+        """Run a chat completion, reusing replies to repeated deterministic prompts.
+        
+        Args:
+            system: Shared system message
+            user: User prompt
+            temperature: Sampling temperature
+            
+        Returns:
+            Completion text
+        """
+        key = None
+        if temperature <= self.CACHE_MAX_TEMPERATURE:
+            key = hashlib.blake2b(
+                "\0".join((self.model, system["content"], user, repr(temperature))).encode(),
+                digest_size=16,
+            ).digest()
+            cached = self._response_cache.get(key)
+            if cached is not None:
+                self._response_cache.move_to_end(key)
+                logger.debug("nl_response_cache_hit")
+                return cached
+        
+        import litellm
+        
+        response = await litellm.acompletion(
+            model=self.model,
+            messages=[
+                self._system_message(system),
+                {"role": "user", "content": user},
+            ],
+            temperature=temperature,
+        )
         content = response.choices[0].message.content or ""
         
-        return self._parse_llm_response(content, user_input, quick_intent)
+        if key is not None and content:
+            self._response_cache[key] = content
+            if len(self._response_cache) > self.CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+        return content
+    
+    def _system_message(self, message: dict[str, Any]) -> dict[str, Any]:
+        """Add a prompt-cache marker to a system message where the provider needs one."""
+        if self.model.startswith(_CACHE_CONTROL_PREFIXES):
+            return _cache_control_system(message["content"])
+        return message
     
     def _parse_llm_response(
         self,
@@ -221,51 +655,54 @@ Vorläufiger Intent (aus Keywords): {quick_intent.value}""",
     ) -> ParsedTask:
         """Parse structured response from LLM."""
         
-        intent = fallback_intent
+        fields: dict[str, Any] = {
+            "INTENT": fallback_intent,
+            "AGENTS": [],
+            "CONFIDENCE": 0.5,
+            "CLARIFICATION": None,
+        }
         entities: dict[str, str] = {}
         parameters: dict[str, Any] = {}
-        agents: list[str] = []
-        confidence = 0.5
-        clarification = None
         
-        for line in response.split("\n"):
-            line = line.strip()
-            
-            if line.startswith("INTENT:"):
-                intent_str = line.split(":", 1)[1].strip().lower()
-                for ti in TaskIntent:
-                    if ti.value in intent_str or intent_str in ti.value:
-                        intent = ti
-                        break
-            
-            elif line.startswith("ENTITIES:"):
-                parts = line.split(":", 1)[1].strip()
-                for part in parts.split(","):
-                    if "=" in part:
-                        k, v = part.split("=", 1)
-                        entities[k.strip()] = v.strip()
-            
-            elif line.startswith("PARAMETERS:"):
-                parts = line.split(":", 1)[1].strip()
-                for part in parts.split(","):
-                    if "=" in part:
-                        k, v = part.split("=", 1)
-                        parameters[k.strip()] = v.strip()
-            
-            elif line.startswith("AGENTS:"):
-                agents_str = line.split(":", 1)[1].strip()
-                agents = [a.strip() for a in agents_str.split(",") if a.strip()]
-            
-            elif line.startswith("CONFIDENCE:"):
-                try:
-                    confidence = float(line.split(":", 1)[1].strip())
-                except ValueError:
-                    pass
-            
-            elif line.startswith("CLARIFICATION:"):
-                clarification = line.split(":", 1)[1].strip()
-                if not clarification or clarification.lower() in ["none", "leer", "-"]:
-                    clarification = None
+        def parse_intent(value: str) -> None:
+            intent_str = value.lower()
+            for ti in TaskIntent:
+                if ti.value in intent_str or intent_str in ti.value:
+                    fields["INTENT"] = ti
+                    break
+        
+        def parse_confidence(value: str) -> None:
+            try:
+                fields["CONFIDENCE"] = float(value)
+            except ValueError:
+                pass
+        
+        def parse_clarification(value: str) -> None:
+            if value and value.lower() not in ("none", "leer", "-"):
+                fields["CLARIFICATION"] = value
+            else:
+                fields["CLARIFICATION"] = None
+        
+        handlers: dict[str, Callable[[str], None]] = {
+            "INTENT": parse_intent,
+            "ENTITIES": lambda value: entities.update(
+                (k.strip(), v.strip()) for k, v in _KV_RE.findall(value)
+            ),
+            "PARAMETERS": lambda value: parameters.update(
+                (k.strip(), v.strip()) for k, v in _KV_RE.findall(value)
+            ),
+            "AGENTS": lambda value: fields.__setitem__(
+                "AGENTS", [a.strip() for a in value.split(",") if a.strip()]
+            ),
+            "CONFIDENCE": parse_confidence,
+            "CLARIFICATION": parse_clarification,
+        }
+        
+        for match in _FIELD_RE.finditer(response):
+            handlers[match.group(1)](match.group(2).strip())
+        
+        intent = fields["INTENT"]
+        agents = fields["AGENTS"]
         
         # Suggest agents if not specified
         if not agents:
@@ -276,9 +713,9 @@ Vorläufiger Intent (aus Keywords): {quick_intent.value}""",
             description=original_input,
             entities=entities,
             parameters=parameters,
-            confidence=confidence,
+            confidence=fields["CONFIDENCE"],
             suggested_agents=agents,
-            clarification_needed=clarification,
+            clarification_needed=fields["CLARIFICATION"],
         )
     
     def _suggest_agents(self, intent: TaskIntent) -> list[str]:
@@ -317,4 +754,10 @@ Vorläufiger Intent (aus Keywords): {quick_intent.value}""",
     
     def clear_context(self) -> None:
         """Clear conversation context."""
-        self.conversation = Conversation()
+        self.conversation = Conversation.with_window(self.window_size)
+    
+    def clear_cache(self) -> None:
+        """Drop all cached LLM responses and parses."""
+        self._response_cache.clear()
+        if self.semantic_cache is not None:
+            self.semantic_cache.clear()
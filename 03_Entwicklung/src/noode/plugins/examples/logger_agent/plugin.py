@@ -3,6 +3,8 @@
 Shows how to create a custom agent plugin.
 """
 
+import time
+from collections.abc import Iterator
 from typing import Any
 from datetime import datetime
 
@@ -20,7 +22,11 @@ PLUGIN_METADATA = {
 
 
 class LoggerAgent(BaseAgent):
-    """Agent that logs all activities."""
+    """Agent that logs all activities.
+    
+    Entries are kept as parallel columns and only turned into dicts, with
+    formatted timestamps, when the logs are read.
+    """
     
     def __init__(self) -> None:
         super().__init__(
@@ -30,25 +36,39 @@ class LoggerAgent(BaseAgent):
             model="gpt-4o-mini",  # Lightweight model
             confidence_threshold=0.5,
         )
-        self.log_entries: list[dict[str, Any]] = []
+        self._timestamps_ns: list[int] = []
+        self._action_types: list[str] = []
+        self._parameters: list[dict[str, Any]] = []
     
     async def act(self, action: Action) -> Result:
         """Log the action."""
-        entry = {
-            "timestamp": datetime.now().isoformat(),
-            "action_type": action.action_type,
-            "parameters": action.parameters,
-        }
-        self.log_entries.append(entry)
+        self._timestamps_ns.append(time.time_ns())
+        self._action_types.append(action.action_type)
+        self._parameters.append(action.parameters)
         
         return Result(
             success=True,
-            output={"logged": True, "entry_count": len(self.log_entries)},
+            output={"logged": True, "entry_count": len(self._timestamps_ns)},
         )
     
-    def get_logs(self) -> list[dict[str, Any]]:
-        """Get all log entries."""
-        return self.log_entries.copy()
+    def iter_logs(self) -> Iterator[dict[str, Any]]:
+        """Iterate over log entries without copying the log.
+        
+        Entries are built as they are consumed; do not log new actions
+        while iterating.
+        """
+        for ns, action_type, parameters in zip(
+            self._timestamps_ns, self._action_types, self._parameters
+        ):
+            yield {
+                "timestamp": datetime.fromtimestamp(ns / 1e9).isoformat(),
+                "action_type": action_type,
+                "parameters": parameters,
+            }
+    
+    def snapshot_logs(self) -> list[dict[str, Any]]:
+        """Get a list of all log entries (an O(n) copy; prefer iter_logs)."""
+        return list(self.iter_logs())
 
 
 class LoggerAgentPlugin(AgentPlugin):
@@ -82,3 +102,7 @@ class LoggerAgentPlugin(AgentPlugin):
         if not self._agent:
             self._agent = LoggerAgent()
         return self._agent
+
+
+# Entry point used by PluginManager instead of scanning the module
+PLUGIN_CLASS = LoggerAgentPlugin
@@ -3,12 +3,16 @@
 Allows extending the platform with custom agents and capabilities.
 """
 
+import asyncio
 import importlib
 import importlib.util
+import sys
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Callable
+from types import ModuleType
+from typing import Any, Callable, Literal
 
 import structlog
 
@@ -17,7 +21,7 @@ from noode.core.base_agent import BaseAgent
 logger = structlog.get_logger()
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PluginMetadata:
     """Metadata for a plugin."""
     
@@ -71,6 +75,11 @@ class ToolPlugin(Plugin):
 class MiddlewarePlugin(Plugin):
     """Plugin that intercepts and modifies requests/responses."""
     
+    # Set to True when the middleware only depends on the original
+    # request/response, not on changes made by other middlewares. Adjacent
+    # parallel middlewares then run concurrently and their changes are merged.
+    parallel: bool = False
+    
     @abstractmethod
     async def pre_process(self, request: dict[str, Any]) -> dict[str, Any]:
         """Process request before agent handles it."""
@@ -86,13 +95,32 @@ class MiddlewarePlugin(Plugin):
         pass
 
 
-@dataclass
+PluginKind = Literal["agent", "tool", "middleware", "other"]
+
+
+@dataclass(slots=True)
 class LoadedPlugin:
-    """A loaded plugin instance."""
+    """A loaded plugin instance.
+    
+    ``kind`` is derived from the instance once, so request paths do not
+    repeat isinstance checks.
+    """
     
     metadata: PluginMetadata
     instance: Plugin
     enabled: bool = True
+    plugin_class: type[Plugin] | None = None
+    kind: PluginKind = field(init=False)
+    
+    def __post_init__(self) -> None:
+        if isinstance(self.instance, AgentPlugin):
+            self.kind = "agent"
+        elif isinstance(self.instance, ToolPlugin):
+            self.kind = "tool"
+        elif isinstance(self.instance, MiddlewarePlugin):
+            self.kind = "middleware"
+        else:
+            self.kind = "other"
 
 
 class PluginManager:
@@ -110,6 +138,16 @@ class PluginManager:
         self.plugin_dirs = plugin_dirs or []
         self._plugins: dict[str, LoadedPlugin] = {}
         self._hooks: dict[str, list[Callable]] = {}
+        # Executed plugin modules by (path, mtime), shared by discover() and load()
+        self._module_cache: dict[tuple[str, int], ModuleType] = {}
+        # Plugin instances by kind and name, filled at load time
+        self._agent_plugins: dict[str, AgentPlugin] = {}
+        self._tool_plugins: dict[str, ToolPlugin] = {}
+        self._middleware_plugins: dict[str, MiddlewarePlugin] = {}
+        # Materialized plugin views, reset by _invalidate()
+        self._agents_cache: list[BaseAgent] | None = None
+        self._tools_cache: dict[str, Callable] | None = None
+        self._middleware_cache: list[list[MiddlewarePlugin]] | None = None
     
     def discover(self) -> list[PluginMetadata]:
         """Discover available plugins.
@@ -117,24 +155,55 @@ class PluginManager:
         Returns:
             List of discovered plugin metadata
         """
-        discovered = []
+        paths = self._plugin_paths()
+        if not paths:
+            return []
         
-        for plugin_dir in self.plugin_dirs:
-            if not plugin_dir.exists():
-                continue
-            
-            for path in plugin_dir.glob("*/plugin.py"):
-                try:
-                    metadata = self._load_metadata(path)
-                    if metadata:
-                        discovered.append(metadata)
-                except Exception as e:
-                    logger.warning(
-                        "plugin_discovery_failed",
-                        path=str(path),
-                        error=str(e),
-                    )
+        # Plugin files are read and executed concurrently so disk latency overlaps
+        with ThreadPoolExecutor(max_workers=min(8, len(paths))) as pool:
+            futures = [pool.submit(self._load_metadata, path) for path in paths]
+            results = [future.exception() or future.result() for future in futures]
+        
+        return self._collect_metadata(paths, results)
+    
+    async def discover_async(self) -> list[PluginMetadata]:
+        """Discover available plugins without blocking the event loop.
         
+        Returns:
+            List of discovered plugin metadata
+        """
+        paths = self._plugin_paths()
+        results = await asyncio.gather(
+            *(asyncio.to_thread(self._load_metadata, path) for path in paths),
+            return_exceptions=True,
+        )
+        return self._collect_metadata(paths, results)
+    
+    def _plugin_paths(self) -> list[Path]:
+        """All plugin.py files in the plugin directories, in sorted order."""
+        return sorted(
+            path
+            for plugin_dir in self.plugin_dirs
+            if plugin_dir.exists()
+            for path in plugin_dir.glob("*/plugin.py")
+        )
+    
+    def _collect_metadata(
+        self,
+        paths: list[Path],
+        results: list[Any],
+    ) -> list[PluginMetadata]:
+        """Keep successfully loaded metadata and log failed plugins."""
+        discovered = []
+        for path, result in zip(paths, results):
+            if isinstance(result, BaseException):
+                logger.warning(
+                    "plugin_discovery_failed",
+                    path=str(path),
+                    error=str(result),
+                )
+            elif result:
+                discovered.append(result)
         return discovered
     
     def load(self, plugin_name: str) -> LoadedPlugin | None:
@@ -159,8 +228,9 @@ class PluginManager:
                         loaded = LoadedPlugin(
                             metadata=plugin.metadata,
                             instance=plugin,
+                            plugin_class=type(plugin),
                         )
-                        self._plugins[plugin_name] = loaded
+                        self._add_loaded(plugin_name, loaded)
                         
                         # Initialize plugin
                         plugin.initialize({"manager": self})
@@ -201,23 +271,59 @@ class PluginManager:
             logger.warning("plugin_shutdown_error", name=plugin_name, error=str(e))
         
         del self._plugins[plugin_name]
+        self._discard_kind(plugin_name)
+        self._invalidate()
         
         logger.info("plugin_unloaded", name=plugin_name)
         
         return True
     
+    def _add_loaded(self, plugin_name: str, loaded: LoadedPlugin) -> None:
+        """Register a loaded plugin under its name and kind."""
+        self._plugins[plugin_name] = loaded
+        self._discard_kind(plugin_name)
+        instance = loaded.instance
+        if isinstance(instance, AgentPlugin):
+            self._agent_plugins[plugin_name] = instance
+        elif isinstance(instance, ToolPlugin):
+            self._tool_plugins[plugin_name] = instance
+        elif isinstance(instance, MiddlewarePlugin):
+            self._middleware_plugins[plugin_name] = instance
+        self._invalidate()
+    
+    def _discard_kind(self, plugin_name: str) -> None:
+        """Remove a plugin name from the per-kind tables."""
+        self._agent_plugins.pop(plugin_name, None)
+        self._tool_plugins.pop(plugin_name, None)
+        self._middleware_plugins.pop(plugin_name, None)
+    
+    def _invalidate(self) -> None:
+        """Drop the cached plugin views after a plugin state change."""
+        self._agents_cache = None
+        self._tools_cache = None
+        self._middleware_cache = None
+    
     def get_agents(self) -> list[BaseAgent]:
         """Get all agents from loaded plugins.
         
+        The list is rebuilt only after a plugin is loaded, unloaded,
+        enabled or disabled.
+        
         Returns:
             List of agent instances
         """
+        if self._agents_cache is None:
+            self._agents_cache = self._collect_agents()
+        return list(self._agents_cache)
+    
+    def _collect_agents(self) -> list[BaseAgent]:
         agents = []
         
-        for loaded in self._plugins.values():
-            if isinstance(loaded.instance, AgentPlugin) and loaded.enabled:
+        for name, plugin in self._agent_plugins.items():
+            loaded = self._plugins[name]
+            if loaded.enabled:
                 try:
-                    agents.append(loaded.instance.get_agent())
+                    agents.append(plugin.get_agent())
                 except Exception as e:
                     logger.error(
                         "agent_plugin_error",
@@ -230,15 +336,23 @@ class PluginManager:
     def get_tools(self) -> dict[str, Callable]:
         """Get all tools from loaded plugins.
         
+        The mapping is rebuilt only after a plugin state change.
+        
         Returns:
             Dict of tool name -> callable
         """
+        if self._tools_cache is None:
+            self._tools_cache = self._collect_tools()
+        return dict(self._tools_cache)
+    
+    def _collect_tools(self) -> dict[str, Callable]:
         tools = {}
         
-        for loaded in self._plugins.values():
-            if isinstance(loaded.instance, ToolPlugin) and loaded.enabled:
+        for name, plugin in self._tool_plugins.items():
+            loaded = self._plugins[name]
+            if loaded.enabled:
                 try:
-                    tools.update(loaded.instance.get_tools())
+                    tools.update(plugin.get_tools())
                 except Exception as e:
                     logger.error(
                         "tool_plugin_error",
@@ -262,21 +376,69 @@ class PluginManager:
         Returns:
             Processed response
         """
+        if self._middleware_cache is None:
+            self._middleware_cache = self._middleware_stages([
+                plugin
+                for name, plugin in self._middleware_plugins.items()
+                if self._plugins[name].enabled
+            ])
+        stages = self._middleware_cache
+        
         # Pre-process
-        for loaded in self._plugins.values():
-            if isinstance(loaded.instance, MiddlewarePlugin) and loaded.enabled:
-                request = await loaded.instance.pre_process(request)
+        for stage in stages:
+            if len(stage) == 1:
+                request = await stage[0].pre_process(request)
+            else:
+                results = await asyncio.gather(*(mw.pre_process(request) for mw in stage))
+                request = self._merge_changes(request, results)
         
         # Handle
         response = await handler(request)
         
         # Post-process
-        for loaded in self._plugins.values():
-            if isinstance(loaded.instance, MiddlewarePlugin) and loaded.enabled:
-                response = await loaded.instance.post_process(request, response)
+        for stage in stages:
+            if len(stage) == 1:
+                response = await stage[0].post_process(request, response)
+            else:
+                results = await asyncio.gather(
+                    *(mw.post_process(request, response) for mw in stage)
+                )
+                response = self._merge_changes(response, results)
         
         return response
     
+    @staticmethod
+    def _middleware_stages(
+        middlewares: list[MiddlewarePlugin],
+    ) -> list[list[MiddlewarePlugin]]:
+        """Group runs of adjacent parallel middlewares; others run alone."""
+        stages: list[list[MiddlewarePlugin]] = []
+        for mw in middlewares:
+            if mw.parallel and stages and stages[-1][0].parallel:
+                stages[-1].append(mw)
+            else:
+                stages.append([mw])
+        return stages
+    
+    @staticmethod
+    def _merge_changes(
+        original: dict[str, Any],
+        results: list[dict[str, Any]],
+    ) -> dict[str, Any]:
+        """Apply each concurrent middleware's changes to the original dict.
+        
+        Keys a middleware added, replaced or removed are carried over;
+        when two middlewares change the same key, the later one wins.
+        """
+        merged = dict(original)
+        for result in results:
+            for key, value in result.items():
+                if key not in original or original[key] is not value:
+                    merged[key] = value
+            for key in original.keys() - result.keys():
+                merged.pop(key, None)
+        return merged
+    
     def register_hook(self, event: str, callback: Callable) -> None:
         """Register a hook callback.
         
@@ -295,14 +457,23 @@ class PluginManager:
             event: Event name
             data: Event data
         """
-        for callback in self._hooks.get(event, []):
-            try:
-                if asyncio.iscoroutinefunction(callback):
-                    await callback(data)
-                else:
-                    callback(data)
-            except Exception as e:
-                logger.error("hook_error", event=event, error=str(e))
+        callbacks = self._hooks.get(event, [])
+        if not callbacks:
+            return
+        
+        # Hooks are independent: run them concurrently, sync ones in threads
+        results = await asyncio.gather(
+            *(
+                callback(data)
+                if asyncio.iscoroutinefunction(callback)
+                else asyncio.to_thread(callback, data)
+                for callback in callbacks
+            ),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error("hook_error", hook=event, error=str(result))
     
     def list_plugins(self) -> list[dict[str, Any]]:
         """List all loaded plugins.
@@ -332,6 +503,7 @@ class PluginManager:
         """
         if plugin_name in self._plugins:
             self._plugins[plugin_name].enabled = True
+            self._invalidate()
             return True
         return False
     
@@ -346,17 +518,47 @@ class PluginManager:
         """
         if plugin_name in self._plugins:
             self._plugins[plugin_name].enabled = False
+            self._invalidate()
             return True
         return False
     
-    def _load_metadata(self, path: Path) -> PluginMetadata | None:
-        """Load plugin metadata from file."""
-        spec = importlib.util.spec_from_file_location("plugin", path)
+    def _exec(self, path: Path) -> ModuleType | None:
+        """Import a plugin file, reusing the module while the file is unchanged.
+        
+        Args:
+            path: Path to a plugin.py
+            
+        Returns:
+            The executed module, or None if it cannot be loaded
+        """
+        key = (str(path), path.stat().st_mtime_ns)
+        module = self._module_cache.get(key)
+        if module is not None:
+            return module
+        
+        name = f"noode_plugin_{path.parent.name}"
+        spec = importlib.util.spec_from_file_location(name, path)
         if not spec or not spec.loader:
             return None
         
         module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
+        # Registered before executing so dataclasses and pickling inside
+        # the plugin can resolve their own module
+        sys.modules[name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            sys.modules.pop(name, None)
+            raise
+        
+        self._module_cache[key] = module
+        return module
+    
+    def _load_metadata(self, path: Path) -> PluginMetadata | None:
+        """Load plugin metadata from file."""
+        module = self._exec(path)
+        if module is None:
+            return None
         
         if hasattr(module, "PLUGIN_METADATA"):
             data = module.PLUGIN_METADATA
@@ -373,29 +575,37 @@ class PluginManager:
         return None
     
     def _load_plugin(self, path: Path) -> Plugin | None:
-        """Load a plugin from file."""
-        spec = importlib.util.spec_from_file_location("plugin", path)
-        if not spec or not spec.loader:
+        """Load a plugin from file.
+        
+        Plugin modules name their class in a module-level ``PLUGIN_CLASS``.
+        Modules without it are scanned for a Plugin subclass once; the
+        result is stored as ``PLUGIN_CLASS`` on the cached module.
+        """
+        module = self._exec(path)
+        if module is None:
             return None
         
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
+        plugin_class = getattr(module, "PLUGIN_CLASS", None)
+        if plugin_class is None:
+            plugin_class = self._find_plugin_class(module)
+            if plugin_class is None:
+                return None
+            module.PLUGIN_CLASS = plugin_class
         
-        # Find Plugin subclass
+        return plugin_class()
+    
+    @staticmethod
+    def _find_plugin_class(module: ModuleType) -> type[Plugin] | None:
+        """Find a concrete Plugin subclass among a module's attributes."""
+        base_classes = (Plugin, AgentPlugin, ToolPlugin, MiddlewarePlugin)
         for name in dir(module):
             obj = getattr(module, name)
             if (
                 isinstance(obj, type) and
                 issubclass(obj, Plugin) and
-                obj is not Plugin and
-                obj is not AgentPlugin and
-                obj is not ToolPlugin and
-                obj is not MiddlewarePlugin
+                obj not in base_classes
             ):
-                return obj()
+                return obj
         
         return None
 
-
-# Import asyncio for emit function
-import asyncio
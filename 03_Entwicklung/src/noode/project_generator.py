@@ -292,8 +292,24 @@ volumes:
         
         return created_files
     
+    @classmethod
+    def render_noode_yaml(cls, project_name: str, template: ProjectTemplate) -> str:
+        """Render a project's noode.yaml without writing anything.
+        
+        Args:
+            project_name: Name of the project
+            template: Template the project is generated from
+            
+        Returns:
+            noode.yaml content
+        """
+        config = cls.TEMPLATES.get(template)
+        if not config:
+            raise ValueError(f"Unknown template: {template}")
+        return cls._generate_noode_config(project_name, config)
+    
+    @staticmethod
     def _generate_noode_config(
-        self,
         project_name: str,
         config: TemplateConfig,
     ) -> str:
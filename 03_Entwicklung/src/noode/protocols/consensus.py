@@ -1,5 +1,7 @@
 """Consensus building protocol for multi-agent decisions."""
 
+import functools
+from collections.abc import Iterable
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -19,7 +21,7 @@ class VoteType(Enum):
     REQUEST_CHANGES = "request_changes"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Vote:
     """A vote from an agent on a decision."""
     
@@ -31,7 +33,7 @@ class Vote:
     timestamp: datetime = field(default_factory=datetime.now)
 
 
-@dataclass
+@dataclass(slots=True)
 class ConsensusResult:
     """Result of a consensus-building process."""
     
@@ -43,6 +45,12 @@ class ConsensusResult:
     conditions: list[str] = field(default_factory=list)
 
 
+@functools.lru_cache(maxsize=256)
+def _is_security_voter(voter: str) -> bool:
+    """Whether a voter name marks a security agent (memoized per name)."""
+    return "security" in voter.casefold()
+
+
 class ConsensusBuilder:
     """Builds consensus among multiple agents.
     
@@ -56,6 +64,9 @@ class ConsensusBuilder:
         topic: What is being decided
         required_approvals: Minimum approvals needed
         allow_veto: Whether any agent can veto
+        security_voters: Voters allowed to veto, or None for any voter
+            whose name contains "security"
+        eligible_voters: Number of agents that may vote, if known
     """
     
     def __init__(
@@ -64,6 +75,8 @@ class ConsensusBuilder:
         topic: str,
         required_approvals: int = 2,
         allow_veto: bool = True,
+        security_voters: frozenset[str] | None = None,
+        eligible_voters: int | None = None,
     ) -> None:
         """Initialize consensus builder.
         
@@ -72,14 +85,67 @@ class ConsensusBuilder:
             topic: Description of what's being decided
             required_approvals: Minimum number of approvals
             allow_veto: Whether vetoes are allowed
+            security_voters: Exact names of the voters with veto power;
+                defaults to names containing "security"
+            eligible_voters: Number of agents that may vote; when given,
+                is_complete reports a decision as soon as the votes still
+                outstanding can no longer change it
         """
         self.decision_id = decision_id
         self.topic = topic
         self.required_approvals = required_approvals
         self.allow_veto = allow_veto
+        self.security_voters = security_voters
+        self.eligible_voters = eligible_voters
         self._votes: list[Vote] = []
+        self._voters: set[str] = set()
         self._vetoed = False
         self._veto_reason: str | None = None
+        # Running tallies, updated by add_vote() so get_result() is O(1)
+        self._approval_weight = 0.0
+        self._rejection_weight = 0.0
+        self._approve_count = 0
+        self._conditions: list[str] = []
+        self._rejections: list[str] = []
+        self._dissenting: list[str] = []
+        # Result of the last get_result() call, until the next vote
+        self._cached_result: ConsensusResult | None = None
+    
+    @classmethod
+    def for_roster(
+        cls,
+        decision_id: str,
+        topic: str,
+        voters: Iterable[str],
+        security_voters: Iterable[str] = (),
+        required_approvals: int = 2,
+        allow_veto: bool = True,
+    ) -> "ConsensusBuilder":
+        """Create a builder for a fixed, known set of voters.
+        
+        With the roster known up front, veto rights are exact name checks
+        and is_complete can report a decision before every vote is in.
+        
+        Args:
+            decision_id: Unique ID for this decision
+            topic: Description of what's being decided
+            voters: Every agent that will vote
+            security_voters: Agents on the roster with veto power
+            required_approvals: Minimum number of approvals
+            allow_veto: Whether vetoes are allowed
+            
+        Returns:
+            Configured consensus builder
+        """
+        roster = frozenset(voters)
+        return cls(
+            decision_id=decision_id,
+            topic=topic,
+            required_approvals=required_approvals,
+            allow_veto=allow_veto,
+            security_voters=roster.intersection(security_voters),
+            eligible_voters=len(roster),
+        )
     
     def add_vote(self, vote: Vote) -> None:
         """Add a vote to the consensus.
@@ -88,20 +154,36 @@ class ConsensusBuilder:
             vote: The vote to add
         """
         # Check for duplicate votes
-        for existing in self._votes:
-            if existing.voter == vote.voter:
-                logger.warning(
-                    "duplicate_vote",
-                    voter=vote.voter,
-                    decision=self.decision_id,
-                )
-                return
+        if vote.voter in self._voters:
+            logger.warning(
+                "duplicate_vote",
+                voter=vote.voter,
+                decision=self.decision_id,
+            )
+            return
         
         self._votes.append(vote)
+        self._voters.add(vote.voter)
+        self._cached_result = None
+        
+        if vote.vote_type == VoteType.APPROVE:
+            self._approval_weight += vote.confidence
+            self._approve_count += 1
+        elif vote.vote_type == VoteType.REJECT:
+            self._rejection_weight += vote.confidence
+            self._rejections.append(vote.reasoning)
+            self._dissenting.append(vote.reasoning)
+        elif vote.vote_type == VoteType.REQUEST_CHANGES:
+            self._conditions.extend(vote.concerns)
+            self._dissenting.append(vote.reasoning)
         
         # Check for veto
-        if self.allow_veto and vote.vote_type == VoteType.REJECT:
-            if "security" in vote.voter.lower() and vote.concerns:
+        if self.allow_veto and vote.vote_type == VoteType.REJECT and vote.concerns:
+            if (
+                vote.voter in self.security_voters
+                if self.security_voters is not None
+                else _is_security_voter(vote.voter)
+            ):
                 self._vetoed = True
                 self._veto_reason = f"Security veto: {vote.concerns[0]}"
                 logger.warning(
@@ -110,7 +192,9 @@ class ConsensusBuilder:
                     reason=self._veto_reason,
                 )
         
-        logger.info(
+        # Per-vote trace; a filtering bound logger drops it without running
+        # any processors at the default INFO level
+        logger.debug(
             "vote_recorded",
             decision=self.decision_id,
             voter=vote.voter,
@@ -118,71 +202,98 @@ class ConsensusBuilder:
             confidence=vote.confidence,
         )
     
+    def add_votes(self, votes: Iterable[Vote]) -> None:
+        """Add several votes in order, e.g. when replaying a vote log.
+        
+        Veto checks reuse the per-name memo of security voters, so a
+        voter name is only inspected once across all batches.
+        
+        Args:
+            votes: Votes to add
+        """
+        for vote in votes:
+            self.add_vote(vote)
+    
     def get_result(self) -> ConsensusResult:
         """Calculate and return the consensus result.
         
         Returns:
-            ConsensusResult with the final decision
+            ConsensusResult with the final decision; the same object is
+            returned until another vote is added
         """
+        if self._cached_result is None:
+            self._cached_result = self._build_result()
+        return self._cached_result
+    
+    def _build_result(self) -> ConsensusResult:
         if self._vetoed:
             return ConsensusResult(
                 decision_id=self.decision_id,
                 approved=False,
                 votes=self._votes,
                 final_decision=self._veto_reason or "Vetoed",
-                dissenting_opinions=[
-                    v.reasoning for v in self._votes 
-                    if v.vote_type in (VoteType.REJECT, VoteType.REQUEST_CHANGES)
-                ],
+                dissenting_opinions=list(self._dissenting),
             )
         
-        # Count weighted approvals
-        approvals = sum(
-            v.confidence for v in self._votes 
-            if v.vote_type == VoteType.APPROVE
-        )
-        
-        rejections = sum(
-            v.confidence for v in self._votes
-            if v.vote_type == VoteType.REJECT
+        # Weighted approvals must reach the threshold and outweigh rejections
+        approved = (
+            self._approval_weight >= self.required_approvals
+            and self._approval_weight > self._rejection_weight
         )
         
-        approved = approvals >= self.required_approvals and approvals > rejections
-        
-        # Collect conditions from REQUEST_CHANGES votes
-        conditions = []
-        for vote in self._votes:
-            if vote.vote_type == VoteType.REQUEST_CHANGES:
-                conditions.extend(vote.concerns)
-        
         return ConsensusResult(
             decision_id=self.decision_id,
             approved=approved,
             votes=self._votes,
             final_decision="Approved" if approved else "Rejected",
-            dissenting_opinions=[
-                v.reasoning for v in self._votes
-                if v.vote_type == VoteType.REJECT
-            ],
-            conditions=conditions,
+            dissenting_opinions=list(self._rejections),
+            conditions=list(self._conditions),
         )
     
     @property
     def is_complete(self) -> bool:
         """Check if enough votes have been collected.
         
+        Without ``eligible_voters`` this counts approvals. With it, the
+        weighted outcome is checked against the worst case of every
+        outstanding voter rejecting (or vetoing) with full confidence.
+        
         Returns:
-            True if we have enough votes to decide
+            True if the decision was vetoed or can no longer change
         """
         if self._vetoed:
             return True
-        return len(self._votes) >= self.required_approvals
+        if self.eligible_voters is None:
+            return self._approve_count >= self.required_approvals
+        
+        remaining = max(0, self.eligible_voters - len(self._votes))
+        if remaining == 0:
+            return True
+        # Rejected for certain: even full-confidence approvals fall short
+        if self._approval_weight + remaining < self.required_approvals:
+            return True
+        # Approved for certain: no outstanding rejections can outweigh it
+        if self._can_still_veto():
+            return False
+        return (
+            self._approval_weight >= self.required_approvals
+            and self._approval_weight > self._rejection_weight + remaining
+        )
+    
+    def _can_still_veto(self) -> bool:
+        """Whether a voter with veto power may still cast a vote."""
+        if not self.allow_veto:
+            return False
+        if self.security_voters is None:
+            # Any outstanding voter might be a security agent
+            return True
+        return not self.security_voters <= self._voters
     
     @property
     def pending_count(self) -> int:
         """Number of votes still needed.
         
         Returns:
-            Count of additional votes needed
+            Count of additional approvals needed
         """
-        return max(0, self.required_approvals - len(self._votes))
+        return max(0, self.required_approvals - self._approve_count)
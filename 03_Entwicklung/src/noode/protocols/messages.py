@@ -1,5 +1,6 @@
 """Message types and structures for inter-agent communication."""
 
+import uuid
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -28,7 +29,12 @@ class Priority(Enum):
     CRITICAL = 4
 
 
-@dataclass
+def _generate_id() -> str:
+    """Generate a unique message ID."""
+    return uuid.uuid4().hex[:8]
+
+
+@dataclass(slots=True)
 class AgentMessage:
     """A message between agents.
     
@@ -53,7 +59,7 @@ class AgentMessage:
     priority: Priority = Priority.NORMAL
     correlation_id: str | None = None
     in_reply_to: str | None = None
-    message_id: str = field(default_factory=lambda: _generate_id())
+    message_id: str = field(default_factory=_generate_id)
     
     def create_reply(
         self,
@@ -84,7 +90,7 @@ class AgentMessage:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class TaskRequest:
     """Request for an agent to perform a task."""
     
@@ -96,7 +102,7 @@ class TaskRequest:
     dependencies: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class TaskResult:
     """Result of a completed task."""
     
@@ -108,7 +114,7 @@ class TaskResult:
     metrics: dict[str, float] = field(default_factory=dict)
 
 
-@dataclass 
+@dataclass(slots=True)
 class ReviewRequest:
     """Request for peer review."""
     
@@ -121,7 +127,7 @@ class ReviewRequest:
     reviewers_needed: int = 2
 
 
-@dataclass
+@dataclass(slots=True)
 class ReviewResult:
     """Result of a peer review."""
     
@@ -132,8 +138,3 @@ class ReviewResult:
     required_changes: list[str] = field(default_factory=list)
     security_concerns: list[str] = field(default_factory=list)
 
-
-def _generate_id() -> str:
-    """Generate a unique message ID."""
-    import uuid
-    return str(uuid.uuid4())[:8]
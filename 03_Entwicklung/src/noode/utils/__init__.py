@@ -1,6 +1,7 @@
 """Utility modules for Noode."""
 
 from noode.utils.logging import setup_logging
+from noode.utils.metrics import MetricsBatch
 from noode.utils.validation import (
     sanitize_for_prompt,
     validate_code_input,
@@ -10,6 +11,7 @@ from noode.utils.validation import (
 
 __all__ = [
     "setup_logging",
+    "MetricsBatch",
     "sanitize_for_prompt",
     "validate_code_input",
     "validate_api_key",
@@ -16,10 +16,12 @@ def setup_logging(
         level: Log level (DEBUG, INFO, WARNING, ERROR)
         json_format: If True, output JSON logs (for production)
     """
+    level_no = getattr(logging, level.upper())
+    
     logging.basicConfig(
         format="%(message)s",
         stream=sys.stdout,
-        level=getattr(logging, level.upper()),
+        level=level_no,
     )
     
     if json_format:
@@ -31,9 +33,7 @@ def setup_logging(
                 structlog.processors.TimeStamper(fmt="iso"),
                 structlog.processors.JSONRenderer(),
             ],
-            wrapper_class=structlog.make_filtering_bound_logger(
-                getattr(logging, level.upper())
-            ),
+            wrapper_class=structlog.make_filtering_bound_logger(level_no),
             context_class=dict,
             logger_factory=structlog.PrintLoggerFactory(),
             cache_logger_on_first_use=True,
@@ -47,9 +47,7 @@ def setup_logging(
                 structlog.processors.TimeStamper(fmt="%H:%M:%S"),
                 structlog.dev.ConsoleRenderer(colors=True),
             ],
-            wrapper_class=structlog.make_filtering_bound_logger(
-                getattr(logging, level.upper())
-            ),
+            wrapper_class=structlog.make_filtering_bound_logger(level_no),
             context_class=dict,
             logger_factory=structlog.PrintLoggerFactory(),
             cache_logger_on_first_use=True,
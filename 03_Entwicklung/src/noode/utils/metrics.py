@@ -0,0 +1,65 @@
+"""Aggregation of numeric task metrics."""
+
+from collections import defaultdict
+from collections.abc import Iterable
+
+import numpy as np
+
+from noode.protocols.messages import TaskResult
+
+
+class MetricsBatch:
+    """Column store for the ``metrics`` dicts of many task results.
+    
+    Each metric name gets its own column of values, so aggregates are one
+    NumPy reduction instead of a Python loop over result dicts. Results
+    that lack a metric simply do not contribute to its column.
+    """
+    
+    def __init__(self) -> None:
+        self._cols: defaultdict[str, list[float]] = defaultdict(list)
+    
+    @classmethod
+    def from_results(cls, results: Iterable[TaskResult]) -> "MetricsBatch":
+        """Collect the metrics of several task results.
+        
+        Args:
+            results: Task results to aggregate
+        
+        Returns:
+            Batch holding every result's metrics
+        """
+        batch = cls()
+        for result in results:
+            batch.add(result.metrics)
+        return batch
+    
+    def add(self, metrics: dict[str, float]) -> None:
+        """Append one result's metrics.
+        
+        Args:
+            metrics: Metric name -> value
+        """
+        for key, value in metrics.items():
+            self._cols[key].append(value)
+    
+    def keys(self) -> list[str]:
+        """Names of the metrics seen so far."""
+        return list(self._cols)
+    
+    def count(self, key: str) -> int:
+        """Number of values recorded for a metric."""
+        return len(self._cols.get(key, ()))
+    
+    def column(self, key: str) -> np.ndarray:
+        """Values of one metric as a float64 array (empty if unseen)."""
+        return np.asarray(self._cols.get(key, ()), dtype=np.float64)
+    
+    def sum(self, key: str) -> float:
+        """Sum of a metric over all results that report it."""
+        return float(self.column(key).sum())
+    
+    def mean(self, key: str) -> float:
+        """Mean of a metric over all results that report it (NaN if unseen)."""
+        column = self.column(key)
+        return float(column.mean()) if column.size else float("nan")
@@ -3,6 +3,57 @@
 import html
 import re
 
+# Null bytes and control characters, except common whitespace
+_CONTROL_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]')
+
+# Prompt injection markers that try to override system prompts, as one
+# case-insensitive alternation so the text is scanned once
+_INJECTION_RE = re.compile(
+    '|'.join([
+        r'ignore previous instructions',
+        r'ignore all previous',
+        r'system prompt',
+        r'you are now',
+        r'you will now',
+        r'act as',
+        r'pretend to be',
+        r'new instructions',
+        r'override',
+        r'<system>',
+        r'</system>',
+        r'```system',
+        r'```user',
+        r'```assistant',
+    ]),
+    re.IGNORECASE,
+)
+
+# Either of the above; clean text needs only this one scan
+_UNSAFE_RE = re.compile(f'{_CONTROL_RE.pattern}|{_INJECTION_RE.pattern}', re.IGNORECASE)
+
+# Anything sanitize_for_prompt would change: HTML-special characters too
+_SUSPICIOUS_RE = re.compile(f'[<>&"\']|{_UNSAFE_RE.pattern}', re.IGNORECASE)
+
+# Dangerous code patterns in reporting order, plus their union so clean
+# code is scanned once
+_DANGEROUS_PATTERNS = [
+    (re.compile(pattern), message)
+    for pattern, message in [
+        (r'eval\s*\(', "Use of eval() is dangerous"),
+        (r'exec\s*\(', "Use of exec() is dangerous"),
+        (r'__import__\s*\(', "Dynamic imports are dangerous"),
+        (r'subprocess\.call\s*\([^)]*shell\s*=\s*True', "Shell=True is dangerous"),
+        (r'os\.system\s*\(', "os.system() is dangerous"),
+    ]
+]
+_DANGEROUS_ANY = re.compile('|'.join(p.pattern for p, _ in _DANGEROUS_PATTERNS))
+
+# Matches the same characters as str.isspace()
+_WHITESPACE_RE = re.compile(r'\s')
+
+# Path separators become underscores, null bytes are dropped
+_FILENAME_TABLE = str.maketrans({'/': '_', '\\': '_', '\x00': ''})
+
 
 def sanitize_for_prompt(text: str) -> str:
     """Sanitize user input for use in LLM prompts.
@@ -26,38 +77,23 @@ def sanitize_for_prompt(text: str) -> str:
     max_length = 10000
     text = text[:max_length]
     
+    # Most input is plain text that every step below would leave as is
+    if _SUSPICIOUS_RE.search(text) is None:
+        return text
+    
+    # Escaping cannot create or remove a marker match, so one scan of the
+    # raw text decides whether the rewrites are needed
+    if _UNSAFE_RE.search(text) is None:
+        return html.escape(text)
+    
     # Escape HTML entities
     text = html.escape(text)
     
     # Remove null bytes and control characters (except common whitespace)
-    text = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]', '', text)
-    
-    # Remove potential prompt injection markers
-    # These patterns try to override system prompts
-    injection_patterns = [
-        r'ignore previous instructions',
-        r'ignore all previous',
-        r'system prompt',
-        r'you are now',
-        r'you will now',
-        r'act as',
-        r'pretend to be',
-        r'new instructions',
-        r'override',
-        r'<system>',
-        r'</system>',
-        r'```system',
-        r'```user',
-        r'```assistant',
-    ]
-    
-    text_lower = text.lower()
-    for pattern in injection_patterns:
-        if re.search(pattern, text_lower):
-            # Replace with safe alternative
-            text = re.sub(pattern, '[REDACTED]', text, flags=re.IGNORECASE)
+    text = _CONTROL_RE.sub('', text)
     
-    return text
+    # Replace potential prompt injection markers with a safe alternative
+    return _INJECTION_RE.sub('[REDACTED]', text)
 
 
 def validate_code_input(code: str, max_lines: int = 1000) -> tuple[bool, str]:
@@ -73,21 +109,16 @@ def validate_code_input(code: str, max_lines: int = 1000) -> tuple[bool, str]:
     if not code:
         return False, "Code cannot be empty"
     
-    lines = code.split('\n')
-    if len(lines) > max_lines:
+    if code.count('\n') + 1 > max_lines:
         return False, f"Code exceeds maximum of {max_lines} lines"
     
     # Check for dangerous patterns
-    dangerous_patterns = [
-        (r'eval\s*\(', "Use of eval() is dangerous"),
-        (r'exec\s*\(', "Use of exec() is dangerous"),
-        (r'__import__\s*\(', "Dynamic imports are dangerous"),
-        (r'subprocess\.call\s*\([^)]*shell\s*=\s*True', "Shell=True is dangerous"),
-        (r'os\.system\s*\(', "os.system() is dangerous"),
-    ]
+    if _DANGEROUS_ANY.search(code) is None:
+        return True, ""
     
-    for pattern, message in dangerous_patterns:
-        if re.search(pattern, code):
+    # Report the first pattern in list order, not the first in the code
+    for pattern, message in _DANGEROUS_PATTERNS:
+        if pattern.search(code):
             return False, message
     
     return True, ""
@@ -113,7 +144,7 @@ def validate_api_key(key: str | None) -> bool:
         return False
     
     # Should not contain whitespace
-    if any(c.isspace() for c in key):
+    if _WHITESPACE_RE.search(key):
         return False
     
     return True
@@ -131,13 +162,8 @@ def sanitize_filename(filename: str) -> str:
     if not filename:
         return "unnamed"
     
-    # Remove path components
-    filename = filename.replace('..', '_')
-    filename = filename.replace('/', '_')
-    filename = filename.replace('\\', '_')
-    
-    # Remove null bytes
-    filename = filename.replace('\x00', '')
+    # Remove path components and null bytes
+    filename = filename.replace('..', '_').translate(_FILENAME_TABLE)
     
     # Limit length
     max_len = 255
@@ -0,0 +1,15 @@
+"""Shared test fixtures."""
+
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def workdir(tmp_path_factory: pytest.TempPathFactory, request: pytest.FixtureRequest) -> Path:
+    """Per-test directory under the session's temporary root.
+    
+    The root is removed once by pytest, instead of each test creating
+    and deleting its own temporary directory.
+    """
+    return tmp_path_factory.mktemp(request.node.name)
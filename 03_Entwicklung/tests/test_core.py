@@ -73,7 +73,8 @@ class TestAgentMessage:
         assert msg.receiver == "agent_b"
         assert msg.message_type == MessageType.REQUEST
         assert msg.priority == Priority.NORMAL
-        assert msg.message_id is not None
+        assert len(msg.message_id) == 8
+        int(msg.message_id, 16)
     
     def test_create_reply(self) -> None:
         """Test creating a reply message."""
@@ -153,6 +154,52 @@ class TestConsensusBuilder:
         assert result.approved is False
         assert "veto" in result.final_decision.lower()
     
+    def test_security_voters_restrict_veto(self) -> None:
+        """Test that only the configured security voters can veto."""
+        consensus = ConsensusBuilder(
+            decision_id="test_2b",
+            topic="Change",
+            required_approvals=1,
+            security_voters=frozenset({"sec_bot"}),
+        )
+        
+        consensus.add_vote(Vote(
+            voter="security_agent",
+            vote_type=VoteType.REJECT,
+            confidence=0.1,
+            reasoning="Unsure",
+            concerns=["Minor"],
+        ))
+        assert consensus.is_complete is False
+        
+        consensus.add_vote(Vote(
+            voter="sec_bot",
+            vote_type=VoteType.REJECT,
+            confidence=0.9,
+            reasoning="Leaks secrets",
+            concerns=["Hardcoded token"],
+        ))
+        assert consensus.get_result().final_decision == "Security veto: Hardcoded token"
+    
+    def test_add_votes_batch(self) -> None:
+        """Test adding a batch of votes, including a duplicate and a veto."""
+        consensus = ConsensusBuilder(decision_id="test_3b", topic="Replay")
+        
+        consensus.add_votes([
+            Vote(voter="agent_a", vote_type=VoteType.APPROVE, confidence=1.0, reasoning="ok"),
+            Vote(voter="agent_a", vote_type=VoteType.REJECT, confidence=1.0, reasoning="dup"),
+            Vote(
+                voter="Security_Reviewer",
+                vote_type=VoteType.REJECT,
+                confidence=0.9,
+                reasoning="unsafe",
+                concerns=["XSS"],
+            ),
+        ])
+        
+        assert len(consensus._votes) == 2
+        assert consensus.get_result().final_decision == "Security veto: XSS"
+    
     def test_duplicate_vote_ignored(self) -> None:
         """Test that duplicate votes are ignored."""
         consensus = ConsensusBuilder(
@@ -196,3 +243,112 @@ class TestConsensusBuilder:
         ))
         
         assert consensus.pending_count == 2
+    
+    def test_result_tallies(self) -> None:
+        """Test conditions, dissent and completion across vote types."""
+        consensus = ConsensusBuilder(
+            decision_id="test_5",
+            topic="Test",
+            required_approvals=1,
+            allow_veto=False,
+        )
+        
+        consensus.add_vote(Vote(
+            voter="agent_a",
+            vote_type=VoteType.REJECT,
+            confidence=0.4,
+            reasoning="Too risky",
+        ))
+        consensus.add_vote(Vote(
+            voter="agent_b",
+            vote_type=VoteType.REQUEST_CHANGES,
+            confidence=0.8,
+            reasoning="Needs tests",
+            concerns=["Add tests"],
+        ))
+        assert consensus.is_complete is False
+        assert consensus.get_result().approved is False
+        
+        consensus.add_vote(Vote(
+            voter="agent_c",
+            vote_type=VoteType.APPROVE,
+            confidence=1.0,
+            reasoning="Fine",
+        ))
+        
+        result = consensus.get_result()
+        assert consensus.get_result() is result
+        assert consensus.is_complete is True
+        assert result.approved is True
+        assert result.dissenting_opinions == ["Too risky"]
+        assert result.conditions == ["Add tests"]
+    
+    def test_early_decision_with_eligible_voters(self) -> None:
+        """Test is_complete once outstanding votes cannot flip the outcome."""
+        rejected = ConsensusBuilder(
+            decision_id="test_6",
+            topic="Test",
+            required_approvals=3,
+            eligible_voters=3,
+        )
+        rejected.add_vote(Vote(
+            voter="agent_a",
+            vote_type=VoteType.REJECT,
+            confidence=0.7,
+            reasoning="No",
+        ))
+        assert rejected.is_complete is True
+        assert rejected.get_result().approved is False
+        
+        approved = ConsensusBuilder(
+            decision_id="test_7",
+            topic="Test",
+            required_approvals=2,
+            security_voters=frozenset({"security_agent"}),
+            eligible_voters=5,
+        )
+        for voter in ("security_agent", "agent_a", "agent_b"):
+            assert approved.is_complete is False
+            approved.add_vote(Vote(
+                voter=voter,
+                vote_type=VoteType.APPROVE,
+                confidence=1.0,
+                reasoning="Yes",
+            ))
+        assert approved.is_complete is True
+        assert approved.get_result().approved is True
+    
+    def test_for_roster(self) -> None:
+        """Test a roster builder decides once the veto holder has approved."""
+        consensus = ConsensusBuilder.for_roster(
+            decision_id="test_8",
+            topic="Deploy",
+            voters=["security", "backend", "frontend", "testing"],
+            security_voters={"security"},
+            required_approvals=1,
+        )
+        
+        consensus.add_vote(Vote(
+            voter="backend",
+            vote_type=VoteType.APPROVE,
+            confidence=1.0,
+            reasoning="Ready",
+        ))
+        assert consensus.is_complete is False
+        
+        consensus.add_vote(Vote(
+            voter="security",
+            vote_type=VoteType.APPROVE,
+            confidence=1.0,
+            reasoning="Safe",
+        ))
+        assert consensus.is_complete is False
+        
+        consensus.add_vote(Vote(
+            voter="frontend",
+            vote_type=VoteType.APPROVE,
+            confidence=1.0,
+            reasoning="Ready",
+        ))
+        assert consensus.is_complete is True
+        assert consensus.get_result().approved is True
@@ -0,0 +1,417 @@
+"""Tests for the knowledge store."""
+
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import numpy as np
+import pytest
+
+import noode.knowledge.store as store_module
+from noode.knowledge.embeddings import EmbeddingService, _get_service
+from noode.knowledge.store import KnowledgeStore, Document, RAGService, _quantize
+
+
+@pytest.fixture
+def memory_store(monkeypatch: pytest.MonkeyPatch) -> KnowledgeStore:
+    """Knowledge store forced onto the in-memory fallback."""
+    monkeypatch.setattr(store_module, "QDRANT_AVAILABLE", False)
+    return KnowledgeStore()
+
+
+class FakeQdrantClient:
+    """In-process stand-in for QdrantClient keeping points in a dict."""
+    
+    def __init__(self) -> None:
+        self.points: dict[str, Any] = {}
+        self.collections: list[str] = []
+        self.indexes: set[str] = set()
+        self.scroll_calls = 0
+        self.fail_upsert = False
+    
+    def get_collections(self) -> SimpleNamespace:
+        return SimpleNamespace(collections=[SimpleNamespace(name=n) for n in self.collections])
+    
+    def create_collection(self, collection_name: str, **kwargs: Any) -> None:
+        self.collections.append(collection_name)
+    
+    def create_payload_index(self, collection_name: str, field_name: str, **kwargs: Any) -> None:
+        self.indexes.add(field_name)
+    
+    def upsert(self, collection_name: str, points: list[Any], **kwargs: Any) -> None:
+        if self.fail_upsert:
+            raise RuntimeError("qdrant unavailable")
+        for point in points:
+            self.points[str(point.id)] = point
+    
+    def scroll(self, collection_name: str, limit: int, offset: int | None = None,
+               **kwargs: Any) -> Any:
+        self.scroll_calls += 1
+        start = offset or 0
+        page = [
+            SimpleNamespace(id=point.id, payload={"content_hash": point.payload["content_hash"]})
+            for point in list(self.points.values())[start:start + limit]
+        ]
+        next_offset = start + limit if start + limit < len(self.points) else None
+        return page, next_offset
+    
+    def query_points(self, collection_name: str, query: list[float], limit: int,
+                     **kwargs: Any) -> SimpleNamespace:
+        ranked = sorted(
+            self.points.values(), key=lambda point: -float(np.dot(point.vector, query))
+        )
+        return SimpleNamespace(points=[
+            SimpleNamespace(id=point.id, payload=point.payload, vector=None)
+            for point in ranked[:limit]
+        ])
+    
+    def delete(self, collection_name: str, points_selector: list[str]) -> None:
+        for doc_id in points_selector:
+            self.points.pop(doc_id, None)
+
+
+@pytest.fixture
+def qdrant(monkeypatch: pytest.MonkeyPatch) -> FakeQdrantClient:
+    """Fake Qdrant server shared by every KnowledgeStore built in the test."""
+    pytest.importorskip("qdrant_client")
+    client = FakeQdrantClient()
+    monkeypatch.setattr(store_module, "QDRANT_AVAILABLE", True)
+    monkeypatch.setattr(store_module, "QdrantClient", lambda **kwargs: client)
+    monkeypatch.setattr(store_module, "AsyncQdrantClient", lambda **kwargs: None)
+    return client
+
+
+class TestQdrantKnowledgeStore:
+    """Tests for KnowledgeStore against a mocked Qdrant client."""
+    
+    def test_duplicates_found_after_restart(
+        self, qdrant: FakeQdrantClient, tmp_path: Path
+    ) -> None:
+        """Test stored hashes are loaded by one scroll, then looked up locally."""
+        store = KnowledgeStore(storage_path=tmp_path)
+        first, second = store.add_documents([Document("same text"), Document("other")])
+        
+        scrolls = qdrant.scroll_calls
+        restarted = KnowledgeStore(storage_path=tmp_path)
+        assert qdrant.scroll_calls == scrolls
+        
+        assert restarted.add_document(Document("same text")) == first
+        ids = restarted.add_documents([Document("other"), Document("new")])
+        assert ids[0] == second
+        assert len(qdrant.points) == 3
+        assert qdrant.scroll_calls == scrolls + 1
+        
+        paged = KnowledgeStore(storage_path=tmp_path)
+        paged._load_hashes(page_size=2)
+        assert paged._content_hashes == restarted._content_hashes
+        assert qdrant.scroll_calls == scrolls + 3
+    
+    def test_content_rehydrated_from_side_store(
+        self, qdrant: FakeQdrantClient, tmp_path: Path
+    ) -> None:
+        """Test content kept out of the payload is restored on search."""
+        store = KnowledgeStore(storage_path=tmp_path)
+        doc_id = store.add_document(Document("kept in sqlite"))
+        
+        assert "content" not in qdrant.points[doc_id].payload
+        hit = store.search("kept in sqlite", top_k=1)[0]
+        assert hit.id == doc_id
+        assert hit.content == "kept in sqlite"
+    
+    # Local mode searches exhaustively and warns that search_params are ignored
+    @pytest.mark.filterwarnings("ignore:Local mode performs exact")
+    async def test_async_search_against_local_qdrant(
+        self, qdrant: FakeQdrantClient, tmp_path: Path
+    ) -> None:
+        """Test async search runs against a real (in-process) AsyncQdrantClient."""
+        from qdrant_client import AsyncQdrantClient
+        from qdrant_client.models import Distance, VectorParams
+        
+        store = KnowledgeStore(storage_path=tmp_path)
+        doc_id = store.add_document(Document("found asynchronously", doc_type="note"))
+        store.add_document(Document("def unrelated(): pass", doc_type="code"))
+        
+        client = AsyncQdrantClient(location=":memory:")
+        await client.create_collection(
+            store.collection_name,
+            vectors_config=VectorParams(
+                size=store.embedding_service.embedding_dimension, distance=Distance.COSINE
+            ),
+        )
+        await client.upsert(store.collection_name, points=list(qdrant.points.values()))
+        store._async_client = client
+        
+        hits = await store.search_async("found asynchronously", top_k=1, doc_type="note")
+        assert [hit.id for hit in hits] == [doc_id]
+        assert hits[0].content == "found asynchronously"
+        
+        rag = RAGService(store)
+        assert "found asynchronously" in await rag.retrieve_context_async("found asynchronously")
+    
+    def test_failed_add_is_not_remembered(
+        self, qdrant: FakeQdrantClient, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test failed embedding or upsert leaves no phantom duplicate IDs."""
+        store = KnowledgeStore(storage_path=tmp_path)
+        
+        def fail(texts: list[str]) -> np.ndarray:
+            raise RuntimeError("model crashed")
+        
+        with monkeypatch.context() as patch:
+            patch.setattr(store.embedding_service, "embed_batch", fail)
+            with pytest.raises(RuntimeError):
+                store.add_documents([Document("retry me"), Document("and me")])
+        
+        qdrant.fail_upsert = True
+        with pytest.raises(RuntimeError):
+            store.add_document(Document("retry me"))
+        qdrant.fail_upsert = False
+        
+        retry = [Document("retry me"), Document("and me")]
+        assert store.add_documents(retry) == [doc.id for doc in retry]
+        assert set(qdrant.points) == {doc.id for doc in retry}
+
+
+class TestMemoryKnowledgeStore:
+    """Tests for the in-memory KnowledgeStore fallback."""
+    
+    def test_search_finds_exact_match(self, memory_store: KnowledgeStore) -> None:
+        """Test that a document ranks first for its own content."""
+        for i in range(10):
+            memory_store.add_document(Document(f"document number {i}"))
+        
+        results = memory_store.search("document number 7", top_k=3)
+        
+        assert len(results) == 3
+        assert results[0].content == "document number 7"
+    
+    def test_search_filters_doc_type(self, memory_store: KnowledgeStore) -> None:
+        """Test doc_type filtering in search."""
+        memory_store.add_document(Document("def foo(): pass", doc_type="code"))
+        memory_store.add_document(Document("some prose", doc_type="text"))
+        memory_store.add_document(Document("class Bar: pass", doc_type="code"))
+        
+        results = memory_store.search("def foo(): pass", top_k=5, doc_type="code")
+        
+        assert len(results) == 2
+        assert all(doc.doc_type == "code" for doc in results)
+        assert results[0].content == "def foo(): pass"
+    
+    def test_add_documents(self, memory_store: KnowledgeStore) -> None:
+        """Test batch insertion keeps IDs and embeddings aligned."""
+        documents = [Document(f"batch doc {i}") for i in range(20)]
+        
+        ids = memory_store.add_documents(documents)
+        
+        assert ids == [doc.id for doc in documents]
+        assert memory_store.get_stats()["total_documents"] == 20
+        assert memory_store.search("batch doc 13", top_k=1)[0].id == ids[13]
+    
+    def test_hnsw_search(
+        self, memory_store: KnowledgeStore, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test approximate search once the store crosses the HNSW threshold."""
+        pytest.importorskip("hnswlib")
+        monkeypatch.setattr(KnowledgeStore, "HNSW_MIN_DOCUMENTS", 50)
+        ids = memory_store.add_documents(
+            [Document(f"hnsw doc {i}", doc_type="code" if i % 2 else "text")
+             for i in range(100)]
+        )
+        
+        assert memory_store.search("hnsw doc 42", top_k=3)[0].id == ids[42]
+        assert memory_store._hnsw is not None
+        
+        memory_store.delete_document(ids[42])
+        new_id = memory_store.add_document(Document("freshly added"))
+        
+        results = memory_store.search("hnsw doc 42", top_k=5)
+        assert ids[42] not in {doc.id for doc in results}
+        assert memory_store.search("freshly added", top_k=1)[0].id == new_id
+        
+        results = memory_store.search("hnsw doc 43", top_k=3, doc_type="code")
+        assert results[0].id == ids[43]
+        assert all(doc.doc_type == "code" for doc in results)
+    
+    def test_search_by_vector(self, memory_store: KnowledgeStore) -> None:
+        """Test searching with a precomputed query embedding."""
+        doc_id = memory_store.add_document(Document("vector lookup"))
+        memory_store.add_document(Document("something else"))
+        
+        vector = memory_store.embedding_service.embed_query("vector lookup")
+        
+        assert memory_store.search_by_vector(vector, top_k=1)[0].id == doc_id
+        assert memory_store.embedding_service.embed_query("vector lookup") is vector
+    
+    def test_rag_retrieve_context(self, memory_store: KnowledgeStore) -> None:
+        """Test that RAG context lists retrieved documents."""
+        memory_store.add_document(Document("retrieved content", doc_type="markdown"))
+        
+        context = RAGService(memory_store).retrieve_context("retrieved content", top_k=1)
+        
+        assert context.startswith("Document 1 [markdown]:\nretrieved content\n")
+    
+    def test_add_document_keeps_embedding(
+        self, memory_store: KnowledgeStore, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that pre-embedded documents are not embedded again."""
+        embedding = memory_store.embedding_service.embed("precomputed")
+        
+        def fail(text: str) -> np.ndarray:
+            raise AssertionError("document was re-embedded")
+        
+        monkeypatch.setattr(memory_store.embedding_service, "embed", fail)
+        doc = Document("precomputed", embedding=embedding)
+        memory_store.add_document(doc)
+        memory_store.add_documents([Document("batch", embedding=embedding)])
+        
+        assert doc.embedding is embedding
+    
+    def test_rag_format_context(self) -> None:
+        """Test the numbered context layout for several documents."""
+        context = RAGService._format_context(
+            [Document("first", doc_type="code"), Document("second")]
+        )
+        
+        assert context == "Document 1 [code]:\nfirst\n\nDocument 2 [text]:\nsecond\n"
+        assert RAGService._format_context([]) == ""
+    
+    async def test_rag_retrieve_context_async(self, memory_store: KnowledgeStore) -> None:
+        """Test async retrieval across several document types."""
+        memory_store.add_document(Document("shared words", doc_type="code"))
+        memory_store.add_document(Document("shared words", doc_type="markdown"))
+        memory_store.add_document(Document("shared words", doc_type="text"))
+        
+        context = await RAGService(memory_store).retrieve_context_async(
+            "shared words", top_k=1, doc_types=["markdown", "code"]
+        )
+        
+        assert context.index("[markdown]") < context.index("[code]")
+        assert "[text]" not in context
+    
+    def test_duplicate_content_is_not_re_added(self, memory_store: KnowledgeStore) -> None:
+        """Test content-hash deduplication on single and batch adds."""
+        first = memory_store.add_document(Document("same file contents"))
+        
+        assert memory_store.add_document(Document("same file contents")) == first
+        ids = memory_store.add_documents(
+            [Document("same file contents"), Document("new"), Document("new")]
+        )
+        assert ids[0] == first
+        assert ids[1] == ids[2]
+        assert memory_store.get_stats()["total_documents"] == 2
+        
+        memory_store.delete_document(first)
+        assert memory_store.add_document(Document("same file contents")) != first
+    
+    def test_delete_document(self, memory_store: KnowledgeStore) -> None:
+        """Test that deleted documents no longer appear in search."""
+        ids = [memory_store.add_document(Document(f"doc {i}")) for i in range(5)]
+        
+        assert memory_store.delete_document(ids[1]) is True
+        assert memory_store.delete_document(ids[1]) is False
+        
+        results = memory_store.search("doc 4", top_k=10)
+        assert len(results) == 4
+        assert results[0].id == ids[4]
+        assert ids[1] not in {doc.id for doc in results}
+    
+    def test_content_side_store(self, memory_store: KnowledgeStore, tmp_path: Path) -> None:
+        """Test content rehydration from the local SQLite side store."""
+        memory_store.storage_path = tmp_path
+        memory_store._open_content_db()
+        doc = Document("stored outside qdrant")
+        memory_store._store_content([doc])
+        
+        hits = [Document(None, doc_id=doc.id), Document(None, doc_id="unknown")]
+        memory_store._load_content(hits)
+        
+        assert hits[0].content == "stored outside qdrant"
+        assert hits[1].content == ""
+    
+    def test_get_stats(self, memory_store: KnowledgeStore) -> None:
+        """Test memory store statistics."""
+        memory_store.add_document(Document("a", doc_type="code"))
+        memory_store.add_document(Document("b"))
+        
+        stats = memory_store.get_stats()
+        
+        assert stats["total_documents"] == 2
+        assert stats["document_types"] == {"code": 1, "text": 1}
+        assert stats["storage_type"] == "memory"
+
+
+class TestDocument:
+    """Tests for Document."""
+    
+    def test_to_dict_timestamps(self) -> None:
+        """Test integer timestamps with optional ISO formatting."""
+        doc = Document("content", doc_type="code")
+        
+        data = doc.to_dict()
+        assert isinstance(data["created_at_ns"], int)
+        assert "created_at" not in data
+        
+        iso = doc.to_dict(iso=True)
+        assert iso["created_at"] == doc.created_at.isoformat()
+        assert "created_at_ns" not in iso
+
+
+class TestQuantize:
+    """Tests for int8 embedding quantization."""
+    
+    def test_round_trip_preserves_cosine(self) -> None:
+        """Test that dequantized vectors stay close to the originals."""
+        rng = np.random.default_rng(0)
+        vector = rng.standard_normal(384).astype(np.float32)
+        vector /= np.linalg.norm(vector)
+        
+        quantized, scale = _quantize(vector)
+        restored = quantized * scale
+        
+        assert quantized.dtype == np.int8
+        assert float(restored @ vector) / np.linalg.norm(restored) > 0.999
+
+
+class TestEmbeddingService:
+    """Tests for EmbeddingService."""
+    
+    def test_embed_returns_float32(self) -> None:
+        """Test that embeddings are float32 arrays, including empty text."""
+        service = EmbeddingService()
+        
+        for text in ("hello world", ""):
+            embedding = service.embed(text)
+            assert isinstance(embedding, np.ndarray)
+            assert embedding.dtype == np.float32
+            assert embedding.shape == (service.embedding_dimension,)
+    
+    def test_get_service_is_shared(self) -> None:
+        """Test that the default model name and None share one service."""
+        assert _get_service() is _get_service(EmbeddingService.DEFAULT_MODEL)
+    
+    def test_embeddings_are_normalized(self) -> None:
+        """Test that embeddings are unit length so similarity is a dot product."""
+        service = EmbeddingService()
+        
+        assert np.linalg.norm(service.embed("normalize me")) == pytest.approx(1.0, abs=1e-5)
+        assert service.similarity("same text", "same text") == pytest.approx(1.0, abs=1e-5)
+        assert service.similarity("", "some text") == 0.0
+    
+    def test_model_loads_lazily(self) -> None:
+        """Test that known model dimensions are reported without loading."""
+        service = EmbeddingService("all-mpnet-base-v2")
+        
+        assert service.embedding_dimension == 768
+        assert service._model_loaded is False
+    
+    def test_embed_batch_returns_matrix(self) -> None:
+        """Test that batch embeddings come back as one aligned 2-D array."""
+        service = EmbeddingService()
+        
+        embeddings = service.embed_batch(["first", "", "third"])
+        
+        assert embeddings.shape == (3, service.embedding_dimension)
+        assert embeddings.dtype == np.float32
+        assert not embeddings[1].any()
+        np.testing.assert_allclose(embeddings[2], service.embed("third"))
+        assert service.embed_batch([]).shape == (0, service.embedding_dimension)
@@ -0,0 +1,616 @@
+"""Tests for the direct LLM provider integration."""
+
+import asyncio
+import gc
+import json
+import os
+import weakref
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Generator, List, Tuple
+
+import httpx
+import numpy as np
+import pytest
+
+from noode import llm_providers
+from noode.llm_providers import (
+    GoogleProvider,
+    HttpSettings,
+    LLMManager,
+    LLMMessage,
+    LLMProvider,
+    LLMResponse,
+    OpenAIProvider,
+    OpenRouterProvider,
+    ProviderConfig,
+)
+from noode.llm_providers.cache import LLMCache, SemanticCache
+from noode.llm_providers.models import get_default_model, validate_model
+
+
+@pytest.fixture(autouse=True)
+def isolated_home(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Keep provider config and keys out of the real home directory."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    for name in ("OPENAI", "ANTHROPIC", "GOOGLE", "OPENROUTER"):
+        monkeypatch.delenv(f"NOODE_{name}_API_KEY", raising=False)
+    return tmp_path
+
+
+class EchoProvider(LLMProvider):
+    """Provider that echoes the last message after a short delay."""
+    
+    name = "echo"
+    
+    def __init__(self, config: ProviderConfig):
+        super().__init__(config)
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+    
+    def is_available(self) -> bool:
+        return True
+    
+    def chat(self, messages: List[LLMMessage], **kwargs) -> LLMResponse:
+        self.calls += 1
+        return LLMResponse(content=messages[-1].content, model="echo", provider="echo")
+    
+    async def achat(self, messages: List[LLMMessage], **kwargs) -> LLMResponse:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return self.chat(messages, **kwargs)
+
+
+def drain(stream: Generator[str, None, LLMResponse]) -> Tuple[List[str], LLMResponse]:
+    """Collect a chat stream's chunks and its final response."""
+    chunks = []
+    while True:
+        try:
+            chunks.append(next(stream))
+        except StopIteration as stop:
+            return chunks, stop.value
+
+
+class TestProviderConfig:
+    """Tests for ProviderConfig."""
+    
+    def test_yaml_snapshot_cache(self, isolated_home: Path) -> None:
+        """Test that parsed YAML is reused until the file changes."""
+        config_dir = isolated_home / ".config" / "noode"
+        config_dir.mkdir(parents=True)
+        config_file = config_dir / "providers.yaml"
+        config_file.write_text("active_provider: anthropic\n")
+        
+        assert ProviderConfig().get_active_provider() == "anthropic"
+        assert (config_dir / "providers.cache.json").exists()
+        assert ProviderConfig().get_active_provider() == "anthropic"
+        
+        config_file.write_text("active_provider: google\n")
+        stat = config_file.stat()
+        os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        
+        assert ProviderConfig().get_active_provider() == "google"
+    
+    def test_save_config_only_when_dirty(self, isolated_home: Path) -> None:
+        """Test that edits are written once, atomically, on save_config."""
+        config_file = isolated_home / ".config" / "noode" / "providers.yaml"
+        config = ProviderConfig()
+        config.save_config()
+        assert not config_file.exists()
+        
+        config.update_provider_config("anthropic", model="claude-x", temperature=0.2)
+        config.update_provider_config("anthropic", model="claude-y")
+        assert not config_file.exists()
+        assert config.get_provider_config("anthropic")["model"] == "claude-y"
+        
+        config.save_config()
+        mtime = config_file.stat().st_mtime_ns
+        config.save_config()
+        assert config_file.stat().st_mtime_ns == mtime
+        assert list(config_file.parent.glob("*.tmp")) == []
+        
+        # Switching provider is saved right away
+        config.set_active_provider("anthropic")
+        assert "active_provider: anthropic" in config_file.read_text()
+        
+        reloaded = ProviderConfig()
+        assert reloaded.get_active_provider() == "anthropic"
+        assert reloaded.get_provider_config("anthropic")["temperature"] == 0.2
+    
+    def test_unsaved_configs_are_not_kept_alive(self, isolated_home: Path) -> None:
+        """Test the exit hook holds configs weakly and forgets saved ones."""
+        config = ProviderConfig()
+        config.update_provider_config("openai", model="gpt-x")
+        assert config in llm_providers._UNSAVED_CONFIGS
+        
+        config.save_config()
+        assert config not in llm_providers._UNSAVED_CONFIGS
+        
+        config.update_provider_config("openai", model="gpt-y")
+        ref = weakref.ref(config)
+        del config
+        gc.collect()
+        assert ref() is None
+    
+    def test_api_key_lookup_is_memoized(
+        self, isolated_home: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that keys are read once and refreshed by set_api_key."""
+        config = ProviderConfig()
+        assert config.get_api_key("openai") is None
+        
+        monkeypatch.setenv("NOODE_OPENAI_API_KEY", "from-env")
+        assert config.get_api_key("openai") is None
+        
+        config.set_api_key("anthropic", "sk-test")
+        assert config.get_api_key("anthropic") == "sk-test"
+        config.set_api_key("openai", "ignored")
+        assert config.get_api_key("openai") == "from-env"
+
+    
+    def test_api_key_pool(
+        self, isolated_home: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that key files and env vars can hold several keys."""
+        config = ProviderConfig()
+        config.set_api_key("anthropic", "sk-a\n# backup keys\nsk-b\n\n")
+        monkeypatch.setenv("NOODE_OPENAI_API_KEY", "k1, k2")
+        
+        assert config.get_api_keys("anthropic") == ["sk-a", "sk-b"]
+        assert config.get_api_key("anthropic") == "sk-a"
+        assert config.get_api_keys("openai") == ["k1", "k2"]
+        assert config.get_api_keys("google") == []
+
+    
+    def test_http_settings(self, isolated_home: Path) -> None:
+        """Test that per-provider pool settings are read from providers.yaml."""
+        config_dir = isolated_home / ".config" / "noode"
+        config_dir.mkdir(parents=True)
+        (config_dir / "providers.yaml").write_text(
+            "providers:\n"
+            "  openrouter:\n"
+            "    http:\n"
+            "      max_connections: 500\n"
+            "      read_timeout: 30\n"
+            "      unknown: 1\n"
+        )
+        config = ProviderConfig()
+        
+        http = OpenRouterProvider(config)._http
+        assert http == HttpSettings(max_connections=500, read_timeout=30)
+        assert http.limits.max_connections == 500
+        assert http.timeout.read == 30
+        assert HttpSettings.from_config(config.get_provider_config("openai")) == HttpSettings()
+
+
+class TestLLMProvider:
+    """Tests for the LLMProvider key pool."""
+    
+    def test_round_robin_keys(self) -> None:
+        """Test that sync calls rotate over the configured keys."""
+        config = ProviderConfig()
+        config.set_api_key("openrouter", "k1\nk2\nk3")
+        provider = OpenRouterProvider(config)
+        
+        assert provider.api_key == "k1"
+        assert [provider._next_key() for _ in range(4)] == ["k1", "k2", "k3", "k1"]
+    
+    async def test_least_loaded_key(self) -> None:
+        """Test that async calls lease the key with the fewest requests."""
+        config = ProviderConfig()
+        config.set_api_key("openrouter", "k1\nk2")
+        provider = OpenRouterProvider(config)
+        
+        async with provider._least_loaded_key() as first:
+            async with provider._least_loaded_key() as second:
+                assert {first, second} == {"k1", "k2"}
+            async with provider._least_loaded_key() as third:
+                assert third == second
+        assert provider._in_flight == {"k1": 0, "k2": 0}
+    
+    def test_openai_raw_response(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that OpenAI replies are parsed from the raw JSON body."""
+        openai = pytest.importorskip("openai")
+        body = {
+            "id": "c1",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "gpt-test",
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": "pong"},
+            }],
+            "usage": {"prompt_tokens": 3, "completion_tokens": 1, "total_tokens": 4},
+        }
+        client = openai.OpenAI(
+            api_key="k1",
+            http_client=httpx.Client(
+                transport=httpx.MockTransport(lambda request: httpx.Response(200, json=body))
+            ),
+        )
+        monkeypatch.setattr(llm_providers, "_openai_clients", lambda key, http: (client, None))
+        config = ProviderConfig()
+        config.set_api_key("openai", "k1")
+        
+        response = OpenAIProvider(config).chat([LLMMessage(role="user", content="ping")])
+        
+        assert response.error is None
+        assert response.content == "pong"
+        assert response.model == "gpt-test"
+        assert response.usage == {"prompt_tokens": 3, "completion_tokens": 1, "total_tokens": 4}
+    
+    def test_google_reuses_models_and_sessions(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that Google models are pooled and sessions continue by id."""
+        created = []
+        
+        class FakeSession:
+            def __init__(self) -> None:
+                self.history: List[str] = []
+            
+            def send_message(self, content: str) -> SimpleNamespace:
+                self.history.append(content)
+                return SimpleNamespace(text=str(len(self.history)))
+        
+        class FakeModel:
+            def __init__(self, name: str) -> None:
+                created.append(name)
+            
+            def start_chat(self, history: list) -> FakeSession:
+                return FakeSession()
+        
+        fake_genai = SimpleNamespace(configure=lambda api_key: None, GenerativeModel=FakeModel)
+        monkeypatch.setattr(llm_providers, "genai", fake_genai, raising=False)
+        monkeypatch.setattr(llm_providers, "GOOGLE_AVAILABLE", True)
+        monkeypatch.setattr(GoogleProvider, "MAX_SESSIONS", 1)
+        config = ProviderConfig()
+        config.set_api_key("google", "k1")
+        provider = GoogleProvider(config)
+        messages = [LLMMessage(role="user", content="Hi")]
+        
+        assert provider.chat(messages).content == "1"
+        assert provider.chat(messages).content == "1"
+        assert provider.chat(messages, session_id="s1").content == "1"
+        assert provider.chat(messages, session_id="s1").content == "2"
+        provider.chat(messages, session_id="s2")
+        assert provider.chat(messages, session_id="s1").content == "1"
+        assert created == ["gemini-pro"]
+    
+    def test_openrouter_retries_rate_limits(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that 429s are retried after Retry-After and 401s are not."""
+        statuses = [429, 503, 200]
+        
+        def handler(request: httpx.Request) -> httpx.Response:
+            status = statuses.pop(0)
+            if status != 200:
+                return httpx.Response(status, headers={"Retry-After": "0"})
+            return httpx.Response(200, json={
+                "model": "m", "choices": [{"message": {"content": "ok"}}],
+            })
+        
+        client = httpx.Client(
+            base_url=OpenRouterProvider.API_BASE, transport=httpx.MockTransport(handler)
+        )
+        monkeypatch.setattr(llm_providers, "_openrouter_clients", lambda key, http: (client, None))
+        config = ProviderConfig()
+        config.set_api_key("openrouter", "k1")
+        provider = OpenRouterProvider(config)
+        messages = [LLMMessage(role="user", content="Hi")]
+        
+        assert provider.chat(messages).content == "ok"
+        assert statuses == []
+        
+        statuses.extend([401, 200])
+        assert provider.chat(messages).error == "Invalid API key"
+        assert statuses == [200]
+    
+    def test_openrouter_retry_after_is_capped(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a long Retry-After does not block the caller for that long."""
+        statuses = [429, 200]
+        delays: List[float] = []
+        
+        def handler(request: httpx.Request) -> httpx.Response:
+            if statuses.pop(0) == 429:
+                return httpx.Response(429, headers={"Retry-After": "3600"})
+            return httpx.Response(200, json={
+                "model": "m", "choices": [{"message": {"content": "ok"}}],
+            })
+        
+        client = httpx.Client(
+            base_url=OpenRouterProvider.API_BASE, transport=httpx.MockTransport(handler)
+        )
+        monkeypatch.setattr(llm_providers, "_openrouter_clients", lambda key, http: (client, None))
+        monkeypatch.setattr(llm_providers.time, "sleep", delays.append)
+        config = ProviderConfig()
+        config.set_api_key("openrouter", "k1")
+        provider = OpenRouterProvider(config)
+        
+        assert provider.chat([LLMMessage(role="user", content="Hi")]).content == "ok"
+        assert delays == [30.0]
+    
+    async def test_aclose_closes_openrouter_clients(self) -> None:
+        """Test manager shutdown closes both pooled OpenRouter clients."""
+        http = HttpSettings.from_config({})
+        client, async_client = llm_providers._openrouter_clients("k-close", http)
+        
+        await LLMManager().aclose()
+        assert client.is_closed
+        assert async_client.is_closed
+        assert llm_providers._openrouter_clients("k-close", http)[0] is not client
+        await llm_providers._close_openrouter_clients()
+    
+    def test_openrouter_stream(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that OpenRouter server-sent events are yielded as text chunks."""
+        events = [
+            {"model": "m", "choices": [{"delta": {"content": "Hel"}}]},
+            {"model": "m", "choices": [{"delta": {"content": "lo"}}]},
+        ]
+        body = "".join(f"data: {json.dumps(e)}\n\n" for e in events) + "data: [DONE]\n\n"
+        client = httpx.Client(
+            base_url=OpenRouterProvider.API_BASE,
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, text=body)),
+        )
+        monkeypatch.setattr(llm_providers, "_openrouter_clients", lambda key, http: (client, None))
+        config = ProviderConfig()
+        config.set_api_key("openrouter", "k1")
+        
+        provider = OpenRouterProvider(config)
+        chunks, response = drain(provider.chat_stream([LLMMessage(role="user", content="Hi")]))
+        
+        assert chunks == ["Hel", "lo"]
+        assert response.content == "Hello"
+        assert response.model == "m"
+
+
+class TestLLMManager:
+    """Tests for LLMManager."""
+    
+    def test_unknown_provider(self) -> None:
+        """Test that unknown providers return an error response."""
+        response = LLMManager().chat([LLMMessage(role="user", content="Hi")], provider="nope")
+        
+        assert response.error == "Unknown provider: nope"
+    
+    def test_no_provider_available(self) -> None:
+        """Test the error when no provider has an API key."""
+        response = LLMManager().chat([LLMMessage(role="user", content="Hi")])
+        
+        assert response.error is not None
+        assert "No LLM provider available" in response.error
+    
+    def test_providers_are_created_lazily(self) -> None:
+        """Test that providers are only constructed when first used."""
+        manager = LLMManager()
+        manager.register_provider(EchoProvider)
+        
+        assert manager.get_available_providers() == []
+        assert manager._providers == {}
+        
+        echo = manager.get_provider("echo")
+        assert manager.get_provider("echo") is echo
+        assert manager.get_provider("nope") is None
+        
+        manager.reload_provider("echo")
+        assert manager.get_provider("echo") is not echo
+    
+    async def test_aget_available_providers(self) -> None:
+        """Test the async availability probe matches the sync one."""
+        manager = LLMManager()
+        manager.config.set_api_key("openrouter", "sk-test")
+        
+        assert await manager.aget_available_providers() == manager.get_available_providers()
+        assert "openrouter" in manager.get_available_providers()
+    
+    def test_all_providers_in_parallel(self) -> None:
+        """Test that test_all_providers reports each available provider."""
+        manager = LLMManager()
+        assert manager.test_all_providers() == {}
+        
+        manager.register_provider(EchoProvider)
+        echo = manager.get_provider("echo")
+        
+        assert manager.test_all_providers() == {"echo": True}
+        assert echo.calls == 1
+    
+    def test_prewarm(self) -> None:
+        """Test that prewarm runs each available provider's warm-up in a thread."""
+        warmed = []
+        
+        class WarmEchoProvider(EchoProvider):
+            def _prewarm(self) -> None:
+                warmed.append(self.name)
+                raise ConnectionError("offline")
+        
+        manager = LLMManager()
+        manager.register_provider(WarmEchoProvider)
+        manager.get_provider("echo")
+        
+        for thread in manager.prewarm():
+            thread.join()
+        
+        assert warmed == ["echo"]
+    
+    def test_chat_stream(self) -> None:
+        """Test that chat_stream yields chunks and returns the response."""
+        manager = LLMManager()
+        manager.register_provider(EchoProvider)
+        manager.get_provider("echo")
+        
+        messages = [LLMMessage(role="user", content="stream me")]
+        chunks, response = drain(manager.chat_stream(messages, provider="echo"))
+        assert chunks == ["stream me"]
+        assert response.content == "stream me"
+        
+        chunks, response = drain(manager.chat_stream(messages, provider="nope"))
+        assert chunks == []
+        assert response.error == "Unknown provider: nope"
+    
+    def test_chat_batch(self) -> None:
+        """Test that prompts are coalesced into one request per group."""
+        
+        class JsonEchoProvider(EchoProvider):
+            def chat(self, messages: List[LLMMessage], **kwargs) -> LLMResponse:
+                self.calls += 1
+                if len(messages) == 1:
+                    return LLMResponse(content=messages[0].content, model="echo", provider="echo")
+                questions = messages[-1].content.split("\n\n")
+                answers = [q.split("] ", 1)[1].upper() for q in questions]
+                content = "```json\n" + json.dumps({"answers": answers}) + "\n```"
+                return LLMResponse(content=content, model="echo", provider="echo")
+        
+        manager = LLMManager()
+        manager.register_provider(JsonEchoProvider)
+        echo = manager.get_provider("echo")
+        
+        answers = manager.chat_batch(["a", "b", "c", "d", "e"], provider="echo", max_per_batch=2)
+        
+        assert answers == ["A", "B", "C", "D", "e"]
+        assert echo.calls == 3
+    
+    def test_chat_batch_falls_back(self) -> None:
+        """Test that unparseable batched replies are retried per prompt."""
+        manager = LLMManager()
+        manager.register_provider(EchoProvider)
+        echo = manager.get_provider("echo")
+        
+        assert manager.chat_batch(["x", "y"], provider="echo") == ["x", "y"]
+        assert echo.calls == 3
+        
+        text_format = {"type": "text"}
+        answers = manager.chat_batch(["x", "y"], provider="echo", response_format=text_format)
+        assert answers == ["x", "y"]
+    
+    async def test_abatch_keeps_order_and_limits_concurrency(self) -> None:
+        """Test that abatch returns ordered results under the concurrency cap."""
+        manager = LLMManager()
+        manager.register_provider(EchoProvider)
+        echo = manager.get_provider("echo")
+        conversations = [[LLMMessage(role="user", content=str(i))] for i in range(10)]
+        
+        responses = await manager.abatch(conversations, provider="echo", max_concurrency=3)
+        
+        assert [r.content for r in responses] == [str(i) for i in range(10)]
+        assert echo.max_in_flight == 3
+    
+    def test_deterministic_requests_are_cached(self) -> None:
+        """Test that temperature 0 requests are served from the cache."""
+        manager = LLMManager()
+        manager.register_provider(EchoProvider)
+        echo = manager.get_provider("echo")
+        messages = [LLMMessage(role="user", content="cache me")]
+        
+        first = manager.chat(messages, provider="echo", temperature=0)
+        second = manager.chat(messages, provider="echo", temperature=0)
+        manager.chat(messages, provider="echo", temperature=0.7)
+        
+        assert second == first
+        assert echo.calls == 2
+        assert manager.cache_stats()["hits"] == 1
+    
+    def test_cache_key_covers_request_options(self) -> None:
+        """Test that other request parameters are part of the cache key."""
+        manager = LLMManager()
+        manager.register_provider(EchoProvider)
+        echo = manager.get_provider("echo")
+        messages = [LLMMessage(role="user", content="cache me")]
+        json_format = {"type": "json_object"}
+        
+        manager.chat(messages, provider="echo", temperature=0)
+        manager.chat(messages, provider="echo", temperature=0, response_format=json_format)
+        manager.chat(messages, provider="echo", temperature=0, top_p=0.5, stop=["x"])
+        manager.chat(messages, provider="echo", stop=["x"], top_p=0.5, temperature=0)
+        
+        assert echo.calls == 3
+    
+    def test_semantic_cache_reuses_near_duplicates(self) -> None:
+        """Test that the semantic cache answers repeats within one conversation."""
+        manager = LLMManager()
+        manager.register_provider(EchoProvider)
+        echo = manager.get_provider("echo")
+        manager.enable_semantic_cache()
+        question = [LLMMessage(role="user", content="What is Noode?")]
+        other_history = [
+            LLMMessage(role="user", content="Hello"),
+            LLMMessage(role="assistant", content="Hi"),
+            LLMMessage(role="user", content="What is Noode?"),
+        ]
+        
+        manager.chat(question, provider="echo")
+        manager.chat(question, provider="echo")
+        manager.chat(other_history, provider="echo")
+        
+        assert echo.calls == 2
+
+
+class TestLLMCache:
+    """Tests for LLMCache."""
+    
+    def test_lru_eviction(self) -> None:
+        """Test that the least recently used entry is evicted."""
+        cache = LLMCache(maxsize=2)
+        cache.set("a", {"content": "a"})
+        cache.set("b", {"content": "b"})
+        cache.get("a")
+        cache.set("c", {"content": "c"})
+        
+        assert cache.get("b") is None
+        assert cache.get("a") == {"content": "a"}
+        assert cache.stats == {"hits": 2, "misses": 1, "size": 2}
+    
+    def test_file_backend(self, tmp_path: Path) -> None:
+        """Test that persisted entries survive a new cache instance."""
+        LLMCache(cache_dir=tmp_path).set("key", {"content": "stored"})
+        
+        assert LLMCache(cache_dir=tmp_path).get("key") == {"content": "stored"}
+    
+    def test_key_depends_on_messages(self) -> None:
+        """Test that different conversations get different keys."""
+        hi = [LLMMessage(role="user", content="Hi")]
+        bye = [LLMMessage(role="user", content="Bye")]
+        
+        assert LLMCache.make_key("openai", "gpt-4", hi, 0, 100) == \
+            LLMCache.make_key("openai", "gpt-4", list(hi), 0, 100)
+        assert LLMCache.make_key("openai", "gpt-4", hi, 0, 100) != \
+            LLMCache.make_key("openai", "gpt-4", bye, 0, 100)
+        assert LLMCache.make_key("openai", "gpt-4", hi, 0, 100) != \
+            LLMCache.make_key("openai", "gpt-4", hi, 0, 100, {"top_p": 0.5})
+
+
+class TestSemanticCache:
+    """Tests for SemanticCache."""
+    
+    @staticmethod
+    def embed(text: str) -> np.ndarray:
+        """Embed by letter counts so rewordings stay close."""
+        vector = np.zeros(26, dtype=np.float32)
+        for char in text.lower():
+            if char.isascii() and char.isalpha():
+                vector[ord(char) - ord("a")] += 1
+        return vector
+    
+    def test_threshold(self) -> None:
+        """Test hits above and misses below the similarity threshold."""
+        cache = SemanticCache(self.embed, threshold=0.95)
+        cache.set("scope", "how do I deploy", {"content": "answer"})
+        
+        assert cache.get("scope", "How do I deploy?") == {"content": "answer"}
+        assert cache.get("scope", "zzz") is None
+        assert cache.get("other", "how do I deploy") is None
+
+
+class TestModels:
+    """Tests for the built-in model table."""
+    
+    def test_validate_model(self) -> None:
+        """Test model id validation per provider."""
+        assert validate_model("openai", "gpt-5")
+        assert not validate_model("anthropic", "gpt-5")
+        assert not validate_model("nope", "gpt-5")
+    
+    def test_get_default_model(self) -> None:
+        """Test that the first listed model is the default."""
+        assert get_default_model("google") == "gemini-1.5-pro-latest"
+        assert get_default_model("nope") == ""
@@ -1,13 +1,36 @@
 """Tests for Sprint 3 components."""
 
+import json
+import sqlite3
+import threading
 import pytest
 from pathlib import Path
-import tempfile
 from datetime import datetime
 
 from noode.core.session_manager import SessionManager, AgentSession
 
 
+@pytest.fixture
+def populated_manager() -> tuple[SessionManager, list[str]]:
+    """In-memory manager with two agent1 sessions and one agent2 session."""
+    manager = SessionManager()
+    ids = [
+        manager.create_session(name).session_id
+        for name in ("agent1", "agent1", "agent2")
+    ]
+    return manager, ids
+
+
+@pytest.fixture
+def busy_manager() -> tuple[SessionManager, str]:
+    """In-memory manager with one session that completed two tasks."""
+    manager = SessionManager()
+    session_id = manager.create_session("agent1").session_id
+    manager.update_session(session_id, task_completed=True)
+    manager.update_session(session_id, task_completed=True)
+    return manager, session_id
+
+
 class TestSessionManager:
     """Tests for SessionManager."""
     
@@ -78,12 +101,11 @@ class TestSessionManager:
         assert closed is not None
         assert closed.is_active is False
     
-    def test_list_sessions(self) -> None:
+    def test_list_sessions(
+        self, populated_manager: tuple[SessionManager, list[str]]
+    ) -> None:
         """Test listing sessions."""
-        manager = SessionManager()
-        manager.create_session("agent1")
-        manager.create_session("agent1")
-        manager.create_session("agent2")
+        manager, _ = populated_manager
         
         # All active
         all_sessions = manager.list_sessions()
@@ -93,60 +115,196 @@ class TestSessionManager:
         agent1_sessions = manager.list_sessions(agent_name="agent1")
         assert len(agent1_sessions) == 2
     
-    def test_get_stats(self) -> None:
-        """Test statistics."""
+    def test_get_agent_context(self) -> None:
+        """Test combining context across an agent's active sessions."""
         manager = SessionManager()
-        session = manager.create_session("agent1")
-        manager.update_session(session.session_id, task_completed=True)
-        manager.update_session(session.session_id, task_completed=True)
+        manager.create_session(
+            "agent1", context={"a": 1, "shared": "old"}, now=datetime(2026, 1, 1)
+        )
+        manager.create_session(
+            "agent1", context={"b": 2, "shared": "new"}, now=datetime(2026, 1, 2)
+        )
+        
+        context = manager.get_agent_context("agent1")
+        assert dict(context) == {"a": 1, "b": 2, "shared": "old"}
+        with pytest.raises(TypeError):
+            context["a"] = 3  # type: ignore[index]
+    
+    def test_session_limit(self) -> None:
+        """Test oldest sessions are deactivated past the per-agent limit."""
+        manager = SessionManager(max_sessions_per_agent=2)
+        first = manager.create_session("agent1", now=datetime(2026, 1, 1))
+        manager.create_session("agent1", now=datetime(2026, 1, 2))
+        manager.create_session("agent1", now=datetime(2026, 1, 3))
+        
+        assert len(manager.list_sessions(agent_name="agent1")) == 2
+        assert first.is_active is False
+    
+    def test_get_stats(self, busy_manager: tuple[SessionManager, str]) -> None:
+        """Test statistics."""
+        manager, session_id = busy_manager
         
         stats = manager.get_stats()
         assert stats["total_sessions"] == 1
         assert stats["active_sessions"] == 1
         assert stats["total_tasks_completed"] == 2
+        assert stats["by_agent"] == {"agent1": 1}
+        
+        manager.close_session(session_id)
+        stats = manager.get_stats()
+        assert stats["active_sessions"] == 0
+        assert stats["by_agent"] == {}
+        assert stats["total_tasks_completed"] == 0
     
-    def test_persistence(self) -> None:
+    def test_persistence(self, workdir: Path) -> None:
         """Test session persistence."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            storage_path = Path(tmpdir) / "sessions"
-            
-            # Create session
-            manager1 = SessionManager(storage_path=storage_path)
-            session = manager1.create_session(
-                agent_name="test_agent",
-                context={"test": "data"},
+        storage_path = workdir / "sessions"
+        
+        # Create session
+        manager1 = SessionManager(storage_path=storage_path)
+        session = manager1.create_session(
+            agent_name="test_agent",
+            context={"test": "data"},
+        )
+        session_id = session.session_id
+        
+        # Load in new manager
+        manager2 = SessionManager(storage_path=storage_path)
+        loaded = manager2.get_session(session_id)
+        
+        assert loaded is not None
+        assert loaded.agent_name == "test_agent"
+        assert loaded.context["test"] == "data"
+    
+    def test_lazy_load(self, workdir: Path) -> None:
+        """Test storage is not touched until sessions are needed."""
+        storage_path = workdir / "sessions"
+        manager = SessionManager(storage_path=storage_path)
+        assert not storage_path.exists()
+        
+        assert manager.get_session("missing") is None
+        assert (storage_path / "sessions.db").exists()
+    
+    def test_import_legacy_files(self, workdir: Path) -> None:
+        """Test sessions saved by the file-based storage are imported once."""
+        storage_path = workdir / "sessions"
+        storage_path.mkdir()
+        (storage_path / "old1.json").write_text(json.dumps({
+            "session_id": "old1",
+            "agent_name": "agent1",
+            "created_at": "2026-01-01T00:00:00",
+            "last_active": "2026-01-02T00:00:00",
+            "context": {"k": "v"},
+            "messages": [{"role": "user", "content": "hi"}],
+        }))
+        (storage_path / "old2.meta.json").write_text(json.dumps({
+            "session_id": "old2",
+            "agent_name": "agent2",
+            "created_at": "2026-01-01T00:00:00",
+            "last_active": "2026-01-03T00:00:00",
+        }))
+        (storage_path / "old2.msgs.log").write_text(
+            "".join(json.dumps({"role": "user", "content": f"m{i}"}) + "\n" for i in range(3))
+        )
+        
+        manager = SessionManager(storage_path=storage_path)
+        first = manager.get_session("old1")
+        second = manager.get_session("old2")
+        assert first is not None and first.context == {"k": "v"}
+        assert list(first.messages) == [{"role": "user", "content": "hi"}]
+        assert second is not None
+        assert [m["content"] for m in second.messages] == ["m0", "m1", "m2"]
+        assert not list(storage_path.glob("*.json"))
+        assert (storage_path / "old2.msgs.log.migrated").exists()
+        
+        reloaded = SessionManager(storage_path=storage_path)
+        assert len(reloaded.list_sessions()) == 2
+        assert len(reloaded.get_session("old2").messages) == 3
+    
+    def test_use_from_other_thread(self, workdir: Path) -> None:
+        """Test a persistent manager can be used from a second thread."""
+        manager = SessionManager(storage_path=workdir / "sessions")
+        session = manager.create_session("agent1")
+        errors: list[BaseException] = []
+        
+        def update() -> None:
+            try:
+                manager.update_session(
+                    session.session_id, message={"role": "user", "content": "x"}
+                )
+            except BaseException as e:
+                errors.append(e)
+        
+        thread = threading.Thread(target=update)
+        thread.start()
+        thread.join()
+        
+        assert errors == []
+        assert len(manager.get_session(session.session_id).messages) == 1
+    
+    def test_failed_save_is_retried(self, workdir: Path) -> None:
+        """Test a save that fails to commit is not skipped as unchanged later."""
+        storage_path = workdir / "sessions"
+        manager = SessionManager(storage_path=storage_path)
+        session_id = manager.create_session("agent1").session_id
+        
+        db = manager._db
+        assert db is not None
+        db.execute(
+            "CREATE TRIGGER fail_update BEFORE UPDATE ON sessions"
+            " BEGIN SELECT RAISE(ABORT, 'disk full'); END"
+        )
+        now = datetime(2026, 1, 1)
+        with pytest.raises(sqlite3.IntegrityError):
+            manager.update_session(session_id, context={"k": "v"}, now=now)
+        db.execute("DROP TRIGGER fail_update")
+        
+        manager.update_session(session_id, now=now)
+        reloaded = SessionManager(storage_path=storage_path).get_session(session_id)
+        assert reloaded is not None
+        assert reloaded.context == {"k": "v"}
+    
+    def test_message_persistence(self, workdir: Path) -> None:
+        """Test messages are restored from the append-only log."""
+        storage_path = workdir / "sessions"
+        
+        manager1 = SessionManager(storage_path=storage_path)
+        session = manager1.create_session("agent1")
+        for i in range(250):
+            manager1.update_session(
+                session.session_id,
+                message={"role": "user", "content": f"msg {i}"},
             )
-            session_id = session.session_id
-            
-            # Load in new manager
-            manager2 = SessionManager(storage_path=storage_path)
-            loaded = manager2.get_session(session_id)
-            
-            assert loaded is not None
-            assert loaded.agent_name == "test_agent"
-            assert loaded.context["test"] == "data"
+        
+        manager2 = SessionManager(storage_path=storage_path)
+        loaded = manager2.get_session(session.session_id)
+        
+        assert loaded is not None
+        assert len(loaded.messages) == 100
+        assert loaded.messages[0]["content"] == "msg 150"
+        assert loaded.messages[-1]["content"] == "msg 249"
 
 
 class TestAgentSession:
     """Tests for AgentSession dataclass."""
     
-    def test_to_dict(self) -> None:
-        """Test serialization."""
+    def test_roundtrip(self) -> None:
+        """Test to_dict and from_dict are inverses."""
         session = AgentSession(
             session_id="abc123",
             agent_name="test",
-            created_at=datetime(2026, 1, 1),
-            last_active=datetime(2026, 1, 2),
+            created_at_ns=1_767_225_600_000_000_000,
+            last_active_ns=1_767_312_000_000_000_000,
             context={"key": "val"},
         )
+        session.messages.append({"role": "user", "content": "Hello"})
         
         data = session.to_dict()
-        assert data["session_id"] == "abc123"
-        assert data["agent_name"] == "test"
-        assert "created_at" in data
+        assert data["created_at_ns"] == 1_767_225_600_000_000_000
+        assert AgentSession.from_dict(data) == session
     
-    def test_from_dict(self) -> None:
-        """Test deserialization."""
+    def test_from_iso_dict(self) -> None:
+        """Test deserialization of ISO-format timestamps."""
         data = {
             "session_id": "xyz",
             "agent_name": "agent",
@@ -158,4 +316,4 @@ class TestAgentSession:
         
         session = AgentSession.from_dict(data)
         assert session.session_id == "xyz"
-        assert session.agent_name == "agent"
+        assert session.created_at == datetime(2026, 1, 1)
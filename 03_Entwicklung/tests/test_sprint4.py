@@ -1,154 +1,161 @@
 """Tests for Sprint 4 components."""
 
+import asyncio
+import dataclasses
 import pytest
 from pathlib import Path
-import tempfile
 from datetime import datetime
+from typing import Any
 
+from noode.core.base_agent import Action
 from noode.core.project_manager import ProjectManager, Project, ProjectConfig
-from noode.plugins.manager import PluginManager, PluginMetadata
+from noode.plugins.manager import (
+    LoadedPlugin,
+    MiddlewarePlugin,
+    PluginManager,
+    PluginMetadata,
+)
 from noode.cicd.generator import CICDGenerator
 
 
+@pytest.fixture
+def pm(workdir: Path) -> ProjectManager:
+    """Project manager with an empty workspace under the test's workdir."""
+    return ProjectManager(workspace_path=workdir / "projects")
+
+
 class TestProjectManager:
     """Tests for ProjectManager."""
     
-    def test_init(self) -> None:
+    def test_init(self, pm: ProjectManager) -> None:
         """Test initialization."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            manager = ProjectManager(workspace_path=Path(tmpdir) / "projects")
-            assert len(manager._projects) == 0
+        assert len(pm._projects) == 0
     
-    def test_create_project(self) -> None:
+    def test_create_project(self, pm: ProjectManager, workdir: Path) -> None:
         """Test project creation."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            manager = ProjectManager(workspace_path=Path(tmpdir) / "projects")
-            project = manager.create_project(
-                name="test-project",
-                path=Path(tmpdir) / "test-project",
-                template="web-app",
-            )
-            
-            assert project.name == "test-project"
-            assert project.config.template == "web-app"
-            assert project.is_active is True
+        project = pm.create_project(
+            name="test-project",
+            path=workdir / "test-project",
+            template="web-app",
+        )
+        
+        assert project.name == "test-project"
+        assert project.config.template == "web-app"
+        assert project.is_active is True
     
-    def test_get_project(self) -> None:
+    def test_get_project(self, pm: ProjectManager, workdir: Path) -> None:
         """Test project retrieval by ID."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            manager = ProjectManager(workspace_path=Path(tmpdir) / "projects")
-            created = manager.create_project(
-                name="test",
-                path=Path(tmpdir) / "test",
-            )
-            
-            retrieved = manager.get_project(created.project_id)
-            assert retrieved is not None
-            assert retrieved.name == "test"
+        created = pm.create_project(
+            name="test",
+            path=workdir / "test",
+        )
+        
+        retrieved = pm.get_project(created.project_id)
+        assert retrieved is not None
+        assert retrieved.name == "test"
     
-    def test_get_project_by_name(self) -> None:
+    def test_get_project_by_name(self, pm: ProjectManager, workdir: Path) -> None:
         """Test project retrieval by name."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            manager = ProjectManager(workspace_path=Path(tmpdir) / "projects")
-            manager.create_project(name="my-app", path=Path(tmpdir) / "my-app")
-            
-            project = manager.get_project_by_name("my-app")
-            assert project is not None
-            assert project.name == "my-app"
+        pm.create_project(name="my-app", path=workdir / "my-app")
+        
+        project = pm.get_project_by_name("my-app")
+        assert project is not None
+        assert project.name == "my-app"
     
-    def test_update_project(self) -> None:
+    def test_update_project(self, pm: ProjectManager, workdir: Path) -> None:
         """Test project update."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            manager = ProjectManager(workspace_path=Path(tmpdir) / "projects")
-            project = manager.create_project(
-                name="old-name",
-                path=Path(tmpdir) / "project",
-            )
-            
-            updated = manager.update_project(
-                project.project_id,
-                name="new-name",
-                config={"version": "1.0.0"},
-            )
-            
-            assert updated is not None
-            assert updated.name == "new-name"
-            assert updated.config.version == "1.0.0"
+        project = pm.create_project(
+            name="old-name",
+            path=workdir / "project",
+        )
+        
+        updated = pm.update_project(
+            project.project_id,
+            name="new-name",
+            config={"version": "1.0.0"},
+        )
+        
+        assert updated is not None
+        assert updated.name == "new-name"
+        assert updated.config.version == "1.0.0"
     
-    def test_delete_project(self) -> None:
+    def test_delete_project(self, pm: ProjectManager, workdir: Path) -> None:
         """Test project deletion."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            manager = ProjectManager(workspace_path=Path(tmpdir) / "projects")
-            project = manager.create_project(
-                name="to-delete",
-                path=Path(tmpdir) / "to-delete",
-            )
-            
-            result = manager.delete_project(project.project_id)
-            assert result is True
-            assert manager.get_project(project.project_id) is None
+        project = pm.create_project(
+            name="to-delete",
+            path=workdir / "to-delete",
+        )
+        
+        result = pm.delete_project(project.project_id)
+        assert result is True
+        assert pm.get_project(project.project_id) is None
     
-    def test_list_projects(self) -> None:
+    def test_list_projects(self, pm: ProjectManager, workdir: Path) -> None:
         """Test project listing."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            manager = ProjectManager(workspace_path=Path(tmpdir) / "projects")
-            manager.create_project(name="p1", path=Path(tmpdir) / "p1")
-            manager.create_project(name="p2", path=Path(tmpdir) / "p2")
-            
-            projects = manager.list_projects()
-            assert len(projects) == 2
+        pm.create_project(name="p1", path=workdir / "p1")
+        pm.create_project(name="p2", path=workdir / "p2")
+        
+        projects = pm.list_projects()
+        assert len(projects) == 2
     
-    def test_set_active(self) -> None:
+    def test_set_active(self, pm: ProjectManager, workdir: Path) -> None:
         """Test setting active project."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            manager = ProjectManager(workspace_path=Path(tmpdir) / "projects")
-            project = manager.create_project(
-                name="active",
-                path=Path(tmpdir) / "active",
-            )
-            
-            result = manager.set_active(project.project_id)
-            assert result is True
-            assert manager.get_active() == project
+        project = pm.create_project(
+            name="active",
+            path=workdir / "active",
+        )
+        
+        result = pm.set_active(project.project_id)
+        assert result is True
+        assert pm.get_active() == project
     
-    def test_get_stats(self) -> None:
+    def test_get_stats(self, pm: ProjectManager, workdir: Path) -> None:
         """Test statistics."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            manager = ProjectManager(workspace_path=Path(tmpdir) / "projects")
-            manager.create_project(name="p1", path=Path(tmpdir) / "p1")
-            manager.create_project(name="p2", path=Path(tmpdir) / "p2", template="api")
-            
-            stats = manager.get_stats()
-            assert stats["total_projects"] == 2
-            assert stats["active_projects"] == 2
-            assert "web-app" in stats["by_template"]
+        pm.create_project(name="p1", path=workdir / "p1")
+        pm.create_project(name="p2", path=workdir / "p2", template="api")
+        
+        stats = pm.get_stats()
+        assert stats["total_projects"] == 2
+        assert stats["active_projects"] == 2
+        assert "web-app" in stats["by_template"]
+
+
+PLUGIN_SOURCE = """
+from pathlib import Path
+
+from noode.plugins import PluginMetadata, ToolPlugin
+
+with open(Path(__file__).with_name("exec_count"), "a") as f:
+    f.write("x")
+
+PLUGIN_METADATA = {"name": "echo-tools", "version": "1.0.0"}
 
 
+class EchoToolPlugin(ToolPlugin):
+    @property
+    def metadata(self):
+        return PluginMetadata(name="echo-tools", version="1.0.0", description="")
+
+    def initialize(self, context):
+        pass
+
+    def shutdown(self):
+        pass
+
+    def get_tools(self):
+        return {"echo": lambda text: text}
+"""
+
 class TestPluginManager:
     """Tests for PluginManager."""
     
-    def test_init(self) -> None:
-        """Test initialization."""
+    def test_empty_state(self) -> None:
+        """Test a new manager has no plugins, agents or tools."""
         manager = PluginManager()
         assert len(manager._plugins) == 0
-    
-    def test_list_plugins_empty(self) -> None:
-        """Test listing with no plugins."""
-        manager = PluginManager()
-        plugins = manager.list_plugins()
-        assert plugins == []
-    
-    def test_get_agents_empty(self) -> None:
-        """Test getting agents with no plugins."""
-        manager = PluginManager()
-        agents = manager.get_agents()
-        assert agents == []
-    
-    def test_get_tools_empty(self) -> None:
-        """Test getting tools with no plugins."""
-        manager = PluginManager()
-        tools = manager.get_tools()
-        assert tools == {}
+        assert manager.list_plugins() == []
+        assert manager.get_agents() == []
+        assert manager.get_tools() == {}
     
     def test_register_hook(self) -> None:
         """Test hook registration."""
@@ -160,6 +167,149 @@ class TestPluginManager:
         
         manager.register_hook("test_event", callback)
         assert "test_event" in manager._hooks
+    
+    def test_discover_and_load_execute_plugin_once(self, workdir: Path) -> None:
+        """Test that load() reuses the module discover() already executed."""
+        plugin_dir = workdir / "echo_tools"
+        plugin_dir.mkdir()
+        (plugin_dir / "plugin.py").write_text(PLUGIN_SOURCE)
+        manager = PluginManager(plugin_dirs=[workdir])
+        
+        discovered = manager.discover()
+        loaded = manager.load("echo_tools")
+        
+        assert [m.name for m in discovered] == ["echo-tools"]
+        assert loaded is not None
+        assert manager.get_tools()["echo"]("hi") == "hi"
+        assert (plugin_dir / "exec_count").read_text() == "x"
+    
+    def test_load_uses_plugin_class(self) -> None:
+        """Test loading the example plugin through its PLUGIN_CLASS."""
+        examples = Path(__file__).parents[1] / "src" / "noode" / "plugins" / "examples"
+        manager = PluginManager(plugin_dirs=[examples])
+        
+        loaded = manager.load("logger_agent")
+        
+        assert loaded is not None
+        assert loaded.plugin_class.__name__ == "LoggerAgentPlugin"
+        assert loaded.kind == "agent"
+        assert [agent.name for agent in manager.get_agents()] == ["logger_agent"]
+    
+    async def test_logger_agent_logs_actions(self) -> None:
+        """Test the example logger agent records and returns its actions."""
+        examples = Path(__file__).parents[1] / "src" / "noode" / "plugins" / "examples"
+        manager = PluginManager(plugin_dirs=[examples])
+        manager.load("logger_agent")
+        agent = manager.get_agents()[0]
+        
+        for i in range(3):
+            result = await agent.act(Action(f"step{i}", {"i": i}, description=""))
+        
+        assert result.output == {"logged": True, "entry_count": 3}
+        logs = agent.snapshot_logs()
+        assert [entry["action_type"] for entry in logs] == ["step0", "step1", "step2"]
+        assert logs[2]["parameters"] == {"i": 2}
+        assert datetime.fromisoformat(logs[0]["timestamp"]).year >= 2026
+        assert next(agent.iter_logs()) == logs[0]
+    
+    def test_get_tools_invalidated_on_state_change(self, workdir: Path) -> None:
+        """Test cached tools follow disable, enable and unload."""
+        plugin_dir = workdir / "echo_tools"
+        plugin_dir.mkdir()
+        (plugin_dir / "plugin.py").write_text(PLUGIN_SOURCE)
+        manager = PluginManager(plugin_dirs=[workdir])
+        manager.load("echo_tools")
+        
+        assert list(manager.get_tools()) == ["echo"]
+        manager.get_tools().clear()
+        assert list(manager.get_tools()) == ["echo"]
+        
+        manager.disable("echo_tools")
+        assert manager.get_tools() == {}
+        manager.enable("echo_tools")
+        assert list(manager.get_tools()) == ["echo"]
+        manager.unload("echo_tools")
+        assert manager.get_tools() == {}
+        assert manager.get_agents() == []
+    
+    async def test_discover_async(self, workdir: Path) -> None:
+        """Test async discovery and that broken plugins are skipped."""
+        for name, source in [("echo_tools", PLUGIN_SOURCE), ("broken", "raise ImportError")]:
+            (workdir / name).mkdir()
+            (workdir / name / "plugin.py").write_text(source)
+        manager = PluginManager(plugin_dirs=[workdir, workdir / "missing"])
+        
+        discovered = await manager.discover_async()
+        
+        assert [m.name for m in discovered] == ["echo-tools"]
+        assert [m.name for m in manager.discover()] == ["echo-tools"]
+    
+    async def test_emit_runs_all_hooks(self) -> None:
+        """Test that emit calls sync and async hooks and survives errors."""
+        manager = PluginManager()
+        called = []
+        
+        async def async_callback(data: Any) -> None:
+            called.append(("async", data))
+        
+        def failing_callback(data: Any) -> None:
+            raise RuntimeError("boom")
+        
+        manager.register_hook("event", called.append)
+        manager.register_hook("event", failing_callback)
+        manager.register_hook("event", async_callback)
+        await manager.emit("event", 1)
+        
+        assert sorted(called, key=str) == [("async", 1), 1]
+    
+    async def test_apply_middleware(self) -> None:
+        """Test sequential and parallel middleware pipelines."""
+        
+        class Tagger(MiddlewarePlugin):
+            def __init__(self, key: str, parallel: bool) -> None:
+                self.key = key
+                self.parallel = parallel
+            
+            @property
+            def metadata(self) -> PluginMetadata:
+                return PluginMetadata(name=self.key, version="1", description="")
+            
+            def initialize(self, context: dict[str, Any]) -> None:
+                pass
+            
+            def shutdown(self) -> None:
+                pass
+            
+            async def pre_process(self, request: dict[str, Any]) -> dict[str, Any]:
+                await asyncio.sleep(0)
+                seen = request.get("seen", ())
+                return {**request, self.key: True, "seen": (*seen, self.key)}
+            
+            async def post_process(
+                self, request: dict[str, Any], response: dict[str, Any]
+            ) -> dict[str, Any]:
+                return {**response, self.key: "done"}
+        
+        manager = PluginManager()
+        for key, parallel in [("a", True), ("b", True), ("c", False)]:
+            manager._add_loaded(key, LoadedPlugin(
+                metadata=PluginMetadata(name=key, version="1", description=""),
+                instance=Tagger(key, parallel),
+            ))
+        
+        async def handler(request: dict[str, Any]) -> dict[str, Any]:
+            return {"handled": request["seen"]}
+        
+        response = await manager.apply_middleware({"seen": ()}, handler)
+        
+        # a and b ran concurrently on the same input, c saw the merge
+        assert response["handled"] == ("b", "c")
+        assert response["a"] == response["b"] == response["c"] == "done"
+        
+        manager.disable("b")
+        response = await manager.apply_middleware({"seen": ()}, handler)
+        assert response["handled"] == ("a", "c")
+        assert "b" not in response
 
 
 class TestPluginMetadata:
@@ -176,6 +326,13 @@ class TestPluginMetadata:
         
         assert metadata.name == "test-plugin"
         assert metadata.version == "1.0.0"
+    
+    def test_frozen(self) -> None:
+        """Test metadata cannot be reassigned after construction."""
+        metadata = PluginMetadata(name="test-plugin", version="1.0.0", description="")
+        
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            metadata.version = "2.0.0"
 
 
 class TestCICDGenerator:
@@ -187,29 +344,28 @@ class TestCICDGenerator:
         assert "noode" in generator.templates
         assert "python" in generator.templates
     
-    def test_generate_github_actions(self) -> None:
-        """Test GitHub Actions generation."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            generator = CICDGenerator()
-            workflow_path = generator.generate_github_actions(
-                Path(tmpdir),
-                template="noode",
-            )
-            
-            assert workflow_path.exists()
-            content = workflow_path.read_text()
-            assert "name: Noode CI" in content
-            assert "Security Review" in content
+    def test_render_github_actions(self) -> None:
+        """Test GitHub Actions rendering."""
+        content = CICDGenerator().render_github_actions(template="noode")
+        assert "name: Noode CI" in content
+        assert "Security Review" in content
     
-    def test_generate_pre_commit(self) -> None:
-        """Test pre-commit config generation."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            generator = CICDGenerator()
-            config_path = generator.generate_pre_commit(Path(tmpdir))
-            
-            assert config_path.exists()
-            content = config_path.read_text()
-            assert "noode-security" in content
+    def test_render_pre_commit(self) -> None:
+        """Test pre-commit config rendering."""
+        content = CICDGenerator.render_pre_commit()
+        assert "noode-security" in content
+    
+    def test_generate_writes_rendered_files(self, tmp_path: Path) -> None:
+        """Test generate_* write the rendered configs to their standard paths."""
+        generator = CICDGenerator()
+        
+        workflow_path = generator.generate_github_actions(tmp_path, template="python")
+        assert workflow_path == tmp_path / ".github" / "workflows" / "noode.yml"
+        assert workflow_path.read_text() == generator.render_github_actions("python")
+        
+        config_path = generator.generate_pre_commit(tmp_path)
+        assert config_path == tmp_path / ".pre-commit-config.yaml"
+        assert config_path.read_text() == generator.render_pre_commit()
 
 
 class TestProjectConfig:
@@ -227,36 +383,17 @@ class TestProjectConfig:
 class TestProject:
     """Tests for Project dataclass."""
     
-    def test_to_dict(self) -> None:
-        """Test serialization."""
+    def test_roundtrip(self) -> None:
+        """Test to_dict and from_dict are inverses."""
         project = Project(
             project_id="abc123",
             name="test",
             path=Path("/tmp/test"),
-            config=ProjectConfig(name="test"),
+            config=ProjectConfig(name="test", template="api", version="1.0.0"),
             created_at=datetime(2026, 1, 1),
             updated_at=datetime(2026, 1, 2),
         )
         
         data = project.to_dict()
         assert data["project_id"] == "abc123"
-        assert data["name"] == "test"
-    
-    def test_from_dict(self) -> None:
-        """Test deserialization."""
-        data = {
-            "project_id": "xyz",
-            "name": "project",
-            "path": "/tmp/project",
-            "config": {
-                "name": "project",
-                "template": "api",
-                "version": "1.0.0",
-            },
-            "created_at": "2026-01-01T00:00:00",
-            "updated_at": "2026-01-02T00:00:00",
-        }
-        
-        project = Project.from_dict(data)
-        assert project.project_id == "xyz"
-        assert project.config.template == "api"
+        assert Project.from_dict(data) == project